@@ -8,13 +8,44 @@ v1.1    2018-08-09  charles.shih  Update the Command Line Interface.
 v1.2    2018-08-20  charles.shih  Support Python 3.
 v1.2.1  2019-07-08  charles.shih  Use minor and major to indicate the results.
 v1.3    2019-07-29  charles.shih  Calculate 90% complete latency number.
+v1.4    2026-10-18  agent         Compare achieved queue depth and CPU
+                                  efficiency KPIs.
+v1.5    2026-10-18  agent         Compare the latency components.
+v1.6    2026-10-18  agent         Compare the pooled latency percentiles by
+                                  merging the json+ bins of all rounds.
+v1.7    2026-10-18  agent         Support Parquet and Feather samples/reports.
+v1.8    2026-10-18  agent         Compare the CPU efficiency KPIs.
+v1.9    2026-10-18  agent         Calculate the statistics of all cases at
+                                  once by groupby.
+v1.10   2026-10-18  agent         Define benchmark report by yaml.
+v1.11   2026-10-18  agent         Support N-way comparison of sample sets.
+v1.12   2026-10-18  agent         Compare against the rolling baseline of the
+                                  baseline store, selected by release.
+v1.13   2026-10-18  agent         Estimate the minimum detectable effect and
+                                  the rounds needed by power analysis.
+v1.14   2026-10-18  agent         Support Welch's t-test, Mann-Whitney U test
+                                  and bootstrap confidence intervals.
+v1.15   2026-10-18  agent         Support the paired t-test for the A/B tests.
+v1.16   2026-10-18  agent         Adjust the Significance for the multiple
+                                  testing of the report.
 """
 
+import os
+import warnings
+import itertools
 import click
+import yaml
 import pandas as pd
 import numpy as np
-from scipy.stats import ttest_rel
-from scipy.stats import ttest_ind
+from scipy.stats import ttest_ind_from_stats
+from scipy.stats import mannwhitneyu
+from scipy.stats import t as student_t
+from scipy.stats import nct
+
+from report_io import read_dataframe
+from report_io import write_dataframe
+from report_stats import get_adjusted_significance
+from report_stats import get_bootstrap_means
 
 
 class FioBenchmarkReporter():
@@ -28,15 +59,138 @@ class FioBenchmarkReporter():
     Attributes:
         df_base: a DataFrame to store base samples.
         df_test: a DataFrame to store test samples.
+        samples: a list of (label, DataFrame) to store the sample sets for
+                 the N-way comparison.
         df_report: a DataFrame to store the benchmark report.
+        bins_base: a dict to store the latency bins of base samples.
+        bins_test: a dict to store the latency bins of test samples.
+        percentiles: the percentiles of the pooled latency to compare.
+        tests: the tests to get the Significance.
+        bootstrap_resamples: the number of the bootstrap resamples.
+        corrections: the corrections for the multiple testing.
+        config: the user config defined in the yaml file.
+        keys: the user config data for the KEYs.
+        kpis: the user config data for the KPIs.
+        power_analysis: whether to add the columns of the power analysis.
+        max_rounds: the maximum of the rounds needed by the power analysis.
+        paired: whether to pair the base and test samples by the Round.
+        correction: the correction for the multiple testing, None for not
+                    adjusting the Significance.
 
     """
 
-    # The DataFrame to store base samples and test samples
-    df_base = df_test = None
+    # The percentiles of the pooled completion latency to compare
+    percentiles = ['50', '95', '99', '99.9', '99.99']
+
+    # The tests to get the Significance and the bootstrap resamples
+    tests = ['ttest', 'welch', 'mannwhitneyu', 'bootstrap']
+    bootstrap_resamples = 2000
+
+    # The corrections for the multiple testing, Benjamini-Hochberg (the
+    # false discovery rate) and Holm-Bonferroni (the family-wise error rate)
+    corrections = ['bh', 'holm']
+
+    def __init__(self, config_file=None):
+        """Load config and init benchmark reporter.
+
+        Args:
+            config_file: string, the yaml file of the config, it is the
+                         "benchmark_reporter_config.yaml" along with this
+                         script by default.
+
+        """
+        # Load config
+        if config_file is None:
+            dirname = os.path.split(os.path.abspath(__file__))[0]
+            config_file = dirname + os.sep + 'benchmark_reporter_config.yaml'
+        with open(config_file, 'r') as f:
+            content = yaml.safe_load(f)
+            self.config = content['FioBenchmarkReporter']
+
+        # The KEYs to identify a case, the samples of all rounds are compared
+        self.keys = []
+        for key_attr in self.config['keys']:
+            key = {}
+            if type(key_attr) is dict:
+                key['source_label'] = key_attr['source_label']
+                key['target_label'] = key_attr['target_label']
+                key['target_unit'] = key_attr.get('target_unit')
+            else:
+                key['source_label'] = key['target_label'] = key_attr
+                key['target_unit'] = None
+            self.keys.append(key)
+
+        # The KPIs to compare, the thresholds default to the kpi_defaults
+        # (the newer settings are optional in the old configs)
+        self.kpis = []
+        for kpi_attr in self.config['kpis']:
+            kpi = {'power': 0.8, 'test': 'ttest', 'confidence_interval': False}
+            kpi.update(self.config['kpi_defaults'])
+            kpi['target_unit'] = None
+            kpi.update(kpi_attr)
+            if kpi['test'] not in self.tests:
+                raise ValueError('Unknown test "%s" for KPI "%s".' %
+                                 (kpi['test'], kpi['target_label']))
+            self.kpis.append(kpi)
+
+        # The DataFrame to store base samples and test samples
+        self.df_base = self.df_test = None
 
-    # The DataFrame to store the benchmark report
-    df_report = None
+        # The labelled sample sets for the N-way comparison
+        self.samples = []
+
+        # The latency bins (json+ histograms) of base samples and test samples
+        self.bins_base = self.bins_test = None
+
+        # The DataFrame to store the benchmark report
+        self.df_report = None
+
+        # The power analysis of the report
+        self.power_analysis = False
+        self.max_rounds = 20
+
+        # The paired t-test of the A/B tests
+        self.paired = False
+
+        # The correction for the multiple testing of the report
+        self.correction = None
+
+        # The picks of the bootstrap resamples, by the seed
+        self.bootstrap_picks = {}
+
+    def _get_merged_client_samples(self, df):
+        """Merge the samples of the clients in each round into one sample.
+
+        The test report of "RunFioClientTest.py" has a row for each client
+        (the fio server) in each round of a case, which are told apart by the
+        "Client" column. The KPIs of the clients are averaged, so that each
+        round is one sample of the case instead of one for each client.
+
+        Args:
+            df: DataFrame, the samples.
+
+        Returns:
+            The DataFrame of the merged samples.
+
+        """
+        if 'Client' not in df or df['Client'].isna().all():
+            return df
+
+        keys = [x['source_label'] for x in self.keys]
+        keys += [x for x in ('Round', 'Run') if x in df]
+        kpis = [
+            x['source_label'] for x in self.kpis if x['source_label'] in df
+        ]
+        columns = [x for x in df.columns if x not in keys + ['Client']]
+
+        df = df.copy()
+        df[kpis] = df[kpis].apply(pd.to_numeric, errors='coerce')
+        merged = df.groupby(keys, sort=False, dropna=False).agg(
+            dict([(x, 'mean' if x in kpis else 'first') for x in columns]))
+        print('[NOTE] Merged the samples of %s clients into %s samples.' %
+              (df['Client'].nunique(), len(merged)))
+
+        return merged.reset_index()
 
     def load_samples(self, params={}):
         """Load the base and test samples.
@@ -45,7 +199,9 @@ class FioBenchmarkReporter():
 
         Args:
             params: dict
-                base_csv: string, the csv file for base samples;
+                base_csv: string, the csv file for base samples, optional if
+                          the base samples are loaded from the baseline
+                          store;
                 test_csv: string, the csv file for test samples;
 
         Returns:
@@ -57,11 +213,11 @@ class FioBenchmarkReporter():
             self.df_test: store the test samples;
 
         Raises:
-            1. Error while reading from csv file
+            1. Error while reading from file
 
         """
         # Parse required params
-        if 'base_csv' not in params:
+        if not params.get('base_csv') and self.df_base is None:
             print('[ERROR] Missing required params: params[base_csv]')
             return 1
 
@@ -71,86 +227,561 @@ class FioBenchmarkReporter():
 
         try:
             # Load base samples from CSV file
-            print('[NOTE] Reading base samples from csv file "%s"...' %
-                  params['base_csv'])
-            self.df_base = pd.read_csv(params['base_csv'])
+            if params.get('base_csv'):
+                print('[NOTE] Reading base samples from file "%s"...' %
+                      params['base_csv'])
+                self.df_base = self._get_merged_client_samples(
+                    read_dataframe(params['base_csv']))
 
             # Load test samples from CSV file
-            print('[NOTE] Reading test samples from csv file "%s"...' %
+            print('[NOTE] Reading test samples from file "%s"...' %
                   params['test_csv'])
-            self.df_test = pd.read_csv(params['test_csv'])
+            self.df_test = self._get_merged_client_samples(
+                read_dataframe(params['test_csv']))
 
         except Exception as err:
-            print('[ERROR] Error while reading from csv file: %s' % err)
+            print('[ERROR] Error while reading from file: %s' % err)
             return 1
 
         return 0
 
-    def _add_columns_into_report_dataframe(self, label):
-        """Add a serial of columns into report DataFrame."""
-        # Add a serial of columns for the specified label
-        self.df_report.insert(
-            len(self.df_report.columns), label + '-BASE-AVG', 0)
-        self.df_report.insert(
-            len(self.df_report.columns), label + '-BASE-%SD', 0)
-        self.df_report.insert(
-            len(self.df_report.columns), label + '-TEST-AVG', 0)
-        self.df_report.insert(
-            len(self.df_report.columns), label + '-TEST-%SD', 0)
-        self.df_report.insert(len(self.df_report.columns), label + '-%DIFF', 0)
-        self.df_report.insert(len(self.df_report.columns), label + '-SIGN', 0)
-        self.df_report.insert(
-            len(self.df_report.columns), label + '-CONCLUSION', 0)
+    def load_baseline(self, params={}):
+        """Load the base samples from the rolling baseline.
 
-        return None
+        The base samples are the samples of the last N accepted runs in the
+        baseline store (see "ManageBaselineStore.py").
+
+        Args:
+            params: dict
+                baseline_db: string, the database file of the baseline store;
+                baseline_runs: int, the number of the last accepted runs, 5
+                               by default;
+                release: string, the release of the runs, optional;
+                host: string, the host of the runs, optional;
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        Updates:
+            self.df_base: store the base samples;
+
+        """
+        # Imported here since the baseline store uses this reporter
+        from ManageBaselineStore import FioBaselineStore
+
+        # Parse required params
+        if 'baseline_db' not in params:
+            print('[ERROR] Missing required params: params[baseline_db]')
+            return 1
+
+        try:
+            print('[NOTE] Reading base samples from baseline store "%s"...' %
+                  params['baseline_db'])
+            store = FioBaselineStore(params['baseline_db'],
+                                     [x['source_label'] for x in self.keys])
+            self.df_base = store.get_baseline(params.get('baseline_runs', 5),
+                                              params.get('release'),
+                                              params.get('host'))
+
+        except Exception as err:
+            print('[ERROR] Error while reading from baseline store: %s' % err)
+            return 1
+
+        if self.df_base.empty:
+            print('[ERROR] No accepted runs in the baseline store.')
+            return 1
+
+        return 0
+
+    def _load_bins_from_npz(self, bins_npz):
+        """Load the latency bins from a npz file.
+
+        The npz file is saved by "GenerateTestReport.py --bins_npz", the
+        rows of all rounds are indexed by the case (the keys without Round).
+
+        Args:
+            bins_npz: string, the npz file of the latency bins.
+
+        Returns:
+            A dict like {'npz': the arrays, 'index': {case: [rows]}}.
+
+        """
+        with np.load(bins_npz) as npz:
+            arrays = dict([(x, npz[x]) for x in npz.files])
+
+        index = {}
+        for (row, keys) in enumerate(arrays['keys']):
+            index.setdefault(tuple(keys[:-1]), []).append(row)
+
+        return {'npz': arrays, 'index': index}
+
+    def load_bins(self, params={}):
+        """Load the latency bins of the base and test samples.
+
+        Args:
+            params: dict
+                base_bins: string, the npz file for base latency bins;
+                test_bins: string, the npz file for test latency bins;
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        Updates:
+            self.bins_base: store the base latency bins;
+            self.bins_test: store the test latency bins;
+
+        Raises:
+            1. Error while reading from npz file
+
+        """
+        # Parse required params
+        if 'base_bins' not in params:
+            print('[ERROR] Missing required params: params[base_bins]')
+            return 1
+
+        if 'test_bins' not in params:
+            print('[ERROR] Missing required params: params[test_bins]')
+            return 1
+
+        try:
+            print('[NOTE] Reading base latency bins from npz file "%s"...' %
+                  params['base_bins'])
+            self.bins_base = self._load_bins_from_npz(params['base_bins'])
+
+            print('[NOTE] Reading test latency bins from npz file "%s"...' %
+                  params['test_bins'])
+            self.bins_test = self._load_bins_from_npz(params['test_bins'])
+
+        except Exception as err:
+            print('[ERROR] Error while reading from npz file: %s' % err)
+            return 1
+
+        return 0
+
+    def _get_report_columns(self, label, confidence_interval=False):
+        """Get a serial of columns of a KPI for the report DataFrame."""
+        # A serial of columns for the specified label
+        suffixes = [
+            '-BASE-AVG', '-BASE-%SD', '-TEST-AVG', '-TEST-%SD', '-%DIFF'
+        ]
+
+        # The columns of the confidence interval of %DIFF
+        if confidence_interval:
+            suffixes += ['-%DIFF-CI-LOW', '-%DIFF-CI-HIGH']
+        suffixes.append('-SIGN')
+        if self.correction:
+            suffixes.append('-ADJ-SIGN')
+        suffixes.append('-CONCLUSION')
+        if self.correction:
+            suffixes.append('-ADJ-CONCLUSION')
+
+        # The columns of the power analysis
+        if self.power_analysis:
+            suffixes += ['-%MDE', '-ROUNDS']
+
+        return [label + x for x in suffixes]
 
     def _create_report_dataframe(self):
         """Create the report DataFrame."""
+        # Get KEYs
+        source_keys = [x['source_label'] for x in self.keys]
+        target_keys = [x['target_label'] for x in self.keys]
+
         # Create the report DataFrame according to self.df_test
-        self.df_report = self.df_test[[
-            'Backend', 'Driver', 'Format', 'RW', 'BS', 'IODepth', 'Numjobs'
-        ]].drop_duplicates()
+        self.df_report = self.df_test[source_keys].drop_duplicates()
+
+        # Rename the columns of the report DataFrame if needed
+        self.df_report.columns = target_keys
 
         # Sort the report DataFrame and reset its index
-        self.df_report = self.df_report.sort_values(by=[
-            'Backend', 'Driver', 'Format', 'RW', 'BS', 'IODepth', 'Numjobs'
-        ])
+        self.df_report = self.df_report.sort_values(by=target_keys)
         self.df_report = self.df_report.reset_index().drop(columns=['index'])
 
-        # Add the new columns to report DataFrame
-        # [Note] Units: BW(MiB/s) / IOPS / LAT(ms) / CLAT90(ms) / Util(%)
-        self._add_columns_into_report_dataframe('BW')
-        self._add_columns_into_report_dataframe('IOPS')
-        self._add_columns_into_report_dataframe('LAT')
-        self._add_columns_into_report_dataframe('CLAT90')
-        self._add_columns_into_report_dataframe('Util')
+        # Get the new columns of the KPIs
+        columns = []
+        for kpi in self.kpis:
+            columns += self._get_report_columns(kpi['target_label'],
+                                                kpi['confidence_interval'])
+
+        # Get the columns of pooled latency percentiles
+        if self.bins_base and self.bins_test:
+            columns += self._get_pooled_report_columns('R-CLAT')
+            columns += self._get_pooled_report_columns('W-CLAT')
+
+        # Add the new columns to report DataFrame at once
+        self.df_report = pd.concat([
+            self.df_report,
+            pd.DataFrame(dict.fromkeys(columns, 0), index=self.df_report.index)
+        ], axis=1)
 
         return None
 
-    def _get_significance(self, array1, array2, paired):
-        """Get the significance of t-test.
+    def _get_pooled_report_columns(self, label):
+        """Get the columns of pooled percentiles for the report DataFrame."""
+        columns = [
+            label + percentile + suffix for percentile in self.percentiles
+            for suffix in ('-BASE-POOL', '-TEST-POOL', '-%DIFF', '-SIGN',
+                           '-CONCLUSION')
+        ]
+        columns += [label + '-KS-D']
+
+        return columns
+
+    def _get_pooled_bins(self, bins, case, prefix):
+        """Merge the latency bins of all rounds of a case.
 
         Args:
-            array1: array like, the samples to do t-test;
-            array2: array like, the samples to do t-test;
-            paired: flag, paired or unpaired t-test;
+            bins: dict, the latency bins loaded by self._load_bins_from_npz;
+            case: tuple, the keys of the case in strings (without Round);
+            prefix: string, 'r' or 'w' for the read or write bins;
 
         Returns:
-            The Significance which value between 0 and 1. When the calculation
-            fails, it will return 'nan' instead.
+            A tuple (lat_ns, count) of NumPy arrays, the merged histogram in
+            ascending order of the latency.
 
         """
-        if paired:
-            (statistic, pvalue) = ttest_rel(array1, array2)
-        else:
-            (statistic, pvalue) = ttest_ind(array1, array2)
+        npz = bins['npz']
+        offsets = npz[prefix + '-offsets']
+        rows = np.array(bins['index'].get(case, []), dtype=np.int64)
+
+        # Gather the bins of all rounds and sum up the counts by latency
+        mask = np.zeros(len(npz[prefix + '-lat_ns']), dtype=bool)
+        for row in rows:
+            mask[offsets[row]:offsets[row + 1]] = True
+        (lat_ns, inverse) = np.unique(npz[prefix + '-lat_ns'][mask],
+                                      return_inverse=True)
+        count = np.bincount(inverse,
+                            weights=npz[prefix + '-count'][mask],
+                            minlength=len(lat_ns))
+
+        return (lat_ns, count)
+
+    def _get_round_percentiles(self, bins, case, prefix):
+        """Get the percentiles of each round of a case from its own bins.
+
+        Args:
+            bins: dict, the latency bins loaded by self._load_bins_from_npz;
+            case: tuple, the keys of the case in strings (without Round);
+            prefix: string, 'r' or 'w' for the read or write bins;
 
-        significance = 1 - pvalue
+        Returns:
+            The NumPy array of the percentiles (ms), a row for each round.
+
+        """
+        npz = bins['npz']
+        offsets = npz[prefix + '-offsets']
+        percentiles = []
+        for row in bins['index'].get(case, []):
+            lat_ns = npz[prefix + '-lat_ns'][offsets[row]:offsets[row + 1]]
+            count = npz[prefix + '-count'][offsets[row]:offsets[row + 1]]
+            order = np.argsort(lat_ns)
+            percentiles.append(
+                self._get_pooled_percentiles(lat_ns[order], count[order]))
+
+        return np.array(percentiles).reshape(-1, len(self.percentiles))
+
+    def _get_pooled_percentiles(self, lat_ns, count):
+        """Get the percentiles (ms) from a merged histogram, same as fio."""
+        cumsum = np.cumsum(count)
+        if not len(cumsum) or cumsum[-1] == 0:
+            return np.full(len(self.percentiles), np.nan)
+
+        thresholds = np.array(self.percentiles,
+                              dtype=float) / 100.0 * cumsum[-1]
+        index = np.searchsorted(cumsum, thresholds, side='left')
+        return lat_ns[np.minimum(index, len(cumsum) - 1)] / 1000000.0
+
+    def _get_ks_distance(self, base, test):
+        """Get the Kolmogorov-Smirnov distance of two histograms.
+
+        The empirical CDFs of the histograms are evaluated on the union of
+        their buckets, the statistic D is the max distance between them. It
+        shows how much the distribution changes, but it has no significance
+        across the runs, since the I/Os of a run are not independent.
+
+        Args:
+            base: tuple, the (lat_ns, count) of the base histogram;
+            test: tuple, the (lat_ns, count) of the test histogram;
+
+        Returns:
+            The statistic D, or nan if any is empty.
+
+        """
+        (n1, n2) = (base[1].sum(), test[1].sum())
+        if n1 == 0 or n2 == 0:
+            return np.nan
+
+        support = np.union1d(base[0], test[0])
+        cdf1 = np.cumsum(base[1])[np.searchsorted(
+            base[0], support, side='right') - 1] * (support >= base[0][0])
+        cdf2 = np.cumsum(test[1])[np.searchsorted(
+            test[0], support, side='right') - 1] * (support >= test[0][0])
+        return np.max(np.abs(cdf1 / n1 - cdf2 / n2))
+
+    def _calculate_and_fill_pooled_series(self, series, label, prefix):
+        """Calculate the pooled percentiles and fill the Series.
+
+        The pooled percentiles come from the bins of all rounds merged, while
+        the Significance and the %SD come from the percentiles of each round,
+        since the I/Os in a round are not independent samples. The Student's
+        t-test on the percentiles of the rounds tells whether the runs
+        differ, as for the other KPIs.
+
+        The series can be a dict with the keys of the case as well. The bins
+        are indexed by the keys of GenerateTestReport.py, so the KEYs in the
+        config should be Backend / Driver / Format / RW / BS / IODepth /
+        Numjobs in order.
+
+        """
+        # The bins are indexed by the keys in strings
+        case = tuple('NaN' if pd.isna(series[x['target_label']]) else str(
+            series[x['target_label']]) for x in self.keys)
+
+        base = self._get_pooled_bins(self.bins_base, case, prefix)
+        test = self._get_pooled_bins(self.bins_test, case, prefix)
+        base_pct = self._get_pooled_percentiles(*base)
+        test_pct = self._get_pooled_percentiles(*test)
+        series[label + '-KS-D'] = self._get_ks_distance(base, test)
+
+        # The statistics of the percentiles of the rounds
+        base_rounds = self._get_round_percentiles(self.bins_base, case,
+                                                  prefix)
+        test_rounds = self._get_round_percentiles(self.bins_test, case,
+                                                  prefix)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            stats = [(x.mean(axis=0), x.std(axis=0, ddof=1), len(x))
+                     if len(x) > 1 else (np.nan, np.nan, len(x))
+                     for x in (base_rounds, test_rounds)]
+            (tvalue, pvalue) = ttest_ind_from_stats(*(stats[0] + stats[1]))
+            significance = np.broadcast_to(1 - pvalue, base_pct.shape)
+            base_pct_dev = np.broadcast_to(stats[0][1] / stats[0][0] * 100,
+                                           base_pct.shape)
+            test_pct_dev = np.broadcast_to(stats[1][1] / stats[1][0] * 100,
+                                           base_pct.shape)
+
+        defaults = self.config['kpi_defaults']
+        for (i, percentile) in enumerate(self.percentiles):
+            name = label + percentile
+            series[name + '-BASE-POOL'] = base_pct[i]
+            series[name + '-TEST-POOL'] = test_pct[i]
+            series[name + '-%DIFF'] = (test_pct[i] -
+                                       base_pct[i]) / base_pct[i] * 100
+            series[name + '-SIGN'] = significance[i]
+            series[name + '-CONCLUSION'] = str(
+                self._get_conclusion(base_pct_dev[i], test_pct_dev[i],
+                                     series[name + '-%DIFF'], significance[i],
+                                     False, defaults['max_percent_dev'],
+                                     defaults['regression_threshold'],
+                                     defaults['confidence_threshold']))
+
+        return None
+
+    def _get_grouped_stats(self, df, index, columns):
+        """Get the statistics of the samples grouped by the case.
+
+        Args:
+            df: DataFrame, the samples;
+            index: MultiIndex, the cases to get the statistics for;
+            columns: list, the KPI columns in the samples;
+
+        Returns:
+            A dict of DataFrames, the rows are aligned with the index (NaN
+            for the cases not in the samples) and the columns are the KPIs:
+            'mean': the average of the samples;
+            'std': the std dev of the samples (ddof=1);
+            'count': the number of the samples;
+            'nan': whether there are invalid samples (NaN);
+            'samples': a dict of the NumPy arrays for each KPI, the rows are
+                       aligned with the index and the samples of a case are
+                       padded by NaN;
+
+        """
+        values = df[columns].apply(pd.to_numeric, errors='coerce')
+        by = [df[x['source_label']] for x in self.keys]
+        grouped = values.groupby(by)
+
+        stats = {
+            'mean': grouped.mean(),
+            'std': grouped.std(ddof=1),
+            'count': grouped.count(),
+            'nan': values.isna().groupby(by).any()
+        }
+
+        stats = dict([(x, y.reindex(index)) for (x, y) in stats.items()])
+
+        # Place the samples of each case into a row
+        codes = index.get_indexer(pd.MultiIndex.from_arrays(by))
+        position = grouped.cumcount().fillna(-1).values.astype(int)
+        valid = (codes >= 0) & (position >= 0)
+        width = position[valid].max() + 1 if valid.any() else 1
+        stats['samples'] = {}
+        for column in columns:
+            samples = np.full((len(index), width), np.nan)
+            samples[codes[valid], position[valid]] = values[column][valid]
+            stats['samples'][column] = samples
+
+        return stats
+
+    def _get_paired_stats(self, index, columns):
+        """Get the statistics of the paired differences grouped by the case.
+
+        The base and test samples of a case are paired by the Round, which is
+        the pair tag of the A/B tests ("RunFioTest.py --ab_labels"). The
+        rounds not in both of the base and test samples are dropped.
+
+        Args:
+            index: MultiIndex, the cases to get the statistics for;
+            columns: list, the KPI columns in the samples;
+
+        Returns:
+            A dict of DataFrames as _get_grouped_stats(), for the differences
+            (test - base) of the pairs.
+
+        """
+        on = [x['source_label'] for x in self.keys] + ['Round']
+        pairs = self.df_base[on + columns].merge(self.df_test[on + columns],
+                                                 on=on,
+                                                 suffixes=('-BASE', '-TEST'),
+                                                 validate='one_to_one')
+
+        diff = pairs[on].copy()
+        for column in columns:
+            diff[column] = pd.to_numeric(
+                pairs[column + '-TEST'], errors='coerce') - pd.to_numeric(
+                    pairs[column + '-BASE'], errors='coerce')
+
+        return self._get_grouped_stats(diff, index, columns)
+
+    def _get_bootstrap_pct_diff(self, base, test):
+        """Get the %DIFF of the bootstrap resamples for all the cases.
+
+        Args:
+            base: NumPy array, the base samples of the cases (NaN padded);
+            test: NumPy array, the test samples of the cases (NaN padded);
+
+        Returns:
+            The NumPy array of %DIFF, a row of the resamples for each case.
+
+        """
+        # The fixed seeds for the same conclusions of the same data
+        base_mean = get_bootstrap_means(base, 0, self.bootstrap_resamples,
+                                        self.bootstrap_picks)
+        test_mean = get_bootstrap_means(test, 1, self.bootstrap_resamples,
+                                        self.bootstrap_picks)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return (test_mean - base_mean) / base_mean * 100
+
+    def _get_significance(self, base, test, column, method='ttest',
+                          pct_diffs=None, diff=None):
+        """Get the significance of the specified test for all the cases.
+
+        The tests can be:
+        'paired': the paired t-test, done on the grouped statistics of the
+                  paired differences, which is the same as doing it on the
+                  pairs;
+        'ttest': the unpaired Student's t-test, done on the grouped
+                 statistics, which is the same as doing it on the samples;
+        'welch': the unpaired Welch's t-test (unequal variances);
+        'mannwhitneyu': the Mann-Whitney U test on the samples;
+        'bootstrap': the bootstrap test, the p-value is twice the fraction
+                     of the resamples with %DIFF on the other side of zero;
+
+        Args:
+            base: dict, the grouped statistics of the base samples;
+            test: dict, the grouped statistics of the test samples;
+            column: string, the KPI column to do test;
+            method: string, the test to do, 'ttest' by default;
+            pct_diffs: NumPy array, the %DIFF of the bootstrap resamples;
+            diff: dict, the grouped statistics of the paired differences;
+
+        Returns:
+            The NumPy array of the Significance which value between 0 and 1.
+            When the calculation fails (such as less than 2 samples or any
+            invalid sample), the value will be 'nan' instead.
+
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            if method == 'paired':
+                count = diff['count'][column].values
+                statistic = diff['mean'][column].values / (
+                    diff['std'][column].values / np.sqrt(count))
+                pvalue = 2 * student_t.sf(np.abs(statistic), count - 1)
+            elif method in ('ttest', 'welch'):
+                (statistic, pvalue) = ttest_ind_from_stats(
+                    base['mean'][column].values, base['std'][column].values,
+                    base['count'][column].values, test['mean'][column].values,
+                    test['std'][column].values, test['count'][column].values,
+                    equal_var=(method == 'ttest'))
+            elif method == 'mannwhitneyu':
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore')
+                    (statistic, pvalue) = mannwhitneyu(
+                        base['samples'][column],
+                        test['samples'][column],
+                        alternative='two-sided',
+                        axis=1,
+                        nan_policy='omit')
+            else:
+                pvalue = 2 * np.minimum(np.mean(pct_diffs <= 0, axis=1),
+                                        np.mean(pct_diffs >= 0, axis=1))
+                pvalue = np.minimum(pvalue, 1)
+                pvalue[np.isnan(pct_diffs).any(axis=1)] = np.nan
+
+        significance = 1 - np.asarray(pvalue, dtype=float)
+
+        invalid = base['nan'][column].values != False  # noqa: E712
+        invalid |= test['nan'][column].values != False  # noqa: E712
+        if method == 'paired':
+            invalid |= diff['nan'][column].values != False  # noqa: E712
+        significance[invalid] = np.nan
 
         return significance
 
-    def _get_conclusion(self, base_pct_dev, test_pct_dev, pct_diff,
-                        significance, higher_is_better):
+    def _adjust_comparisons(self, comparisons):
+        """Adjust the Significance of the comparisons for multiple testing.
+
+        The Significance of all the comparisons (the KPIs and the cases) are
+        adjusted at once by self.correction, and the conclusions are got
+        again by the adjusted Significance.
+
+        Args:
+            comparisons: list of tuples (base, test, kpi, result), the
+                         grouped statistics of the base and test samples,
+                         the user config data of the KPI and the result of
+                         _compare_stats();
+
+        Updates:
+            The results get the 'ADJ-SIGN' and 'ADJ-CONCLUSION'.
+
+        """
+        adjusted = get_adjusted_significance(
+            [x[3]['SIGN'] for x in comparisons], self.correction)
+
+        for ((base, test, kpi, result),
+             significance) in zip(comparisons, adjusted):
+            (base_avg, base_pct_dev) = self._get_avg_and_pct_dev(
+                base, kpi['source_label'])
+            (test_avg, test_pct_dev) = self._get_avg_and_pct_dev(
+                test, kpi['source_label'])
+            result['ADJ-SIGN'] = significance
+            result['ADJ-CONCLUSION'] = self._get_conclusion(
+                base_pct_dev, test_pct_dev, result['%DIFF'], significance,
+                kpi['higher_is_better'], kpi['max_percent_dev'],
+                kpi['regression_threshold'], kpi['confidence_threshold'])
+
+        return None
+
+    def _get_conclusion(self,
+                        base_pct_dev,
+                        test_pct_dev,
+                        pct_diff,
+                        significance,
+                        higher_is_better,
+                        max_percent_dev=10,
+                        regression_threshold=5,
+                        confidence_threshold=0.95):
         """Get the conclusion of the specified KPI.
 
         To reach the conclusion, we need to consider the following conditions:
@@ -158,14 +789,21 @@ class FioBenchmarkReporter():
         2. Whether the %DIFF of the KPI beyonds REGRESSION_THRESHOLD;
         3. Whether the Significance beyonds CONFIDENCE_THRESHOLD.
 
+        The arguments can be the arrays of all the cases, the conclusions are
+        got at once.
+
         Args:
-            base_pct_dev: float, the base %SD;
-            test_pct_dev: float, the test %SD;
-            pct_diff: float, the %DIFF of the KPI;
-            significance: float, 0 <= x <= 1, the Significance;
+            base_pct_dev: float or array like, the base %SD;
+            test_pct_dev: float or array like, the test %SD;
+            pct_diff: float or array like, the %DIFF of the KPI;
+            significance: float or array like, 0 <= x <= 1, the Significance;
             higher_is_better: flag, used to adjust improvment or regression.
+            max_percent_dev: int [0, 100], threshold for the maxium %SD.
+            regression_threshold: int [0, 100], threshold for the regression.
+            confidence_threshold: float [0, 1], threshold for the confidence.
 
         Returns:
+            The NumPy array (0-d for floats) of the conclusions:
             'Data Invalid': the input data is invalid;
             'Variance Too Large': the %SD beyonds MAX_PCT_DEV;
             'No Difference': the %DIFF is zero;
@@ -178,105 +816,247 @@ class FioBenchmarkReporter():
                 is below REGRESSION_THRESHOLD;
 
         """
-        MAX_PCT_DEV = 10
-        REGRESSION_THRESHOLD = 5
-        CONFIDENCE_THRESHOLD = 0.95
+        MAX_PCT_DEV = max_percent_dev
+        REGRESSION_THRESHOLD = regression_threshold
+        CONFIDENCE_THRESHOLD = confidence_threshold
+
+        base_pct_dev = np.asarray(base_pct_dev, dtype=float)
+        test_pct_dev = np.asarray(test_pct_dev, dtype=float)
+        pct_diff = np.asarray(pct_diff, dtype=float)
+        significance = np.asarray(significance, dtype=float)
+
+        improved = np.where(higher_is_better, pct_diff > 0, pct_diff < 0)
+        major = np.abs(pct_diff) >= REGRESSION_THRESHOLD
+
+        # The first matched condition wins
+        conditions = [
+            np.isnan(base_pct_dev) | np.isnan(test_pct_dev),
+            (base_pct_dev > MAX_PCT_DEV) | (test_pct_dev > MAX_PCT_DEV),
+            np.isnan(pct_diff) | (pct_diff == 0),
+            np.isnan(significance) | (significance < CONFIDENCE_THRESHOLD),
+            improved & major, improved, major
+        ]
+        choices = [
+            'Data Invalid', 'Variance Too Large', 'No Difference',
+            'No Significance', 'Major Improvement', 'Minor Improvement',
+            'Major Regression'
+        ]
+
+        return np.select(conditions, choices, 'Minor Regression')
+
+    def _get_avg_and_pct_dev(self, stats, column):
+        """Get the average and %SD of a KPI from the grouped statistics.
 
-        if np.isnan(base_pct_dev) or np.isnan(test_pct_dev):
-            return 'Data Invalid'
+        Returns:
+            A tuple (avg, pct_dev) of NumPy arrays, NaN if the KPI is not
+            available in the samples (generated by old scripts).
 
-        if base_pct_dev > MAX_PCT_DEV or test_pct_dev > MAX_PCT_DEV:
-            return 'Variance Too Large'
+        """
+        if column not in stats['mean']:
+            nan = np.full(len(stats['mean']), np.nan)
+            return (nan, nan)
 
-        if np.isnan(pct_diff) or pct_diff == 0:
-            return 'No Difference'
+        avg = stats['mean'][column].values
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_dev = stats['std'][column].values / avg * 100
 
-        if np.isnan(significance) or significance < CONFIDENCE_THRESHOLD:
-            return 'No Significance'
+        return (avg, pct_dev)
 
-        if (higher_is_better and pct_diff > 0) or (not higher_is_better
-                                                   and pct_diff < 0):
-            if abs(pct_diff) >= REGRESSION_THRESHOLD:
-                return 'Major Improvement'
-            else:
-                return 'Minor Improvement'
-        else:
-            if abs(pct_diff) >= REGRESSION_THRESHOLD:
-                return 'Major Regression'
-            else:
-                return 'Minor Regression'
-
-    def _calculate_and_fill_report_series(self, series, df_base, df_test,
-                                          label, source_label,
-                                          higher_is_better):
-        """Calculate the statistics and fill the Series for specified label."""
-        # Calculate and fill the average and %SD of the base and test samples
-        series[label + '-BASE-AVG'] = df_base[source_label].mean()
-        series[label + '-BASE-%SD'] = df_base[source_label].std(
-            ddof=1) / series[label + '-BASE-AVG'] * 100
-        series[label + '-TEST-AVG'] = df_test[source_label].mean()
-        series[label + '-TEST-%SD'] = df_test[source_label].std(
-            ddof=1) / series[label + '-TEST-AVG'] * 100
-
-        # Calculate and fill the %DIFF of the test samples againest base
-        series[label + '-%DIFF'] = (
-            series[label + '-TEST-AVG'] - series[label + '-BASE-AVG']
-        ) / series[label + '-BASE-AVG'] * 100
-
-        # Calculate and fill the Significance
-        series[label + '-SIGN'] = self._get_significance(
-            df_base[source_label], df_test[source_label], False)
-
-        # Calculate and fill the Conclusion
-        series[label + '-CONCLUSION'] = self._get_conclusion(
-            series[label + '-BASE-%SD'], series[label + '-TEST-%SD'],
-            series[label + '-%DIFF'], series[label
-                                             + '-SIGN'], higher_is_better)
+    def _compare_stats(self, base, test, kpi, diff=None):
+        """Compare the test samples against the base for a KPI.
 
-        return None
+        Args:
+            base: dict, the grouped statistics of the base samples;
+            test: dict, the grouped statistics of the test samples;
+            kpi: dict, the user config data of the KPI;
+            diff: dict, the grouped statistics of the paired differences, the
+                  Significance is got by the paired t-test if specified;
+
+        Returns:
+            A dict of NumPy arrays, the keys are the suffixes of the columns:
+            '%DIFF', 'SIGN', 'CONCLUSION'; and '%DIFF-CI-LOW', '%DIFF-CI-HIGH'
+            if the confidence interval is required.
+
+        """
+        column = kpi['source_label']
+        if column not in base['mean'] or column not in test['mean']:
+            nan = np.full(len(base['mean']), np.nan)
+            result = {
+                '%DIFF': nan,
+                'SIGN': nan,
+                'CONCLUSION': np.full(len(nan), 'Data Invalid')
+            }
+            if kpi['confidence_interval']:
+                result.update({'%DIFF-CI-LOW': nan, '%DIFF-CI-HIGH': nan})
+            return result
+
+        # Calculate the %DIFF of the test samples againest base
+        (base_avg, base_pct_dev) = self._get_avg_and_pct_dev(base, column)
+        (test_avg, test_pct_dev) = self._get_avg_and_pct_dev(test, column)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_diff = (test_avg - base_avg) / base_avg * 100
+        result = {'%DIFF': pct_diff}
+
+        # Calculate the %DIFF of the bootstrap resamples if needed
+        pct_diffs = None
+        if kpi['test'] == 'bootstrap' or kpi['confidence_interval']:
+            pct_diffs = self._get_bootstrap_pct_diff(base['samples'][column],
+                                                     test['samples'][column])
+
+        # Calculate the confidence interval of %DIFF
+        if kpi['confidence_interval']:
+            alpha = 1 - kpi['confidence_threshold']
+            (low, high) = np.percentile(
+                pct_diffs, [alpha / 2 * 100, (1 - alpha / 2) * 100], axis=1)
+            result.update({'%DIFF-CI-LOW': low, '%DIFF-CI-HIGH': high})
+
+        # Calculate the Significance and the Conclusion
+        method = kpi['test'] if diff is None else 'paired'
+        significance = self._get_significance(base, test, column, method,
+                                              pct_diffs, diff)
+        result['SIGN'] = significance
+        result['CONCLUSION'] = self._get_conclusion(
+            base_pct_dev, test_pct_dev, pct_diff, significance,
+            kpi['higher_is_better'], kpi['max_percent_dev'],
+            kpi['regression_threshold'], kpi['confidence_threshold'])
+
+        return result
+
+    def _get_power_analysis(self, base, test, kpi, diff=None):
+        """Get the power analysis of the t-test for a KPI.
+
+        The std dev of a case is pooled from its base and test samples (or
+        the std dev of the paired differences for the paired t-test), the
+        t-test is two-sided at the CONFIDENCE_THRESHOLD and the power is the
+        chance to detect a change when it happens.
+
+        Args:
+            base: dict, the grouped statistics of the base samples;
+            test: dict, the grouped statistics of the test samples;
+            kpi: dict, the user config data of the KPI;
+            diff: dict, the grouped statistics of the paired differences, for
+                  the paired t-test if specified;
+
+        Returns:
+            A tuple (pct_mde, rounds) of NumPy arrays:
+            pct_mde: the minimum detectable effect in percentage of the
+                     base AVG, with the rounds of the samples;
+            rounds: the rounds (pairs) needed for each of base and test to
+                    detect a change of REGRESSION_THRESHOLD, capped at
+                    self.max_rounds;
+            NaN if the KPI is not available in the samples.
+
+        """
+        column = kpi['source_label']
+        if column not in base['mean'] or column not in test['mean']:
+            nan = np.full(len(base['mean']), np.nan)
+            return (nan, nan)
+
+        alpha = 1 - kpi['confidence_threshold']
+        power = kpi['power']
+        base_avg = np.abs(base['mean'][column].values)
+        if diff is None:
+            groups = 2
+            pooled_std = np.sqrt((base['std'][column].values**2 +
+                                  test['std'][column].values**2) / 2)
+            count = np.minimum(base['count'][column].values,
+                               test['count'][column].values)
+        else:
+            groups = 1
+            pooled_std = diff['std'][column].values
+            count = diff['count'][column].values
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            # The minimum detectable effect with the rounds of the samples
+            dof = np.where(count >= 2, groups * (count - 1), np.nan)
+            mde = (student_t.ppf(1 - alpha / 2, dof) + student_t.ppf(
+                power, dof)) * pooled_std * np.sqrt(groups / count)
+            pct_mde = mde / base_avg * 100
+
+            # The power of 2 ~ max_rounds rounds for all the cases at once
+            rounds = np.arange(2, self.max_rounds + 1)[:, np.newaxis]
+            dof = groups * (rounds - 1)
+            effect = base_avg * kpi['regression_threshold'] / 100
+            noncentrality = effect / (pooled_std * np.sqrt(groups / rounds))
+            critical = student_t.ppf(1 - alpha / 2, dof)
+            powers = (nct.sf(critical, dof, noncentrality) +
+                      nct.cdf(-critical, dof, noncentrality))
+            powers[:, pooled_std == 0] = 1
+
+        # The first rounds with enough power
+        enough = powers >= power
+        needed = np.where(enough.any(axis=0), rounds[enough.argmax(axis=0), 0],
+                          self.max_rounds).astype(float)
+        needed[np.isnan(pooled_std) | np.isnan(base_avg)] = np.nan
+
+        return (pct_mde, needed)
 
     def _complete_report_dataframe(self):
-        """Complete the report DataFrame."""
-        # Deal with every Series in report DataFrame
-        for (index, series) in self.df_report.iterrows():
-
-            # Look up the sub DataFrame from the base samples
-            my_sub_base = self.df_base[
-                (self.df_base['Backend'] == series['Backend'])
-                & (self.df_base['Driver'] == series['Driver'])
-                & (self.df_base['Format'] == series['Format'])
-                & (self.df_base['RW'] == series['RW'])
-                & (self.df_base['BS'] == series['BS'])
-                & (self.df_base['IODepth'] == series['IODepth'])
-                & (self.df_base['Numjobs'] == series['Numjobs'])]
-
-            # Look up the sub DataFrame from the test samples
-            my_sub_test = self.df_test[
-                (self.df_test['Backend'] == series['Backend'])
-                & (self.df_test['Driver'] == series['Driver'])
-                & (self.df_test['Format'] == series['Format'])
-                & (self.df_test['RW'] == series['RW'])
-                & (self.df_test['BS'] == series['BS'])
-                & (self.df_test['IODepth'] == series['IODepth'])
-                & (self.df_test['Numjobs'] == series['Numjobs'])]
-
-            # Calculate the statistics
-            self._calculate_and_fill_report_series(
-                series, my_sub_base, my_sub_test, 'BW', 'BW(MiB/s)', True)
-            self._calculate_and_fill_report_series(
-                series, my_sub_base, my_sub_test, 'IOPS', 'IOPS', True)
-            self._calculate_and_fill_report_series(
-                series, my_sub_base, my_sub_test, 'LAT', 'LAT(ms)', False)
-            self._calculate_and_fill_report_series(
-                series, my_sub_base, my_sub_test, 'CLAT90', 'CLAT90(ms)', False)
-            self._calculate_and_fill_report_series(
-                series, my_sub_base, my_sub_test, 'Util', 'Util(%)', True)
-
-            # Show current series
-            print(series)
-
-            # Save current series
-            self.df_report.iloc[index] = series
+        """Complete the report DataFrame.
+
+        The samples are grouped by the case, the statistics of all the cases
+        are calculated at once for each KPI.
+
+        """
+        target_keys = [x['target_label'] for x in self.keys]
+        index = pd.MultiIndex.from_frame(self.df_report[target_keys])
+        columns = [
+            x['source_label'] for x in self.kpis
+            if x['source_label'] in self.df_base
+            and x['source_label'] in self.df_test
+        ]
+        base = self._get_grouped_stats(self.df_base, index, columns)
+        test = self._get_grouped_stats(self.df_test, index, columns)
+        diff = self._get_paired_stats(index, columns) if self.paired else None
+
+        comparisons = []
+        for kpi in self.kpis:
+            label = kpi['target_label']
+
+            # Calculate the statistics, they are NaN if the KPI is not
+            # available in the samples (generated by old scripts)
+            (base_avg, base_pct_dev) = self._get_avg_and_pct_dev(
+                base, kpi['source_label'])
+            (test_avg, test_pct_dev) = self._get_avg_and_pct_dev(
+                test, kpi['source_label'])
+            result = self._compare_stats(base, test, kpi, diff)
+
+            # Fill the statistics and the Conclusion
+            self.df_report[label + '-BASE-AVG'] = base_avg
+            self.df_report[label + '-BASE-%SD'] = base_pct_dev
+            self.df_report[label + '-TEST-AVG'] = test_avg
+            self.df_report[label + '-TEST-%SD'] = test_pct_dev
+            for (suffix, values) in result.items():
+                self.df_report[label + '-' + suffix] = values
+            comparisons.append((base, test, kpi, result))
+
+            # Fill the power analysis
+            if self.power_analysis:
+                (pct_mde, rounds) = self._get_power_analysis(
+                    base, test, kpi, diff)
+                self.df_report[label + '-%MDE'] = pct_mde
+                self.df_report[label + '-ROUNDS'] = pd.array(
+                    rounds, dtype='Int64').astype(object)
+
+        # Adjust the Significance of all the KPIs and cases at once
+        if self.correction:
+            self._adjust_comparisons(comparisons)
+            for (base, test, kpi, result) in comparisons:
+                for suffix in ('ADJ-SIGN', 'ADJ-CONCLUSION'):
+                    self.df_report[kpi['target_label'] + '-' +
+                                   suffix] = result[suffix]
+
+        # Calculate the pooled latency percentiles
+        if self.bins_base and self.bins_test:
+            rows = self.df_report[target_keys].to_dict('records')
+            for row in rows:
+                self._calculate_and_fill_pooled_series(row, 'R-CLAT', 'r')
+                self._calculate_and_fill_pooled_series(row, 'W-CLAT', 'w')
+            pooled = pd.DataFrame(rows, index=self.df_report.index)
+            for column in pooled.columns.drop(target_keys):
+                self.df_report[column] = pooled[column]
+
+        print('[NOTE] Compared %s cases.' % len(self.df_report))
 
         return None
 
@@ -284,6 +1064,24 @@ class FioBenchmarkReporter():
         """Format the report DataFrame."""
         self.df_report = self.df_report.round(4)
         self.df_report = self.df_report.fillna('N/A')
+
+        # Add units to the columns
+        for key in self.keys:
+            if key['target_unit'] is not None:
+                pre_label = key['target_label']
+                post_label = '{0}({1})'.format(pre_label, key['target_unit'])
+                self.df_report.rename(columns={pre_label: post_label},
+                                      inplace=True)
+
+        for kpi in self.kpis:
+            if kpi['target_unit'] is not None:
+                for suffix in ('BASE-AVG', 'TEST-AVG'):
+                    pre_label = '{0}-{1}'.format(kpi['target_label'], suffix)
+                    post_label = '{0}({1})'.format(pre_label,
+                                                   kpi['target_unit'])
+                    self.df_report.rename(columns={pre_label: post_label},
+                                          inplace=True)
+
         return None
 
     def generate_report(self, params={}):
@@ -295,10 +1093,47 @@ class FioBenchmarkReporter():
         1. self.df_base: store the base samples;
         2. self.df_test: store the test samples;
 
+        Args:
+            params: dict
+                power_analysis: bool, add the columns of the power analysis;
+                max_rounds: int, the maximum of the rounds needed, 20 by
+                            default;
+                paired: bool, pair the base and test samples by the Round
+                        and get the Significance by the paired t-test;
+                correction: string, the correction for the multiple testing,
+                            'bh' or 'holm', not adjusted by default;
+
+        Returns:
+            0: Passed
+            1: Failed
+
         Updates:
             self.df_report: store the benchmark report;
 
         """
+        self.power_analysis = params.get('power_analysis', False)
+        self.max_rounds = params.get('max_rounds', self.max_rounds)
+        self.paired = params.get('paired', False)
+        self.correction = params.get('correction')
+
+        if self.correction and self.correction not in self.corrections:
+            print('[ERROR] Unknown correction "%s".' % self.correction)
+            return 1
+        if self.paired and not ('Round' in self.df_base
+                                and 'Round' in self.df_test):
+            print('[ERROR] The "Round" is required to pair the samples.')
+            return 1
+        if self.paired:
+            on = [x['source_label'] for x in self.keys] + ['Round']
+            for (name, df) in (('base', self.df_base), ('test', self.df_test)):
+                duplicated = df[on][df[on].duplicated()]
+                if len(duplicated):
+                    print('[ERROR] The Round should be unique in each case to '
+                          'pair the samples, but duplicated in the %s '
+                          'samples: %s' %
+                          (name, duplicated.iloc[0].to_dict()))
+                    return 1
+
         # Create report DataFrame
         self._create_report_dataframe()
 
@@ -308,7 +1143,236 @@ class FioBenchmarkReporter():
         # Format report DataFrame
         self._format_report_dataframe()
 
-        return None
+        return 0
+
+    def round_plan_to_yaml(self, params={}):
+        """Dump the round plan of the cases to a yaml file.
+
+        The rounds of a case are the most rounds needed by its KPIs in the
+        power analysis, the runner ("RunFioTest.py --round_plan") repeats
+        each case in the plan by its rounds.
+
+        As data source, the report DataFrame with the power analysis should
+        be ready to use.
+
+        Args:
+            params: dict
+                round_plan: string, the yaml file to dump the round plan;
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        """
+        # Parse required params
+        if 'round_plan' not in params:
+            print('[ERROR] Missing required params: params[round_plan]')
+            return 1
+
+        # Get the cases by the source KEYs in lower case (as the runner)
+        cases = self.df_report.iloc[:, :len(self.keys)]
+        cases.columns = [x['source_label'].lower() for x in self.keys]
+        rounds = self.df_report.filter(regex='-ROUNDS$').apply(
+            pd.to_numeric, errors='coerce').max(axis=1)
+
+        plan = []
+        for (case, num) in zip(cases.to_dict('records'), rounds):
+            if not np.isnan(num):
+                case = dict([(x, y.item() if hasattr(y, 'item') else y)
+                             for (x, y) in case.items()])
+                case['rounds'] = int(num)
+                plan.append(case)
+
+        try:
+            print('[NOTE] Dumping the round plan of %s cases into file '
+                  '"%s"...' % (len(plan), params['round_plan']))
+            with open(params['round_plan'], 'w') as f:
+                yaml.safe_dump({'FioRoundPlan': plan}, f,
+                               default_flow_style=False, sort_keys=False)
+
+        except Exception as err:
+            print('[ERROR] Error while dumping to file: %s' % err)
+            return 1
+
+        return 0
+
+    def load_sample_sets(self, params={}):
+        """Load the labelled sample sets for the N-way comparison.
+
+        Args:
+            params: dict
+                samples: list, the (label, file) of the sample sets, such as
+                         [('8.1', 'rhel81.csv'), ('8.2', 'rhel82.csv')];
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        Updates:
+            self.samples: store the labelled sample sets;
+
+        Raises:
+            1. Error while reading from file
+
+        """
+        # Parse required params
+        if 'samples' not in params:
+            print('[ERROR] Missing required params: params[samples]')
+            return 1
+
+        try:
+            for (label, filename) in params['samples']:
+                print('[NOTE] Reading %s samples from file "%s"...' %
+                      (label, filename))
+                self.samples.append(
+                    (label,
+                     self._get_merged_client_samples(
+                         read_dataframe(filename))))
+
+        except Exception as err:
+            print('[ERROR] Error while reading from file: %s' % err)
+            return 1
+
+        return 0
+
+    def _get_comparison_pairs(self, labels, reference=None, all_pairs=False):
+        """Get the (base, test) pairs of the sample sets to compare.
+
+        Args:
+            labels: list, the labels of the sample sets;
+            reference: string, the label of the base for all the others, the
+                       first one by default;
+            all_pairs: bool, compare all the pairs, each set against all the
+                       sets before it;
+
+        Returns:
+            The list of (base_label, test_label).
+
+        """
+        if all_pairs:
+            return list(itertools.combinations(labels, 2))
+
+        reference = reference or labels[0]
+        return [(reference, x) for x in labels if x != reference]
+
+    def generate_nway_report(self, params={}):
+        """Generate the N-way benchmark report.
+
+        The statistics of each sample set are calculated once, then each
+        pair of the sample sets are compared by the statistics. The report
+        has a row for each case in any of the sample sets, and the following
+        columns for each KPI:
+        1. <KPI>-<LABEL>-AVG and <KPI>-<LABEL>-%SD for each sample set;
+        2. <KPI>-<TEST>-VS-<BASE>-%DIFF, -SIGN and -CONCLUSION for each pair,
+           and -ADJ-SIGN and -ADJ-CONCLUSION with the correction.
+
+        As data source, the self.samples should be ready to use.
+
+        Args:
+            params: dict
+                reference: string, the label of the base for all the others,
+                           the first one by default;
+                all_pairs: bool, compare all the pairs instead;
+                correction: string, the correction for the multiple testing,
+                            'bh' or 'holm', not adjusted by default;
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        Updates:
+            self.df_report: store the benchmark report;
+
+        """
+        labels = [x[0] for x in self.samples]
+        if len(labels) < 2 or len(set(labels)) != len(labels):
+            print('[ERROR] At least 2 sample sets with unique labels are '
+                  'required.')
+            return 1
+        if params.get('reference') and params['reference'] not in labels:
+            print('[ERROR] The reference "%s" is not in the sample sets.' %
+                  params['reference'])
+            return 1
+
+        self.correction = params.get('correction')
+        if self.correction and self.correction not in self.corrections:
+            print('[ERROR] Unknown correction "%s".' % self.correction)
+            return 1
+
+        pairs = self._get_comparison_pairs(labels, params.get('reference'),
+                                           params.get('all_pairs', False))
+
+        # Create the report DataFrame by the cases of all the sample sets
+        source_keys = [x['source_label'] for x in self.keys]
+        target_keys = [x['target_label'] for x in self.keys]
+        self.df_report = pd.concat([x[1][source_keys] for x in self.samples
+                                    ]).drop_duplicates()
+        self.df_report.columns = target_keys
+        self.df_report = self.df_report.sort_values(by=target_keys)
+        self.df_report = self.df_report.reset_index().drop(columns=['index'])
+
+        # Calculate the statistics of each sample set once
+        index = pd.MultiIndex.from_frame(self.df_report[target_keys])
+        stats = {}
+        for (label, df) in self.samples:
+            columns = [
+                x['source_label'] for x in self.kpis
+                if x['source_label'] in df
+            ]
+            stats[label] = self._get_grouped_stats(df, index, columns)
+
+        # Compare the pairs by the statistics
+        comparisons = []
+        for kpi in self.kpis:
+            for (base_label, test_label) in pairs:
+                result = self._compare_stats(stats[base_label],
+                                             stats[test_label], kpi)
+                comparisons.append(
+                    (stats[base_label], stats[test_label], kpi, result))
+
+        # Adjust the Significance of all the KPIs and pairs at once
+        if self.correction:
+            self._adjust_comparisons(comparisons)
+
+        # Fill the statistics and the comparisons
+        report = {}
+        results = iter([x[3] for x in comparisons])
+        for kpi in self.kpis:
+            name = kpi['target_label']
+            unit = '(%s)' % kpi['target_unit'] if kpi['target_unit'] else ''
+            for label in labels:
+                (avg, pct_dev) = self._get_avg_and_pct_dev(
+                    stats[label], kpi['source_label'])
+                report['%s-%s-AVG%s' % (name, label, unit)] = avg
+                report['%s-%s-%%SD' % (name, label)] = pct_dev
+            for (base_label, test_label) in pairs:
+                result = next(results)
+                prefix = '%s-%s-VS-%s' % (name, test_label, base_label)
+                for suffix in ('%DIFF', '%DIFF-CI-LOW', '%DIFF-CI-HIGH',
+                               'SIGN', 'ADJ-SIGN', 'CONCLUSION',
+                               'ADJ-CONCLUSION'):
+                    if suffix in result:
+                        report[prefix + '-' + suffix] = result[suffix]
+
+        self.df_report = pd.concat(
+            [self.df_report,
+             pd.DataFrame(report, index=self.df_report.index)],
+            axis=1)
+        print('[NOTE] Compared %s cases in %s pairs of %s sample sets.' %
+              (len(self.df_report), len(pairs), len(labels)))
+
+        # Format report DataFrame
+        self.df_report = self.df_report.round(4)
+        self.df_report = self.df_report.fillna('N/A')
+        for key in self.keys:
+            if key['target_unit'] is not None:
+                self.df_report.rename(columns={
+                    key['target_label']:
+                    '{0}({1})'.format(key['target_label'], key['target_unit'])
+                },
+                                      inplace=True)
+
+        return 0
 
     def report_to_csv(self, params={}):
         """Dump the report DataFrame to a csv file.
@@ -324,7 +1388,7 @@ class FioBenchmarkReporter():
             1: Failed
 
         Raises:
-            1. Error while dumping to csv file
+            1. Error while dumping to file
 
         """
         # Parse required params
@@ -334,23 +1398,50 @@ class FioBenchmarkReporter():
 
         # Write the report to the csv file
         try:
-            print('[NOTE] Dumping data into csv file "%s"...' %
+            print('[NOTE] Dumping data into file "%s"...' %
                   params['report_csv'])
-            content = self.df_report.to_csv()
-            with open(params['report_csv'], 'w') as f:
-                f.write(content)
+            write_dataframe(self.df_report, params['report_csv'])
             print('[NOTE] Finished!')
 
         except Exception as err:
-            print('[ERROR] Error while dumping to csv file: %s' % err)
+            print('[ERROR] Error while dumping to file: %s' % err)
             return 1
 
         return 0
 
 
-def generate_fio_benchmark_report(base_csv, test_csv, report_csv):
+def generate_fio_benchmark_report(base_csv,
+                                  test_csv,
+                                  report_csv,
+                                  base_bins=None,
+                                  test_bins=None,
+                                  config=None,
+                                  baseline_db=None,
+                                  baseline_runs=5,
+                                  baseline_host=None,
+                                  baseline_release=None,
+                                  power_analysis=False,
+                                  max_rounds=20,
+                                  round_plan=None,
+                                  paired=False,
+                                  correction=None):
     """Generate FIO benchmark report."""
-    fiobenchreporter = FioBenchmarkReporter()
+    try:
+        fiobenchreporter = FioBenchmarkReporter(config)
+    except Exception as err:
+        print('[ERROR] Error while loading the config: %s' % err)
+        exit(1)
+
+    # Load base samples from the rolling baseline
+    if baseline_db:
+        return_value = fiobenchreporter.load_baseline({
+            'baseline_db': baseline_db,
+            'baseline_runs': baseline_runs,
+            'host': baseline_host,
+            'release': baseline_release
+        })
+        if return_value:
+            exit(1)
 
     # Load base and test samples
     return_value = fiobenchreporter.load_samples({
@@ -360,8 +1451,66 @@ def generate_fio_benchmark_report(base_csv, test_csv, report_csv):
     if return_value:
         exit(1)
 
+    # Load base and test latency bins
+    if base_bins and test_bins:
+        return_value = fiobenchreporter.load_bins({
+            'base_bins': base_bins,
+            'test_bins': test_bins
+        })
+        if return_value:
+            exit(1)
+
     # Generate benchmark report
-    fiobenchreporter.generate_report()
+    return_value = fiobenchreporter.generate_report({
+        'power_analysis': power_analysis or bool(round_plan),
+        'max_rounds': max_rounds,
+        'paired': paired,
+        'correction': correction
+    })
+    if return_value:
+        exit(1)
+
+    # Dump the round plan as yaml file
+    if round_plan:
+        return_value = fiobenchreporter.round_plan_to_yaml(
+            {'round_plan': round_plan})
+        if return_value:
+            exit(1)
+
+    # Dump the report as CSV file
+    return_value = fiobenchreporter.report_to_csv({'report_csv': report_csv})
+    if return_value:
+        exit(1)
+
+    exit(0)
+
+
+def generate_fio_nway_benchmark_report(samples,
+                                       report_csv,
+                                       reference=None,
+                                       all_pairs=False,
+                                       config=None,
+                                       correction=None):
+    """Generate FIO N-way benchmark report."""
+    try:
+        fiobenchreporter = FioBenchmarkReporter(config)
+    except Exception as err:
+        print('[ERROR] Error while loading the config: %s' % err)
+        exit(1)
+
+    # Load the labelled sample sets
+    return_value = fiobenchreporter.load_sample_sets({'samples': samples})
+    if return_value:
+        exit(1)
+
+    # Generate N-way benchmark report
+    return_value = fiobenchreporter.generate_nway_report({
+        'reference': reference,
+        'all_pairs': all_pairs,
+        'correction': correction
+    })
+    if return_value:
+        exit(1)
 
     # Dump the report as CSV file
     return_value = fiobenchreporter.report_to_csv({'report_csv': report_csv})
@@ -384,15 +1533,138 @@ def generate_fio_benchmark_report(base_csv, test_csv, report_csv):
     '--report_csv',
     type=click.Path(),
     help='Specify the CSV file to store the benchmark report.')
-def cli(base_csv, test_csv, report_csv):
+@click.option(
+    '--base_bins',
+    type=click.Path(exists=True),
+    help='Specify the npz file of the base latency bins.')
+@click.option(
+    '--test_bins',
+    type=click.Path(exists=True),
+    help='Specify the npz file of the test latency bins.')
+@click.option(
+    '--config',
+    type=click.Path(exists=True),
+    help='Specify the yaml file of the KEYs, KPIs and thresholds, \
+"benchmark_reporter_config.yaml" along with this script by default.')
+@click.option(
+    '--baseline_db',
+    type=click.Path(exists=True),
+    help='Specify the database file of the baseline store, to compare \
+against the rolling baseline of it instead of the base samples.')
+@click.option(
+    '--baseline_runs',
+    type=int,
+    default=5,
+    show_default=True,
+    help='Specify the number of the last accepted runs for the rolling \
+baseline.')
+@click.option(
+    '--baseline_host',
+    help='Specify the host of the runs for the rolling baseline.')
+@click.option(
+    '--baseline_release',
+    help='Specify the release of the runs for the rolling baseline.')
+@click.option(
+    '--power_analysis',
+    is_flag=True,
+    help='Add the minimum detectable effect and the rounds needed for each \
+KPI into the report.')
+@click.option(
+    '--max_rounds',
+    type=click.IntRange(2, 1000),
+    default=20,
+    show_default=True,
+    help='Specify the maximum of the rounds needed by the power analysis.')
+@click.option(
+    '--round_plan',
+    type=click.Path(),
+    help='Specify the yaml file to store the rounds needed for each case, \
+which can be used by "RunFioTest.py --round_plan".')
+@click.option(
+    '--paired',
+    is_flag=True,
+    help='Pair the base and test samples by the Round (such as the A/B tests \
+by "RunFioTest.py --ab_labels") and get the Significance by the paired \
+t-test.')
+@click.option(
+    '--correction',
+    type=click.Choice(FioBenchmarkReporter.corrections),
+    help='Adjust the Significance of all the KPIs and cases in the report \
+for the multiple testing, by Benjamini-Hochberg (bh) or Holm (holm), into \
+the ADJ-SIGN and ADJ-CONCLUSION columns.')
+@click.option(
+    '--samples',
+    multiple=True,
+    help='Specify a labelled sample set as "LABEL=CSV" for the N-way \
+comparison, can be specified multiple times instead of "--base_csv" and \
+"--test_csv".')
+@click.option(
+    '--reference',
+    help='Specify the label of the sample set to compare the others \
+against, the first one by default.')
+@click.option(
+    '--all_pairs',
+    is_flag=True,
+    help='Compare all the pairs of the sample sets instead.')
+def cli(base_csv, test_csv, report_csv, base_bins, test_bins, config,
+        baseline_db, baseline_runs, baseline_host, baseline_release,
+        power_analysis, max_rounds, round_plan, paired, correction, samples,
+        reference, all_pairs):
     """Command Line Interface."""
+    # Generate FIO N-way benchmark report
+    if samples:
+        sample_sets = [x.partition('=')[::2] for x in samples]
+        if not report_csv or not all(x[0] and x[1] for x in sample_sets):
+            print('[ERROR] Missing parameter, use "--help" to check the '
+                  'usage.')
+            exit(1)
+        options = {
+            '--base_csv': base_csv,
+            '--test_csv': test_csv,
+            '--base_bins': base_bins,
+            '--test_bins': test_bins,
+            '--baseline_db': baseline_db,
+            '--power_analysis': power_analysis,
+            '--round_plan': round_plan,
+            '--paired': paired
+        }
+        unsupported = [x for (x, y) in options.items() if y]
+        if unsupported:
+            print('[ERROR] The N-way comparison ("--samples") does not '
+                  'support: %s' % ', '.join(unsupported))
+            exit(1)
+        for (label, filename) in sample_sets:
+            if not os.path.isfile(filename):
+                print('[ERROR] The CSV file of "%s" does not exist: %s' %
+                      (label, filename))
+                exit(1)
+        generate_fio_nway_benchmark_report(sample_sets, report_csv,
+                                           reference, all_pairs, config,
+                                           correction)
+
     # Parse and check the parameters
-    if not base_csv or not test_csv or not report_csv:
+    if not (base_csv or baseline_db) or not test_csv or not report_csv:
         print('[ERROR] Missing parameter, use "--help" to check the usage.')
         exit(1)
+    if base_csv and baseline_db:
+        print('[ERROR] The "--base_csv" and "--baseline_db" are mutually '
+              'exclusive.')
+        exit(1)
+    if paired and baseline_db:
+        print('[ERROR] The rolling baseline can not be paired with the test '
+              'samples.')
+        exit(1)
+    if bool(base_bins) != bool(test_bins):
+        print('[ERROR] The "--base_bins" and "--test_bins" should be '
+              'specified together.')
+        exit(1)
 
     # Generate FIO benchmark report
-    generate_fio_benchmark_report(base_csv, test_csv, report_csv)
+    generate_fio_benchmark_report(base_csv, test_csv, report_csv, base_bins,
+                                  test_bins, config, baseline_db,
+                                  baseline_runs, baseline_host,
+                                  baseline_release, power_analysis,
+                                  max_rounds, round_plan, paired, correction)
 
 
 if __name__ == '__main__':
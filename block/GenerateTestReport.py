@@ -33,13 +33,49 @@ v2.6.1  2019-12-30  charles.shih  Add "NaN" to the report if disk utils
                                   unavailable
 v2.6.2  2019-12-30  charles.shih  Remove temporary files after parsing fiolog
 v2.7    2020-07-13  charles.shih  Fix a bug to handle fio-3.19 json outputs
+v2.8    2026-10-18  agent         Add queue depth saturation analysis.
+v2.9    2026-10-18  agent         Collect achieved queue depth and submission
+                                  efficiency KPIs.
+v2.10   2026-10-18  agent         Decompose the latency by disk statistics.
+v2.11   2026-10-18  agent         Decode the json block in place by mmap.
+v2.12   2026-10-18  agent         Support loading fio logs in parallel.
+v2.13   2026-10-18  agent         Read needed files from tarballs in memory.
+v2.14   2026-10-18  agent         Cache the performance KPIs in SQLite.
+v2.15   2026-10-18  agent         Collect the latency percentiles and bins.
+v2.16   2026-10-18  agent         Analyse the stability by the fio bw/iops/lat
+                                  logs.
+v2.17   2026-10-18  agent         Support Parquet and Feather reports.
+v2.18   2026-10-18  agent         Collect CPU efficiency KPIs from SAR logs.
+v2.19   2026-10-18  agent         Filter the tests by the manifest.
+v2.20   2026-10-18  agent         Extract the KPIs while streaming the logs.
+v2.21   2026-10-18  agent         Support watching the result path and
+                                  updating the report for new arrivals.
+v2.22   2026-10-18  agent         Discover fio logs in multiple directories,
+                                  identify the run / host / release and drop
+                                  the duplicate tests.
 """
 
 import json
 import re
 import os
+import io
+import glob
+import hashlib
+import mmap
+import time
+import ctypes
+import ctypes.util
+import select
+import sqlite3
+import contextlib
+import multiprocessing
 import click
 import pandas as pd
+import numpy as np
+
+from report_io import get_members_from_tarball
+from report_io import replace_atomically
+from report_io import write_dataframe
 
 
 class FioTestReporter():
@@ -51,23 +87,47 @@ class FioTestReporter():
     3. It generates the report DataFrame and dump to a CSV file;
 
     Attributes:
-        raw_data_list: the list to store raw data.
         perf_kpi_list: the list to store performance KPI tuples.
         df_report: a DataFrame to store the test report.
+        df_saturation: a DataFrame to store the saturation analysis.
+        percentiles: the percentiles of completion latency to report.
 
     """
 
-    # The list of raw data, the item is loaded from fio log file.
-    # Each item is a full data source (raw data) in Python dict format.
-    raw_data_list = []
+    # The version of the performance KPIs stored in the cache, should be
+    # increased once the KPIs extracted from the raw data are changed.
+    cache_version = 9
+
+    # The percentiles of completion latency to report, for read and write.
+    percentiles = ['50', '95', '99', '99.9', '99.99']
+
+    # The fio logs of intervals ("<casename>_<type>.<jobnum>.log") to load.
+    interval_logs = ['bw', 'iops', 'lat', 'clat', 'slat']
+
+    # The KPIs which identify a test, the latency bins are saved by them.
+    key_kpis = [
+        'backend', 'driver', 'format', 'rw', 'bs', 'iodepth', 'numjobs',
+        'round'
+    ]
 
-    # The list of performance KPIs, which are extracted from the raw data.
-    # Each item represents a single fio test results in Python dict format.
-    perf_kpi_list = []
+    def __init__(self):
+        """Initialize the state of the reporter."""
+        # The list of performance KPIs, which are extracted from the raw
+        # data. Each item represents a single fio test results in Python
+        # dict format.
+        self.perf_kpi_list = []
 
-    # The DataFrame to store performance KPIs for reporting, which is powered
-    # by Pandas.
-    df_report = None
+        # The DataFrame to store performance KPIs for reporting, which is
+        # powered by Pandas.
+        self.df_report = None
+
+        # The DataFrame to store the queue depth saturation analysis.
+        self.df_saturation = None
+
+        # The files parsed by this reporter, in the format of {filename:
+        # ((size, mtime), (result, perf_kpi))}, so that only the new or
+        # changed files are parsed while watching the result path.
+        self.parsed_files = {}
 
     def _byteify(self, inputs):
         """Convert unicode to utf-8 string.
@@ -93,12 +153,66 @@ class FioTestReporter():
         else:
             return inputs
 
+    def _get_raw_data_from_fio_content(self, content, data_file=''):
+        """Get the raw data from the content of a fio log file.
+
+        This function locates the first json block which is expected to be
+        generated by the fio --output=json/json+, and decodes it into Python
+        dict format. The block starts with a line of "{" and ends with a line
+        of "}", only the block itself is copied and decoded.
+
+        Args:
+            content: bytes-like (such as bytes or mmap), the fio log content.
+            data_file: string, the name of the fio log file for messages.
+
+        Returns:
+            This function returns a tuple like (result, raw_data):
+            result:
+                0: Passed
+                1: Failed
+            raw_data:
+                The raw data in Python dict format.
+
+        Raises:
+            1. Error while decoding the json block
+
+        """
+        # Locate the first json block, "begin" is 0 if not found
+        if content[:1] == b'{':
+            begin = 0
+            end = content.find(b'\n}')
+        else:
+            begin = content.find(b'\n{') + 1
+            end = content.find(b'\n}', begin) if begin > 0 else -1
+
+        if end < 0:
+            print('[ERROR] Cannot found validate json block in file: %s' %
+                  data_file)
+            return (1, None)
+
+        # Decode the json block
+        try:
+            json_data = json.JSONDecoder().raw_decode(
+                content[begin:end + 2].decode('utf-8'))[0]
+            if '' == b'':
+                # Convert to byteify for Python 2
+                raw_data = self._byteify(json_data)
+            else:
+                # Keep strings for Python 3
+                raw_data = json_data
+
+        except Exception as err:
+            print('[ERROR] Error while decoding the json block: %s' % err)
+            return (1, None)
+
+        return (0, raw_data)
+
     def _get_raw_data_from_fio_log(self, data_file):
         """Get the raw data from a specified fio log file.
 
-        This function open a specified fio log file and read the first json
-        block which is expected to be generated by the fio --output=json/json+.
-        Then it converts this block into Python dict format and returns it.
+        This function maps a specified fio log file into memory and gets the
+        raw data from its first json block, without reading the whole file
+        or writing any temporary file.
 
         Args:
             data_file: string, the path to the fio log file.
@@ -113,7 +227,6 @@ class FioTestReporter():
 
         Raises:
             1. Error while handling fio log file
-            2. Error while handling the new json file
 
         """
         # Parse required params
@@ -121,95 +234,1310 @@ class FioTestReporter():
             print('[ERROR] Missing required params: data_file')
             return (1, None)
 
-        # Get the offsets of the first json block
         try:
-            with open(data_file, 'r') as f:
-                file_content = f.readlines()
-
-            # Locate the first json block
-            begin = end = num = 0
-            while num < len(file_content):
-                if re.search(r'^{', file_content[num]):
-                    begin = num
-                    break
-                num += 1
-            while num < len(file_content):
-                if re.search(r'^}', file_content[num]):
-                    end = num
-                    break
-                num += 1
+            with open(data_file, 'rb') as f:
+                with contextlib.closing(
+                        mmap.mmap(f.fileno(), 0,
+                                  access=mmap.ACCESS_READ)) as content:
+                    return self._get_raw_data_from_fio_content(
+                        content, data_file)
+
         except Exception as err:
             print('[ERROR] Error while handling fio log file: %s' % err)
             return (1, None)
 
-        # Extract the json block into a new file and get the raw_data
-        if begin >= end:
-            print('[ERROR] Cannot found validate json block in file: %s' %
-                  data_file)
-            return (1, None)
+    def _get_diskstats_from_files(self, data_file):
+        """Get the disk statistics samples of a specified fio log file.
 
-        try:
-            with open(data_file + '.json', 'w') as json_file:
-                json_file.writelines(file_content[begin:end + 1])
-            with open(data_file + '.json', 'r') as json_file:
-                json_data = json.load(json_file)
-                if '' == b'':
-                    # Convert to byteify for Python 2
-                    raw_data = self._byteify(json_data)
-                else:
-                    # Keep strings for Python 3
-                    raw_data = json_data
+        The runner samples "/proc/diskstats" every second into
+        "<casename>-diskstats.log" along with each test.
+
+        Args:
+            data_file: string, the path to the fio log file.
+
+        Returns:
+            The content of the samples, or None if they are not available.
+
+        """
+        stat_file = data_file.replace('.fiolog', '-diskstats.log')
+        if not os.path.isfile(stat_file):
+            return None
+
+        with open(stat_file, 'r') as f:
+            return f.read()
+
+    def _get_sar_from_files(self, data_file):
+        """Get the SAR CPU log and CPU info of a specified fio log file.
+
+        The runner saves "sar -u" outputs into "<casename>-sa_cpu.log" and
+        "/proc/cpuinfo" into "<casename>-cpuinfo.log".
+
+        Args:
+            data_file: string, the path to the fio log file.
+
+        Returns:
+            A dict like {'cpu': content, 'cpuinfo': content}, the content is
+            None if the file is not available.
+
+        """
+        sar = {}
+        for (key, suffix) in (('cpu', '-sa_cpu.log'), ('cpuinfo',
+                                                       '-cpuinfo.log')):
+            sar_file = data_file.replace('.fiolog', suffix)
+            sar[key] = None
+            if os.path.isfile(sar_file):
+                with open(sar_file, 'r') as f:
+                    sar[key] = f.read()
+
+        return sar
+
+    def _get_interval_logs_from_files(self, data_file):
+        """Get the fio logs of intervals of a specified fio log file.
+
+        With "plots" enabled, the runner generates the bw/iops/lat logs for
+        each job, named as "<casename>_<type>.<jobnum>.log".
+
+        Args:
+            data_file: string, the path to the fio log file.
+
+        Returns:
+            A dict like {type: [content of each job]} for self.interval_logs.
+
+        """
+        prefix = data_file.replace('.fiolog', '')
+        logs = {}
+        for log_type in self.interval_logs:
+            logs[log_type] = []
+            for log_file in sorted(glob.glob(glob.escape(prefix) + '_' +
+                                             log_type + '.*.log')):
+                with open(log_file, 'rb') as f:
+                    logs[log_type].append(f.read())
+
+        return logs
+
+    def _get_fio_log_files(self, result_path, recursive=False):
+        """Get the fio log files and tarballs in a specified path.
+
+        Args:
+            result_path: string, the path where the fio log files located.
+            recursive: bool, search the subdirectories as well.
+
+        Returns:
+            The sorted list of the *.fiolog and *.tar.gz files, the files in
+            a directory are listed before its subdirectories.
+
+        """
+        files = []
+        for (path, dirs, fnames) in os.walk(result_path):
+            dirs.sort()
+            for fname in sorted(fnames):
+                filename = path + os.sep + fname
+                if fname.endswith(('.fiolog', '.tar.gz')) and os.path.isfile(
+                        filename):
+                    files.append(filename)
+            if not recursive:
+                break
+
+        return files
+
+    def _get_result_dirs(self, patterns):
+        """Get the result directories by the paths or glob patterns.
+
+        Args:
+            patterns: list, the paths or glob patterns such as "logs/*_FIO_*"
+                      and "logs/**" (any depth).
+
+        Returns:
+            The list of the directories in the order of the patterns.
+
+        """
+        result_dirs = []
+        for pattern in patterns:
+            for path in sorted(
+                    glob.glob(os.path.expanduser(pattern), recursive=True)):
+                path = os.path.normpath(path)
+                if os.path.isdir(path) and path not in result_dirs:
+                    result_dirs.append(path)
+
+        return result_dirs
+
+    def _find_fio_log_files(self, result_paths, recursive=False):
+        """Find the fio log files in the result directories.
+
+        The files reached more than once (by the overlapping patterns or the
+        symbolic links) are only listed at the first time.
+
+        Args:
+            result_paths: list, the paths or glob patterns of the result
+                          directories, or a string for a single one.
+            recursive: bool, search the subdirectories as well.
+
+        Returns:
+            A dict like {filename: result_dir} in the order of the files.
+
+        """
+        if isinstance(result_paths, str):
+            result_paths = [result_paths]
+
+        found = {}
+        realpaths = set()
+        for result_dir in self._get_result_dirs(result_paths):
+            for filename in self._get_fio_log_files(result_dir, recursive):
+                realpath = os.path.realpath(filename)
+                if realpath not in realpaths:
+                    realpaths.add(realpath)
+                    found[filename] = result_dir
+
+        return found
+
+    def _get_run_id(self, filename, result_dir):
+        """Get the run ID of a fio log file.
+
+        The run ID is the path of the directory where the file located,
+        relative to the parent of the result directory. Such as "ESXi_FIO_
+        RHEL7u6_20180809" for the files in that result directory, and
+        "ESXi_FIO_RHEL7u6_20180809/guest1" for those in its subdirectory.
+
+        """
+        return os.path.relpath(
+            os.path.dirname(os.path.abspath(filename)),
+            os.path.dirname(os.path.abspath(result_dir)))
+
+    def _get_case_signature(self, perf_kpi):
+        """Get the signature of a test to find the duplicates.
+
+        The tests are identical if all the performance KPIs (except the run
+        ID) are the same, such as the same tarball copied into two runs.
+
+        """
+        return hash(
+            json.dumps(dict([(x, y) for (x, y) in perf_kpi.items()
+                             if x != 'run']),
+                       sort_keys=True,
+                       default=lambda x: x.tolist()))
+
+    def _get_raw_data_from_file(self, filename):
+        """Get the raw data from a fio log file or a tarball.
+
+        For the tarball, only the fio log, the disk statistics snapshots, the
+        SAR CPU logs and the fio logs of intervals are read into memory,
+        nothing is extracted to the disk.
+
+        Args:
+            filename: string, the path to the *.fiolog or *.tar.gz file.
+
+        Returns:
+            This function returns a tuple like (result, raw_data):
+            result:
+                0: Passed
+                1: Failed
+            raw_data:
+                The raw data in Python dict format.
+
+        Raises:
+            1. Error while handling the tarball
+
+        """
+        if not filename.endswith('.tar.gz'):
+            (result, raw_data) = self._get_raw_data_from_fio_log(filename)
+            if result == 0:
+                raw_data['diskstats'] = self._get_diskstats_from_files(
+                    filename)
+                raw_data['sar'] = self._get_sar_from_files(filename)
+                raw_data['intervals'] = self._get_interval_logs_from_files(
+                    filename)
+            return (result, raw_data)
 
+        try:
+            members = get_members_from_tarball(
+                filename,
+                ('.fiolog', '-diskstats.log', '-sa_cpu.log', '-cpuinfo.log'),
+                r'_(%s)\.\d+\.log' % '|'.join(self.interval_logs))
         except Exception as err:
-            print('[ERROR] Error while handling the new json file: %s' % err)
+            print('[ERROR] Error while handling the tarball: %s' % err)
             return (1, None)
 
-        os.unlink(data_file + '.json')
-        return (0, raw_data)
+        if '.fiolog' not in members:
+            print('[ERROR] Cannot found fio log file in tarball: %s' %
+                  filename)
+            return (1, None)
+
+        (result, raw_data) = self._get_raw_data_from_fio_content(
+            members['.fiolog'], filename)
+        if result == 0:
+            raw_data['diskstats'] = members['-diskstats.log'].decode(
+                'utf-8') if '-diskstats.log' in members else None
 
-    def load_raw_data_from_fio_logs(self, params={}):
-        """Load raw data from fio log files.
+            raw_data['sar'] = {}
+            for (key, suffix) in (('cpu', '-sa_cpu.log'), ('cpuinfo',
+                                                           '-cpuinfo.log')):
+                raw_data['sar'][key] = members[suffix].decode(
+                    'utf-8') if suffix in members else None
 
-        This function loads raw data from a sort of fio log files and stores
-        the raw data (in Python dict format) into self.raw_data_list.
+            raw_data['intervals'] = {}
+            for log_type in self.interval_logs:
+                raw_data['intervals'][log_type] = [
+                    members[x] for x in sorted(members)
+                    if re.match(r'_%s\.\d+\.log$' % log_type, x)
+                ]
+
+        return (result, raw_data)
+
+    def _get_perf_kpi_from_file(self, filename):
+        """Get the performance KPIs from a fio log file or a tarball.
 
         Args:
-            params: dict
-                result_path: string, the path where the fio log files located.
+            filename: string, the path to the *.fiolog or *.tar.gz file.
+
+        Returns:
+            This function returns a tuple like (result, perf_kpi):
+            result:
+                0: Passed
+                1: Failed to load the raw data
+                2: Failed to extract the performance KPIs
+            perf_kpi:
+                The performance KPIs in Python dict format.
+
+        """
+        (result, raw_data) = self._get_raw_data_from_file(filename)
+        if result:
+            return (1, None)
+
+        (result, perf_kpi) = self._get_kpis_from_raw_data(raw_data)
+        if result:
+            return (2, None)
+
+        return (0, perf_kpi)
+
+    def load_perf_kpis_from_fio_logs(self, params={}):
+        """Load performance KPIs from fio log files.
+
+        This function consumes _iter_perf_kpis_from_fio_logs(), the KPIs are
+        stored into self.perf_kpi_list in the order of the file names once
+        they are extracted.
+
+        Args:
+            params: dict, see _iter_perf_kpis_from_fio_logs().
 
         Returns:
             0: Passed
             1: Failed
 
         Updates:
-            self.raw_data_list: store all the raw data;
+            self.perf_kpi_list: store the performance KPI tuples.
+            self.parsed_files: store the results of the files.
+
+        """
+        return_value = 0
+        for (result, perf_kpi) in self._iter_perf_kpis_from_fio_logs(params):
+            if result == 0:
+                self.perf_kpi_list.append(perf_kpi)
+            else:
+                return_value = 1
+
+        return return_value
+
+    def _iter_perf_kpis_from_fio_logs(self, params):
+        """Iterate the performance KPIs from fio log files.
+
+        This generator handles the fio log files one by one, or by a pool of
+        processes if more than one job is specified. The raw data of a file
+        is loaded and dropped once the performance KPIs are extracted, and
+        the KPIs are yielded in the order of the file names as soon as they
+        are ready. So the peak memory scales with the number of KPIs instead
+        of the size of the raw data.
+
+        With a cache, the performance KPIs of the files which are unchanged
+        (the same path, size and mtime) since the last run are taken from the
+        cache directly, so are the files moved or copied elsewhere (the same
+        name, size and mtime or content). Only the new or changed files are
+        parsed.
+
+        With a filter, the files are selected by the manifest before being
+        opened, the files not in the manifest are filtered by their KPIs.
+
+        The fio log files can be found in multiple result directories (by
+        the paths or glob patterns) and their subdirectories. The run ID is
+        derived from the path of each file, and the identical tests (such as
+        those copied into multiple runs) are only reported once.
+
+        The files parsed by this reporter before (see self.parsed_files) are
+        not parsed again unless they are changed, so that calling this
+        function repeatedly only handles the new arrivals.
+
+        Args:
+            params: dict
+                result_path: string or list, the paths or glob patterns of
+                             the directories where the fio log files
+                             located.
+                recursive: bool, search the subdirectories as well.
+                jobs: int, the number of processes, 1 by default.
+                cache: string, the path to the SQLite cache, optional.
+                rebuild: bool, drop the cache and parse all the files.
+                filter: string, the filter expression, optional.
+
+        Yields:
+            A tuple like (result, perf_kpi) for each test:
+            result:
+                0: Passed
+                1: Failed, the error has been printed
+            perf_kpi:
+                The performance KPIs in Python dict format, with the run ID.
+
+        Updates:
+            self.parsed_files: store the results of the files.
 
         """
         # Parse required params
         if 'result_path' not in params:
             print('[ERROR] Missing required params: params[result_path]')
-            return 1
+            yield (1, None)
+            return
+
+        jobs = params.get('jobs', 1)
+        result_dirs = self._find_fio_log_files(params['result_path'],
+                                               params.get('recursive', False))
+        all_files = list(result_dirs)
+
+        # Select the files by the manifest
+        files = all_files
+        unresolved = set()
+        if params.get('filter'):
+            try:
+                (files, unresolved) = self._filter_fio_log_files(
+                    all_files, params['filter'])
+            except Exception as err:
+                print('[ERROR] Error while filtering by the manifest: %s' %
+                      err)
+                yield (1, None)
+                return
+            print('[NOTE] Selected %s of %s files by the manifest, %s files '
+                  'are not in the manifest.' %
+                  (len(files) - len(unresolved), len(all_files),
+                   len(unresolved)))
+
+        # Get performance KPIs of the files parsed before
+        stats = {}
+        results = {}
+        for filename in files:
+            try:
+                stats[filename] = self._get_file_stat(filename)
+            except OSError:
+                # Removed since listed, such as being renamed
+                continue
+            parsed = self.parsed_files.get(filename)
+            if parsed and parsed[0] == stats[filename]:
+                results[filename] = parsed[1]
+        files = [x for x in files if x in stats]
+        self.parsed_files = {}
+
+        # Get performance KPIs from the cache
+        cache = None
+        moved = {}
+        if params.get('cache'):
+            try:
+                cache = self._open_cache(params['cache'],
+                                         params.get('rebuild', False))
+                (cached, moved) = self._get_perf_kpis_from_cache(
+                    cache, [x for x in files if x not in results])
+                results.update(cached)
+                print('[NOTE] Got performance KPIs of %s files from the '
+                      'cache.' % len(cached))
+            except Exception as err:
+                print('[WARNING] Error while reading the cache: %s' % err)
+                cache = None
+
+        # Get performance KPIs from files, in the order of the files
+        missed = [x for x in files if x not in results]
+        pool = None
+        if jobs > 1 and len(missed) > 1:
+            pool = multiprocessing.Pool(jobs)
+            parsing = pool.imap(get_perf_kpi_from_file, missed,
+                                max(1, len(missed) // (jobs * 4)))
+        else:
+            parsing = (self._get_perf_kpi_from_file(x) for x in missed)
 
-        # Load raw data from files
-        for fname in os.listdir(params['result_path']):
-            filename = params['result_path'] + os.sep + fname
+        # The files not in the manifest are filtered by their KPIs
+        expression = params.get('filter') if unresolved else None
 
-            tmpfolder = '/tmp/fio-report.tmp'
-            if filename.endswith('.tar.gz') and os.path.isfile(filename):
-                os.system('mkdir -p {0}'.format(tmpfolder))
-                os.system('tar xf {1} -C {0}'.format(tmpfolder, filename))
-                filename = tmpfolder + os.sep + fname.replace(
-                    '.tar.gz', '.fiolog')
+        parsed = {}
+        signatures = set()
+        duplicates = 0
+        try:
+            for filename in files:
+                if filename in results:
+                    (result, perf_kpi) = results.pop(filename)
+                else:
+                    (result, perf_kpi) = parsed[filename] = next(parsing)
+                self.parsed_files[filename] = (stats[filename],
+                                               (result, perf_kpi))
+
+                # Report the errors for each file
+                if result == 1:
+                    print('[ERROR] Failed to load raw data from file: %s' %
+                          filename)
+                    continue
+                elif result != 0:
+                    print('[ERROR] Failed to extract performance KPIs from '
+                          'file: %s' % filename)
+                    yield (1, None)
+                    continue
+
+                # Filter the files not in the manifest
+                if expression and filename in unresolved:
+                    try:
+                        if not self._match_filter([perf_kpi], expression)[0]:
+                            continue
+                    except NameError as err:
+                        # Such as "status" which is only in the manifest
+                        print('[WARNING] Cannot filter the files not in the '
+                              'manifest: %s' % err)
+                        expression = None
+                    except Exception as err:
+                        print('[ERROR] Error while filtering by the KPIs: %s' %
+                              err)
+                        yield (1, None)
+                        return
+
+                # Drop the duplicates
+                signature = self._get_case_signature(perf_kpi)
+                if signature in signatures:
+                    duplicates += 1
+                    continue
+                signatures.add(signature)
+                yield (0,
+                       dict(perf_kpi,
+                            run=self._get_run_id(filename,
+                                                 result_dirs[filename])))
+
+        finally:
+            if pool is not None:
+                pool.terminate()
+                pool.join()
+
+            # Update the cache with the files parsed
+            if cache is not None:
+                try:
+                    moved.update(parsed)
+                    self._update_cache(cache, list(moved),
+                                       list(moved.values()))
+                except Exception as err:
+                    print('[WARNING] Error while updating the cache: %s' %
+                          err)
+                finally:
+                    cache.close()
+
+        if duplicates:
+            print('[NOTE] Dropped %s duplicate tests.' % duplicates)
+
+    def _get_typed_records(self, records):
+        """Get a DataFrame of records with the numbers converted.
+
+        The parameters such as "iodepth" and "round" are strings in the fio
+        logs, they are converted to numbers so that the filters can compare
+        them as numbers, such as "iodepth >= 16".
 
-            if filename.endswith('.fiolog') and os.path.isfile(filename):
-                (result, raw_data) = self._get_raw_data_from_fio_log(filename)
-                if result == 0:
-                    self.raw_data_list.append(raw_data)
+        """
+        df = pd.DataFrame(records)
+        for column in df.columns[df.dtypes == object]:
+            numeric = pd.to_numeric(df[column], errors='coerce')
+            if numeric.notna().sum() == df[column].notna().sum():
+                df[column] = numeric
 
-            # Remove temporary files
-            os.system('[ -e {0} ] && rm -rf {0}'.format(tmpfolder))
+        return df
 
-        return 0
+    def _filter_fio_log_files(self, files, expression):
+        """Select the fio log files by the manifest.
+
+        The manifest "manifest.jsonl" is written by the runner in the result
+        path, each line is a JSON object of a test, with the parameters such
+        as "rw", "bs" and "round", and the log file name as "file". The
+        expression is evaluated against the manifest by DataFrame.query(),
+        such as "rw == 'randread' and bs == '4k' and status == 'PASS'". The
+        files are checked against the manifest in their own directory.
+
+        Args:
+            files: list, the fio log files.
+            expression: string, the filter expression.
+
+        Returns:
+            A tuple like (selected, unresolved):
+            selected: list, the files selected or not in the manifest;
+            unresolved: set, the files not in the manifest.
+
+        """
+        manifests = {}
+        for result_path in set([os.path.dirname(x) for x in files]):
+            manifest = result_path + os.sep + 'manifest.jsonl'
+            if not os.path.isfile(manifest):
+                continue
+
+            records = []
+            with open(manifest, 'r') as f:
+                for line in f:
+                    if line.strip():
+                        records.append(json.loads(line))
+            if not records:
+                continue
+
+            # The latest record wins if a test is recorded more than once
+            df = self._get_typed_records(records).drop_duplicates(
+                subset='file', keep='last')
+            manifests[result_path] = (set(df.query(expression)['file']),
+                                      set(df['file']))
+
+        selected = []
+        unresolved = set()
+        for filename in files:
+            (matched, known) = manifests.get(os.path.dirname(filename),
+                                             (set(), set()))
+            if os.path.basename(filename) not in known:
+                selected.append(filename)
+                unresolved.add(filename)
+            elif os.path.basename(filename) in matched:
+                selected.append(filename)
+
+        return (selected, unresolved)
+
+    def _match_filter(self, perf_kpis, expression):
+        """Evaluate the filter expression against the performance KPIs.
+
+        Args:
+            perf_kpis: list, the performance KPIs in Python dict format.
+            expression: string, the filter expression.
+
+        Returns:
+            A list of bool, whether each of the KPIs matches.
+
+        """
+        if not perf_kpis:
+            return []
+
+        keys = ['backend', 'driver', 'format', 'rw', 'bs', 'iodepth',
+                'numjobs', 'round', 'client']
+        records = [
+            dict([(x, y.get(x)) for x in keys if x in y]) for y in perf_kpis
+        ]
+        df = self._get_typed_records(records)
+        matched = set(df.query(expression).index)
+
+        return [x in matched for x in range(len(df))]
+
+    def _open_cache(self, cache_db, rebuild=False):
+        """Open the SQLite cache of the performance KPIs.
+
+        The cache has a table "perf_kpi" with a row for each file, the key
+        is the absolute path to the file and the size and mtime of the file
+        identify its content. The table is dropped if rebuilding or the cache
+        version is changed.
+
+        Args:
+            cache_db: string, the path to the SQLite database.
+            rebuild: bool, drop the cached performance KPIs.
+
+        Returns:
+            The sqlite3 connection.
+
+        """
+        cache = sqlite3.connect(cache_db)
+        version = cache.execute('PRAGMA user_version').fetchone()[0]
+        if rebuild or version != self.cache_version:
+            cache.execute('DROP TABLE IF EXISTS perf_kpi')
+            cache.execute('PRAGMA user_version = %d' % self.cache_version)
+        cache.execute('CREATE TABLE IF NOT EXISTS perf_kpi (name TEXT '
+                      'PRIMARY KEY, basename TEXT, size INTEGER, mtime '
+                      'INTEGER, result INTEGER, perf_kpi TEXT)')
+        cache.commit()
+        return cache
+
+    def _get_file_stat(self, filename):
+        """Get the (size, mtime) of a file to identify its content."""
+        stat = os.stat(filename)
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def _get_file_digest(self, filename):
+        """Get the SHA-1 digest of a file to identify its content."""
+        digest = hashlib.sha1()
+        with open(filename, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def _get_perf_kpis_from_cache(self, cache, files):
+        """Get the performance KPIs of the unchanged files from the cache.
+
+        A file is looked up by its absolute path, size and mtime first. If
+        it is missed, the rows of the files with the same name, size and
+        mtime are taken, so that the files moved or copied (with the mtime
+        preserved, such as by "mv", "cp -p" and "rsync -a") into other
+        directories are still taken from the cache. At last, the files with
+        the same name and size are compared by the digest of the content if
+        they still exist unchanged, such as the files copied by "cp". No file
+        is read unless it is missed.
+
+        Args:
+            cache: the sqlite3 connection.
+            files: list, the fio log files.
+
+        Returns:
+            A tuple like (results, moved):
+            results:
+                A dict like {filename: (result, perf_kpi)} for the cache hits.
+            moved:
+                A dict like results for the hits by another path, which
+                should be updated into the cache under their new paths.
+
+        """
+        rows = {}
+        stats = {}
+        sizes = {}
+        for (name, basename, size, mtime, result, perf_kpi) in cache.execute(
+                'SELECT name, basename, size, mtime, result, perf_kpi FROM '
+                'perf_kpi'):
+            rows[name] = (size, mtime, result, perf_kpi)
+            stats[(basename, size, mtime)] = (result, perf_kpi)
+            sizes.setdefault((basename, size), []).append(name)
+
+        results = {}
+        moved = {}
+        digests = {}
+        for filename in files:
+            name = os.path.abspath(filename)
+            stat = self._get_file_stat(filename)
+            row = rows.get(name)
+            key = (os.path.basename(filename), stat[0])
+            is_moved = not (row and row[:2] == stat)
+            if not is_moved:
+                hit = row[2:]
+            else:
+                hit = stats.get(key + (stat[1], ))
+                for other in sizes.get(key, []):
+                    if hit is not None:
+                        break
+                    try:
+                        if other == name or self._get_file_stat(
+                                other) != rows[other][:2]:
+                            continue
+                    except OSError:
+                        continue
+                    for x in (name, other):
+                        if x not in digests:
+                            digests[x] = self._get_file_digest(x)
+                    if digests[name] == digests[other]:
+                        hit = rows[other][2:]
+                if hit is None:
+                    continue
+
+            perf_kpi = json.loads(hit[1])
+            for bins in ('r-bins', 'w-bins'):
+                if perf_kpi and bins in perf_kpi:
+                    perf_kpi[bins] = np.array(perf_kpi[bins],
+                                              dtype=np.int64).reshape(2, -1)
+            results[filename] = (hit[0], perf_kpi)
+            if is_moved:
+                moved[filename] = results[filename]
+
+        return (results, moved)
+
+    def _update_cache(self, cache, parsed_files, parsed_results):
+        """Update the cache with the parsed files.
+
+        The rows of the files which no longer exist (such as being removed
+        or moved) are deleted from the cache as well, the rows of the other
+        result paths sharing the cache are kept.
+
+        Args:
+            cache: the sqlite3 connection.
+            parsed_files: list, the files parsed or moved in this run.
+            parsed_results: list, the (result, perf_kpi) of the files.
+
+        """
+        removed = [(x[0], ) for x in cache.execute('SELECT name FROM perf_kpi')
+                   if not os.path.isfile(x[0])]
+        cache.executemany('DELETE FROM perf_kpi WHERE name = ?', removed)
+
+        rows = []
+        for (filename, (result, perf_kpi)) in zip(parsed_files,
+                                                  parsed_results):
+            (size, mtime) = self._get_file_stat(filename)
+            rows.append((os.path.abspath(filename),
+                         os.path.basename(filename), size, mtime, result,
+                         json.dumps(perf_kpi, default=lambda x: x.tolist())))
+        cache.executemany(
+            'INSERT OR REPLACE INTO perf_kpi VALUES (?, ?, ?, ?, ?, ?)', rows)
+        cache.commit()
+
+    def _get_bucket_average(self, buckets):
+        """Get the weighted average of a fio bucket distribution.
+
+        The buckets look like {"1": 0.1, "2": 0.1, ..., ">=64": 0.0}, the
+        values are the percentages and each bucket is represented by the
+        number in its key.
+
+        Args:
+            buckets: dict, the fio bucket distribution.
+
+        Returns:
+            The weighted average, or 'NaN' if not available.
+
+        """
+        total = sum(buckets.values())
+        if total <= 0:
+            return 'NaN'
+
+        average = 0.0
+        for (key, value) in buckets.items():
+            average += float(key.lstrip('>=')) * value
+        return average / total
+
+    def _get_latency_bins(self, clat):
+        """Get the latency histogram from the json+ bins.
+
+        Args:
+            clat: dict, the "clat_ns" of read or write from a fio job.
+
+        Returns:
+            A NumPy array in shape (2, N), the first row is the latency (ns)
+            of the buckets in ascending order and the second row is the
+            number of I/O in the buckets. N is 0 if no bins (not json+).
+
+        """
+        bins = clat.get('bins', {})
+        hist = np.array([(int(x), int(y)) for (x, y) in bins.items()],
+                        dtype=np.int64).reshape(-1, 2)
+        return hist[hist[:, 0].argsort()].T
+
+    def _get_percentiles_from_bins(self, bins, percentiles):
+        """Get the percentiles from the latency histogram.
+
+        The same as fio, the percentile is the latency of the first bucket
+        where the cumulative number of I/O reaches the percentage of all.
+
+        Args:
+            bins: NumPy array, the latency histogram in shape (2, N).
+            percentiles: list, the percentiles, such as ['50', '99.9'].
+
+        Returns:
+            A NumPy array of the latency (ns), NaN if no I/O in the bins.
+
+        """
+        cumsum = np.cumsum(bins[1])
+        if not len(cumsum) or cumsum[-1] == 0:
+            return np.full(len(percentiles), np.nan)
+
+        thresholds = np.array(percentiles, dtype=float) / 100.0 * cumsum[-1]
+        index = np.searchsorted(cumsum, thresholds, side='left')
+        return bins[0][np.minimum(index, len(cumsum) - 1)].astype(float)
+
+    def _get_latency_kpis(self, job):
+        """Get the completion latency percentiles and bins from a fio job.
+
+        The percentiles are taken from the "percentile" map of fio, or the
+        bins if fio was not configured to report them.
+
+        Args:
+            job: dict, the job in raw data.
+
+        Returns:
+            A dict of "r-clat<p>" / "w-clat<p>" in ms for each percentile in
+            self.percentiles, and "r-bins" / "w-bins" the latency histograms.
+
+        """
+        perf_kpi = {}
+        for (prefix, rw) in (('r', 'read'), ('w', 'write')):
+            clat = job[rw]['clat_ns']
+            bins = self._get_latency_bins(clat)
+            perf_kpi[prefix + '-bins'] = bins
+
+            values = self._get_percentiles_from_bins(bins, self.percentiles)
+            for (i, percentile) in enumerate(self.percentiles):
+                key = '%f' % float(percentile)
+                if key in clat.get('percentile', {}):
+                    values[i] = clat['percentile'][key]
+                # The unit of "clat" was "ns", convert to "ms"
+                perf_kpi[prefix + '-clat' + percentile] = \
+                    values[i] / 1000000.0
+
+        return perf_kpi
+
+    def _parse_interval_log(self, content):
+        """Parse a fio log of intervals into a NumPy array.
+
+        Each line of the log is "time (ms), value, data direction, block
+        size, ...", the number of columns depends on the fio version. Only
+        the first three columns are kept.
+
+        Args:
+            content: bytes, the content of the log.
+
+        Returns:
+            A NumPy array in shape (N, 3).
+
+        """
+        # Drop the last line if it is still being written
+        content = content[:content.rfind(b'\n') + 1]
+        if not content.strip():
+            return np.zeros((0, 3))
+
+        return np.loadtxt(io.BytesIO(content),
+                          delimiter=',',
+                          usecols=(0, 1, 2),
+                          ndmin=2)
+
+    def _get_interval_series(self, intervals):
+        """Aggregate the fio logs of intervals across jobs.
+
+        Each job logs a sample per interval for each data direction, but
+        the timestamps jitter around the interval boundaries. So the samples
+        are aligned by their index instead of their time, and cut to the
+        shortest log. For each interval, the bw/iops of all the jobs and
+        directions are summed up, and the latencies are averaged.
+
+        Args:
+            intervals: dict, the logs like {type: [content of each job]}.
+
+        Returns:
+            A dict like {type: array}, the array is in shape (2, N) for the
+            time (s) of the intervals (averaged across the jobs) and the
+            aggregated values.
+
+        """
+        series = {}
+        for (log_type, contents) in intervals.items():
+            # Split the samples of each job by the data direction
+            logs = []
+            for array in [self._parse_interval_log(x) for x in contents]:
+                for direction in np.unique(array[:, 2]):
+                    logs.append(array[array[:, 2] == direction, :2])
+            if not logs:
+                continue
+
+            # Align the samples by their index
+            length = min([len(x) for x in logs])
+            samples = np.stack([x[:length] for x in logs])
+            time = samples[:, :, 0].mean(axis=0) / 1000.0
+            if log_type in ('bw', 'iops'):
+                values = samples[:, :, 1].sum(axis=0)
+            else:
+                values = samples[:, :, 1].mean(axis=0)
+
+            series[log_type] = np.vstack((time, values))
+
+        return series
+
+    def _get_stability_kpis(self, raw_data):
+        """Get the stability KPIs from the fio logs of intervals.
+
+        The KPIs show the stability of the performance over time, such as
+        periodic throttling which is invisible in the averages:
+        1. iops_cov: the coefficient of variation of IOPS, in %;
+        2. iops_min1s: the lowest IOPS of 1-second windows, in % of mean;
+        3. iops_trend: the slope of IOPS by linear regression, in % of mean
+           per minute;
+        4. iops_dips: the % of intervals where IOPS below 90% of mean;
+        5. lat_cov / lat_trend: the same as IOPS for the latency.
+
+        Args:
+            raw_data: dict, the raw data with "intervals".
+
+        Returns:
+            A dict of the stability KPIs, 'NaN' if the logs are not available.
+
+        """
+        perf_kpi = dict([(x, 'NaN') for x in ('iops_cov', 'iops_min1s',
+                                              'iops_trend', 'iops_dips',
+                                              'lat_cov', 'lat_trend')])
+
+        intervals = raw_data.get('intervals')
+        if not intervals:
+            return perf_kpi
+
+        interval_msec = int(raw_data['jobs'][0]['job options'].get(
+            'log_avg_msec', 500))
+        series = self._get_interval_series(intervals)
+
+        for log_type in ('iops', 'lat'):
+            if log_type not in series:
+                continue
+            (time, values) = series[log_type]
+            mean = values.mean()
+            if len(values) < 2 or mean == 0:
+                continue
+
+            perf_kpi[log_type + '_cov'] = values.std(ddof=1) / mean * 100
+            perf_kpi[log_type + '_trend'] = np.polyfit(
+                time / 60.0, values, 1)[0] / mean * 100
+
+            if log_type == 'iops':
+                window = max(1, int(round(1000.0 / interval_msec)))
+                if len(values) >= window:
+                    perf_kpi['iops_min1s'] = np.convolve(
+                        values,
+                        np.ones(window) / window, 'valid').min() / mean * 100
+                perf_kpi['iops_dips'] = np.mean(values < 0.9 * mean) * 100
+
+        return perf_kpi
+
+    def _parse_sar_cpu(self, content):
+        """Parse the "sar -u" outputs.
+
+        Args:
+            content: string, the content of the SAR CPU log.
+
+        Returns:
+            A tuple like (cpus, time, stats):
+            cpus: int, the number of CPUs from the headline, or None;
+            time: NumPy array, the seconds of the samples since the first;
+            stats: dict like {'%user': NumPy array} of the "all" CPU samples.
+
+        """
+        lines = content.splitlines()
+        match = re.search(r'\((\d+) CPU\)', content)
+        cpus = int(match.group(1)) if match else None
+
+        header = None
+        rows = []
+        for line in lines:
+            fields = line.split()
+            if not fields or fields[0].startswith('Average'):
+                continue
+            if '%user' in fields:
+                header = fields
+            elif header and len(fields) == len(header) and \
+                    fields[header.index('CPU')] == 'all':
+                rows.append(fields)
+
+        if not rows:
+            return (cpus, np.zeros(0), {})
+
+        # Get the time of day, the format is "HH:MM:SS [AM|PM]"
+        seconds = []
+        for fields in rows:
+            (h, m, sec) = [int(x) for x in fields[0].split(':')]
+            if len(fields) > 1 and fields[1] in ('AM', 'PM'):
+                h = h % 12 + (12 if fields[1] == 'PM' else 0)
+            seconds.append(h * 3600 + m * 60 + sec)
+        time = (np.array(seconds) - seconds[0]) % 86400
+
+        stats = {}
+        for (index, name) in enumerate(header):
+            if name.startswith('%'):
+                stats[name] = np.array([float(x[index]) for x in rows])
+
+        return (cpus, time, stats)
+
+    def _get_fio_time(self, value):
+        """Get the seconds of a fio time value, such as "30", "500ms" or "1m".
+
+        The value without a suffix is in seconds, as the fio options such as
+        "ramp_time" and "runtime".
+
+        Raises:
+            1. ValueError if the value is not a fio time value
+
+        """
+        units = {'': 1, 'us': 1e-6, 'usec': 1e-6, 'ms': 1e-3, 'msec': 1e-3,
+                 's': 1, 'sec': 1, 'm': 60, 'min': 60, 'h': 3600, 'd': 86400}
+        match = re.match(r'^\s*([0-9]+(?:\.[0-9]*)?)\s*([a-z]*)\s*$',
+                         str(value).lower())
+        if not match or match.group(2) not in units:
+            raise ValueError('Invalid fio time value "%s".' % value)
+
+        return float(match.group(1)) * units[match.group(2)]
+
+    def _get_cpu_kpis(self, raw_data, iops):
+        """Get the CPU efficiency KPIs from the SAR CPU log.
+
+        The SAR starts with the fio, so the samples during the measurement
+        window (after "ramp_time" and within the runtime) are averaged:
+        1. cpu_user, cpu_system, cpu_iowait, cpu_steal: the CPU usage in %;
+        2. iops_per_cpu: IOPS per 1% of busy CPU (%user + %nice + %system);
+        3. cycles_per_io: CPU cycles per I/O, by the number of CPUs and the
+           frequency from the CPU info.
+
+        Args:
+            raw_data: dict, the raw data with "sar".
+            iops: int, the IOPS of the test.
+
+        Returns:
+            A dict of the CPU KPIs, 'NaN' if the SAR logs are not available.
+
+        """
+        perf_kpi = dict([(x, 'NaN')
+                         for x in ('cpu_user', 'cpu_system', 'cpu_iowait',
+                                   'cpu_steal', 'iops_per_cpu',
+                                   'cycles_per_io')])
+
+        sar = raw_data.get('sar') or {}
+        if not sar.get('cpu'):
+            return perf_kpi
+
+        (cpus, time, stats) = self._parse_sar_cpu(sar['cpu'])
+        if not len(time):
+            return perf_kpi
+
+        # Get the measurement window
+        job = raw_data['jobs'][0]
+        runtime = job.get(
+            'job_runtime', max(job['read']['runtime'],
+                               job['write']['runtime'])) / 1000.0
+        try:
+            ramp_time = self._get_fio_time(job['job options'].get(
+                'ramp_time', '0'))
+            window = (time > ramp_time) & (time <= ramp_time + runtime)
+        except ValueError as err:
+            print('[WARNING] %s Use the whole SAR log for the CPU KPIs.' %
+                  err)
+            window = np.zeros(len(time), dtype=bool)
+        if not window.any():
+            window = np.ones(len(time), dtype=bool)
+
+        usage = dict([(x, y[window].mean()) for (x, y) in stats.items()])
+        perf_kpi['cpu_user'] = usage.get('%user', 'NaN')
+        perf_kpi['cpu_system'] = usage.get('%system', 'NaN')
+        perf_kpi['cpu_iowait'] = usage.get('%iowait', 'NaN')
+        perf_kpi['cpu_steal'] = usage.get('%steal', 'NaN')
+
+        if '%user' not in usage or '%system' not in usage:
+            return perf_kpi
+
+        busy = usage['%user'] + usage['%system'] + usage.get('%nice', 0)
+        if busy > 0 and iops > 0:
+            perf_kpi['iops_per_cpu'] = iops / busy
+
+            # Get the number of CPUs and the frequency (MHz)
+            cpuinfo = sar.get('cpuinfo') or ''
+            mhz = [
+                float(x) for x in re.findall(r'^cpu MHz\s*:\s*([\d.]+)',
+                                             cpuinfo, re.M)
+            ]
+            cpus = len(mhz) or cpus
+            if mhz and cpus:
+                perf_kpi['cycles_per_io'] = busy / 100.0 * cpus * np.mean(
+                    mhz) * 1000000.0 / iops
+
+        return perf_kpi
+
+    def _get_host_kpis(self, raw_data):
+        """Get the host name and the kernel release of the test.
+
+        They are taken from the headline of the SAR CPU log, which is like
+        "Linux 4.18.0-240.el8.x86_64 (vm1)  10/18/2026  _x86_64_  (4 CPU)".
+        The host name falls back to the one in the fio outputs (client and
+        server mode).
+
+        Args:
+            raw_data: dict, the raw data with the SAR logs in raw_data['sar'].
+
+        Returns:
+            A dict with the "host" and "release", "NaN" if not available.
+
+        """
+        perf_kpi = {
+            'host': raw_data['jobs'][0].get('hostname', 'NaN'),
+            'release': 'NaN'
+        }
+
+        content = (raw_data.get('sar') or {}).get('cpu') or ''
+        match = re.search(r'^\S+\s+(\S+)\s+\(([^)\s]+)\)', content, re.M)
+        if match:
+            perf_kpi['release'] = match.group(1)
+            perf_kpi['host'] = match.group(2)
+
+        return perf_kpi
+
+    def _get_efficiency_kpis(self, job):
+        """Get the achieved queue depth and submission efficiency KPIs.
+
+        This function gets the following KPIs from a fio job:
+        1. qdepth: the average I/O in flight per job, by Little's law
+           (IOPS * mean latency / numjobs);
+        2. qdepth_target: the % of time the queue depth stays in the bucket
+           of the target iodepth, from "iodepth_level";
+        3. submit_batch / complete_batch: the average number of I/O per
+           submit / complete call, from "iodepth_submit" and
+           "iodepth_complete";
+        4. cpu_per_io: the CPU time (usr + sys) in us spent on each I/O;
+        5. ctx_per_io: the context switches per I/O.
+
+        Args:
+            job: dict, the job in the fio raw data.
+
+        Returns:
+            The KPIs in Python dict format.
+
+        """
+        perf_kpi = {}
+
+        iodepth = int(job['job options']['iodepth'])
+        numjobs = int(job['job options'].get('numjobs', 1))
+        iops = job['read']['iops'] + job['write']['iops']
+        total_ios = job['read']['total_ios'] + job['write']['total_ios']
+
+        # The unit of "lat" was "ns", I/O in flight = IOPS * LAT(s)
+        if iops > 0:
+            lat = (job['read']['iops'] * job['read']['lat_ns']['mean'] +
+                   job['write']['iops'] *
+                   job['write']['lat_ns']['mean']) / iops
+            perf_kpi['qdepth'] = iops * lat / 1000000000.0 / numjobs
+        else:
+            perf_kpi['qdepth'] = 'NaN'
+
+        # The % of time in the bucket of the target iodepth
+        if 'iodepth_level' in job:
+            levels = job['iodepth_level']
+            if iodepth >= 64:
+                bucket = '>=64'
+            else:
+                bucket = str(
+                    max([
+                        int(x) for x in levels.keys()
+                        if not x.startswith('>=') and int(x) <= iodepth
+                    ]))
+            perf_kpi['qdepth_target'] = levels.get(bucket, 'NaN')
+        else:
+            perf_kpi['qdepth_target'] = 'NaN'
+
+        # The I/O per submit and complete calls
+        perf_kpi['submit_batch'] = self._get_bucket_average(
+            job['iodepth_submit']) if 'iodepth_submit' in job else 'NaN'
+        perf_kpi['complete_batch'] = self._get_bucket_average(
+            job['iodepth_complete']) if 'iodepth_complete' in job else 'NaN'
+
+        # The "usr_cpu" and "sys_cpu" were % of a CPU for each job
+        if iops > 0 and 'usr_cpu' in job and 'sys_cpu' in job:
+            perf_kpi['cpu_per_io'] = (job['usr_cpu'] + job['sys_cpu']
+                                      ) / 100.0 * numjobs * 1000000.0 / iops
+        else:
+            perf_kpi['cpu_per_io'] = 'NaN'
+
+        if total_ios > 0 and 'ctx' in job:
+            perf_kpi['ctx_per_io'] = float(job['ctx']) / total_ios
+        else:
+            perf_kpi['ctx_per_io'] = 'NaN'
+
+        return perf_kpi
+
+    def _parse_diskstats(self, content):
+        """Parse the content of "/proc/diskstats".
+
+        Returns:
+            A dict like {device name: [field 1, field 2, ...]}, the fields
+            are the counters after the device name.
+
+        """
+        diskstats = {}
+        for line in content.splitlines():
+            fields = line.split()
+            if len(fields) >= 14:
+                diskstats[fields[2]] = [int(x) for x in fields[3:]]
+
+        return diskstats
+
+    def _parse_diskstats_log(self, content):
+        """Parse the samples of "/proc/diskstats".
+
+        Each sample starts with a line "timestamp_ms <milliseconds since the
+        epoch>", followed by the content of "/proc/diskstats".
+
+        Returns:
+            A list of tuples like (timestamp_ms, diskstats), the diskstats
+            are parsed by _parse_diskstats().
+
+        """
+        samples = []
+        for sample in content.split('timestamp_ms ')[1:]:
+            (timestamp, _, stats) = sample.partition('\n')
+            if timestamp.strip().isdigit():
+                samples.append((int(timestamp), self._parse_diskstats(stats)))
+
+        return samples
+
+    def _get_stack_kpis(self, raw_data):
+        """Get the latency components of the guest I/O stack.
+
+        This function decomposes the fio latency into the following KPIs
+        (in ms, weighted by the read and write IOPS):
+        1. submit_lat: the submission latency (fio "slat_ns");
+        2. dev_lat: the device latency, the time of each request spent in
+           the devices, which is the read and write ticks divided by the
+           completed I/O from the samples of "/proc/diskstats";
+        3. block_lat: the block layer latency, the rest part of the
+           completion latency (fio "clat_ns" - dev_lat);
+        4. dev_queue: the average queue size of the devices while they are
+           busy, which is the time in queue divided by the I/O ticks.
+
+        The devices are the lowest ones in "disk_util" of the fio raw data.
+        The first and last samples in the measurement window (fio reports at
+        the end of it, and the ramp time is not measured) are compared.
+
+        Args:
+            raw_data: dict, the specified raw data.
+
+        Returns:
+            The KPIs in Python dict format.
+
+        """
+        perf_kpi = {
+            'submit_lat': 'NaN',
+            'block_lat': 'NaN',
+            'dev_lat': 'NaN',
+            'dev_queue': 'NaN'
+        }
+
+        job = raw_data['jobs'][0]
+        iops = job['read']['iops'] + job['write']['iops']
+        if iops <= 0:
+            return perf_kpi
+
+        # The unit of "slat" and "clat" was "ns", convert to "ms"
+        perf_kpi['submit_lat'] = (
+            job['read']['iops'] * job['read']['slat_ns']['mean'] +
+            job['write']['iops'] * job['write']['slat_ns']['mean']
+        ) / iops / 1000000.0
+        clat = (job['read']['iops'] * job['read']['clat_ns']['mean'] +
+                job['write']['iops'] *
+                job['write']['clat_ns']['mean']) / iops / 1000000.0
+
+        # Get the device statistics
+        diskstats = raw_data.get('diskstats')
+        if not diskstats or 'disk_util' not in raw_data:
+            return perf_kpi
+
+        # Get the samples in the measurement window
+        end = raw_data.get('timestamp_ms')
+        if end is None:
+            return perf_kpi
+        runtime = max(job['read']['runtime'], job['write']['runtime'])
+        samples = [
+            x[1] for x in self._parse_diskstats_log(diskstats)
+            if end - runtime <= x[0] <= end
+        ]
+        if len(samples) < 2:
+            return perf_kpi
+
+        (before, after) = (samples[0], samples[-1])
+        devices = [
+            x['name'] for x in raw_data['disk_util'] if 'aggr_util' not in x
+        ]
+
+        ios = ticks = io_ticks = time_in_queue = 0
+        for device in devices:
+            if device not in before or device not in after:
+                continue
+            delta = [y - x for (x, y) in zip(before[device], after[device])]
+            ios += delta[0] + delta[4]
+            ticks += delta[3] + delta[7]
+            io_ticks += delta[9]
+            time_in_queue += delta[10]
+
+        if ios > 0:
+            perf_kpi['dev_lat'] = float(ticks) / ios
+            perf_kpi['block_lat'] = clat - perf_kpi['dev_lat']
+        if io_ticks > 0:
+            perf_kpi['dev_queue'] = float(time_in_queue) / io_ticks
+
+        return perf_kpi
 
     def _get_kpis_from_raw_data(self, raw_data):
         """Get KPIs from a specified raw data.
@@ -277,6 +1605,24 @@ class FioTestReporter():
                 perf_kpi['w-clat90'] = 0.0
             perf_kpi['clat90'] = perf_kpi['r-clat90'] + perf_kpi['w-clat90']
 
+            # Get the completion latency percentiles and histograms
+            perf_kpi.update(self._get_latency_kpis(raw_data['jobs'][0]))
+
+            # Get the achieved queue depth and submission efficiency
+            perf_kpi.update(self._get_efficiency_kpis(raw_data['jobs'][0]))
+
+            # Decompose the latency by the disk statistics
+            perf_kpi.update(self._get_stack_kpis(raw_data))
+
+            # Get the stability by the fio logs of intervals
+            perf_kpi.update(self._get_stability_kpis(raw_data))
+
+            # Get the CPU efficiency by the SAR logs
+            perf_kpi.update(self._get_cpu_kpis(raw_data, perf_kpi['iops']))
+
+            # Identify the host and the kernel release
+            perf_kpi.update(self._get_host_kpis(raw_data))
+
             # Get util% of the disk if there is
             if 'disk_util' in raw_data:
                 if len(raw_data['disk_util']) == 1:
@@ -308,6 +1654,8 @@ class FioTestReporter():
                 perf_kpi['round'] = 'NaN'
             if 'backend' not in perf_kpi:
                 perf_kpi['backend'] = 'NaN'
+            if 'client' not in perf_kpi:
+                perf_kpi['client'] = 'NaN'
 
         except Exception as err:
             print('[ERROR] Error while extracting performance KPIs: %s' % err)
@@ -315,37 +1663,6 @@ class FioTestReporter():
 
         return (0, perf_kpi)
 
-    def calculate_performance_kpis(self, params={}):
-        """Calculate performance KPIs.
-
-        This function calculates performance KPIs from self.raw_data_list and
-        stores the performance KPI tuples into self.perf_kpi_list.
-
-        As data source, the following attributes should be ready to use:
-        1. self.raw_data_list: the list of raw data (Python dict format)
-
-        Args:
-            params: dict
-                None
-
-        Returns:
-            0: Passed
-            1: Failed
-
-        Updates:
-            self.perf_kpi_list: store the performance KPI tuples.
-
-        """
-        # Calculate performance KPIs
-        for raw_data in self.raw_data_list:
-            (result, perf_kpi) = self._get_kpis_from_raw_data(raw_data)
-            if result == 0:
-                self.perf_kpi_list.append(perf_kpi)
-            else:
-                return 1
-
-        return 0
-
     def _create_report_dataframe(self):
         """Create report DataFrame.
 
@@ -364,7 +1681,22 @@ class FioTestReporter():
                                       columns=[
                                           'backend', 'driver', 'format', 'rw',
                                           'bs', 'iodepth', 'numjobs', 'round',
-                                          'bw', 'iops', 'lat', 'clat90', 'util'
+                                          'bw', 'iops', 'lat', 'clat90',
+                                          'r-clat50', 'r-clat95', 'r-clat99',
+                                          'r-clat99.9', 'r-clat99.99',
+                                          'w-clat50', 'w-clat95', 'w-clat99',
+                                          'w-clat99.9', 'w-clat99.99', 'util',
+                                          'qdepth', 'qdepth_target',
+                                          'submit_batch', 'complete_batch',
+                                          'cpu_per_io', 'ctx_per_io',
+                                          'submit_lat', 'block_lat', 'dev_lat',
+                                          'dev_queue', 'iops_cov',
+                                          'iops_min1s', 'iops_trend',
+                                          'iops_dips', 'lat_cov', 'lat_trend',
+                                          'cpu_user', 'cpu_system',
+                                          'cpu_iowait', 'cpu_steal',
+                                          'iops_per_cpu', 'cycles_per_io',
+                                          'run', 'client', 'host', 'release'
                                       ])
 
         # Rename the columns of the report DataFrame
@@ -381,7 +1713,43 @@ class FioTestReporter():
             'iops': 'IOPS',
             'lat': 'LAT(ms)',
             'clat90': 'CLAT90(ms)',
-            'util': 'Util(%)'
+            'r-clat50': 'R-CLAT50(ms)',
+            'r-clat95': 'R-CLAT95(ms)',
+            'r-clat99': 'R-CLAT99(ms)',
+            'r-clat99.9': 'R-CLAT99.9(ms)',
+            'r-clat99.99': 'R-CLAT99.99(ms)',
+            'w-clat50': 'W-CLAT50(ms)',
+            'w-clat95': 'W-CLAT95(ms)',
+            'w-clat99': 'W-CLAT99(ms)',
+            'w-clat99.9': 'W-CLAT99.9(ms)',
+            'w-clat99.99': 'W-CLAT99.99(ms)',
+            'util': 'Util(%)',
+            'qdepth': 'QDepth',
+            'qdepth_target': 'QDepthTarget(%)',
+            'submit_batch': 'SubmitBatch',
+            'complete_batch': 'CompleteBatch',
+            'cpu_per_io': 'CPUPerIO(us)',
+            'ctx_per_io': 'CtxPerIO',
+            'submit_lat': 'SubmitLAT(ms)',
+            'block_lat': 'BlockLAT(ms)',
+            'dev_lat': 'DevLAT(ms)',
+            'dev_queue': 'DevQueue',
+            'iops_cov': 'IOPSCoV(%)',
+            'iops_min1s': 'IOPSMin1s(%)',
+            'iops_trend': 'IOPSTrend(%/min)',
+            'iops_dips': 'IOPSDips(%)',
+            'lat_cov': 'LATCoV(%)',
+            'lat_trend': 'LATTrend(%/min)',
+            'cpu_user': 'CPUUser(%)',
+            'cpu_system': 'CPUSystem(%)',
+            'cpu_iowait': 'CPUIOWait(%)',
+            'cpu_steal': 'CPUSteal(%)',
+            'iops_per_cpu': 'IOPSPerCPU',
+            'cycles_per_io': 'CyclesPerIO',
+            'run': 'Run',
+            'client': 'Client',
+            'host': 'Host',
+            'release': 'Release'
         },
                               inplace=True)
 
@@ -402,12 +1770,16 @@ class FioTestReporter():
         # Sort the report DataFrame and reset its index
         self.df_report = self.df_report.sort_values(by=[
             'Backend', 'Driver', 'Format', 'RW', 'BS', 'IODepth', 'Numjobs',
-            'Round'
+            'Round', 'Run', 'Client'
         ])
         self.df_report = self.df_report.reset_index().drop(columns=['index'])
 
-        # Format the KPI values
+        # Format the KPI values, including the ones in the columns with
+        # 'NaN' strings
         self.df_report = self.df_report.round(4)
+        for column in self.df_report.columns[self.df_report.dtypes == object]:
+            self.df_report[column] = self.df_report[column].map(
+                lambda x: round(x, 4) if isinstance(x, float) else x)
 
         return None
 
@@ -432,6 +1804,173 @@ class FioTestReporter():
 
         return None
 
+    def _get_saturation_of_group(self, df_group):
+        """Analyse the saturation of a group of tests against queue depth.
+
+        This function goes through the tests of the same group ordered by
+        the outstanding I/O (IODepth * Numjobs), finds the saturation knee
+        and the maximum useful queue depth, and estimates the service time
+        by Little's law (outstanding = IOPS * latency).
+
+        The knee is the point with the highest "power" (IOPS / latency),
+        where the device is saturated while the queueing delay is still low.
+        The maximum useful queue depth is the lowest one that reaches
+        (100 - MIN_IOPS_GAIN)% of the maximum IOPS. Beyond the knee, the
+        latency grows by one service time per outstanding I/O, so the service
+        time is the slope of a linear fit of latency against outstanding I/O.
+
+        Args:
+            df_group: DataFrame, the tests of the same group, averaged by
+                      IODepth.
+
+        Returns:
+            The DataFrame with the saturation columns filled.
+
+        """
+        MIN_IOPS_GAIN = 5
+
+        df = df_group.sort_values(by='Outstanding').reset_index(drop=True)
+        outstanding = df['Outstanding'].values.astype(float)
+        iops = df['IOPS'].values.astype(float)
+        lat = df['LAT(ms)'].values.astype(float)
+
+        # Little's law, the I/O in flight actually achieved
+        df['Concurrency'] = iops * lat / 1000.0
+
+        # The gains of IOPS and latency against the previous queue depth
+        df['IOPS-GAIN(%)'] = df['IOPS'].pct_change() * 100
+        df['LAT-GAIN(%)'] = df['LAT(ms)'].pct_change() * 100
+
+        # The knee and the maximum useful queue depth
+        with np.errstate(divide='ignore', invalid='ignore'):
+            power = np.where(lat > 0, iops / lat, np.nan)
+        if np.isnan(power).all() or iops.max() <= 0:
+            df['KneeDepth'] = df['MaxUsefulDepth'] = df['SvcTime(us)'] = np.nan
+            df['Verdict'] = 'Data Invalid'
+            return df
+
+        knee = int(np.nanargmax(power))
+        useful = int(np.argmax(iops >= iops.max() *
+                               (100 - MIN_IOPS_GAIN) / 100.0))
+        df['KneeDepth'] = df['IODepth'][knee]
+        df['MaxUsefulDepth'] = df['IODepth'][useful]
+
+        # The service time (in us) by fitting latency after the knee
+        if len(df) - knee >= 2:
+            slope = np.polyfit(outstanding[knee:], lat[knee:], 1)[0]
+        else:
+            slope = 1000.0 / iops.max()
+        df['SvcTime(us)'] = slope * 1000.0
+
+        # Flag the queue depths which only add latency
+        verdicts = []
+        for num in range(len(df)):
+            if num == knee:
+                verdicts.append('Knee')
+            elif num > 0 and df['IOPS-GAIN(%)'][num] < MIN_IOPS_GAIN and df[
+                    'LAT-GAIN(%)'][num] > 0:
+                verdicts.append('Latency Only')
+            else:
+                verdicts.append('Scaling')
+        df['Verdict'] = verdicts
+
+        return df
+
+    def generate_saturation_dataframe(self):
+        """Generate the queue depth saturation analysis DataFrame.
+
+        This function averages the tests of all rounds, groups them by
+        Backend / Driver / Format / RW / BS / Numjobs, and analyses how IOPS
+        and latency change against the outstanding I/O in each group.
+
+        For mixed workloads, the latency is the mean latency weighted by the
+        read and write IOPS, so that Little's law holds.
+
+        As data source, the following attributes should be ready to use:
+        1. self.perf_kpi_list: the list of performance KPIs.
+
+        Updates:
+            self.df_saturation: the saturation analysis DataFrame.
+
+        """
+        keys = ['Backend', 'Driver', 'Format', 'RW', 'BS', 'Numjobs']
+
+        # No tests to analyse, keep the columns for the readers
+        if not self.perf_kpi_list:
+            self.df_saturation = pd.DataFrame(columns=keys + [
+                'IODepth', 'Outstanding', 'IOPS', 'LAT(ms)', 'Concurrency',
+                'IOPS-GAIN(%)', 'LAT-GAIN(%)', 'KneeDepth', 'MaxUsefulDepth',
+                'SvcTime(us)', 'Verdict'
+            ])
+            return None
+
+        df = pd.DataFrame(self.perf_kpi_list)
+        df = pd.DataFrame({
+            'Backend': df['backend'],
+            'Driver': df['driver'],
+            'Format': df['format'],
+            'RW': df['rw'],
+            'BS': df['bs'],
+            'Numjobs': pd.to_numeric(df['numjobs']),
+            'IODepth': pd.to_numeric(df['iodepth']),
+            'IOPS': df['iops'],
+            'LAT(ms)': (df['r-iops'] * df['r-lat'] + df['w-iops'] *
+                        df['w-lat']) / df['iops'].where(df['iops'] > 0)
+        })
+
+        # Average the rounds and get the outstanding I/O
+        df = df.groupby(keys + ['IODepth'], as_index=False).mean()
+        df.insert(len(keys) + 1, 'Outstanding', df['IODepth'] * df['Numjobs'])
+
+        # Analyse each group
+        self.df_saturation = pd.concat([
+            self._get_saturation_of_group(df_group)
+            for (name, df_group) in df.groupby(keys)
+        ])
+
+        self.df_saturation = self.df_saturation.sort_values(by=keys +
+                                                            ['Outstanding'])
+        self.df_saturation = self.df_saturation.reset_index(drop=True)
+        self.df_saturation = self.df_saturation.round(4)
+
+        return None
+
+    def saturation_dataframe_to_csv(self, params={}):
+        """Dump the saturation analysis DataFrame to a csv file.
+
+        As data source, the self.df_saturation should be ready to use.
+
+        Args:
+            params: dict
+                saturation_csv: string, the csv file to dump the saturation
+                                analysis DataFrame to.
+
+        Returns:
+            0: Passed
+            1: Failed
+
+        Raises:
+            1. Error while dumping to file
+
+        """
+        # Parse required params
+        if 'saturation_csv' not in params:
+            print('[ERROR] Missing required params: params[saturation_csv]')
+            return 1
+
+        # Write the analysis to the csv file
+        try:
+            print('[NOTE] Dumping saturation analysis into file "%s"...' %
+                  params['saturation_csv'])
+            write_dataframe(self.df_saturation, params['saturation_csv'])
+            print('[NOTE] Finished!')
+
+        except Exception as err:
+            print('[ERROR] Error while dumping to file: %s' % err)
+            return 1
+
+        return 0
+
     def report_dataframe_to_csv(self, params={}):
         """Dump the report DataFrame to a csv file.
 
@@ -446,7 +1985,7 @@ class FioTestReporter():
             1: Failed
 
         Raises:
-            1. Error while dumping to csv file
+            1. Error while dumping to file
 
         """
         # Parse required params
@@ -456,35 +1995,186 @@ class FioTestReporter():
 
         # Write the report to the csv file
         try:
-            print('[NOTE] Dumping data into csv file "%s"...' %
+            print('[NOTE] Dumping data into file "%s"...' %
                   params['report_csv'])
-            content = self.df_report.to_csv()
-            with open(params['report_csv'], 'w') as f:
-                f.write(content)
+            write_dataframe(self.df_report, params['report_csv'])
             print('[NOTE] Finished!')
 
         except Exception as err:
-            print('[ERROR] Error while dumping to csv file: %s' % err)
+            print('[ERROR] Error while dumping to file: %s' % err)
             return 1
 
         return 0
 
+    def bins_to_npz(self, params={}):
+        """Save the latency histograms to a npz file.
+
+        The histograms of all the tests are saved in compact NumPy arrays,
+        so that any percentile can be calculated later. The arrays are:
+        1. "keys": the key KPIs (self.key_kpis) of the tests, in strings;
+        2. "r-offsets" / "w-offsets": the offsets of each test in the bins,
+           the bins of test i are in [offsets[i], offsets[i + 1]);
+        3. "r-lat_ns" / "w-lat_ns": the latency (ns) of the buckets;
+        4. "r-count" / "w-count": the number of I/O in the buckets.
+
+        As data source, the self.perf_kpi_list should be ready to use.
+
+        Args:
+            params: dict
+                bins_npz: string, the npz file to save the histograms to.
 
-def generate_fio_test_report(result_path, report_csv):
+        Returns:
+            0: Passed
+            1: Failed
+
+        Raises:
+            1. Error while saving to npz file
+
+        """
+        # Parse required params
+        if 'bins_npz' not in params:
+            print('[ERROR] Missing required params: params[bins_npz]')
+            return 1
+
+        # Save the histograms to the npz file
+        try:
+            print('[NOTE] Saving latency bins into npz file "%s"...' %
+                  params['bins_npz'])
+            arrays = {
+                'keys':
+                np.array([[str(x[k]) for k in self.key_kpis]
+                          for x in self.perf_kpi_list],
+                         dtype=str).reshape(-1, len(self.key_kpis))
+            }
+            for prefix in ('r', 'w'):
+                bins = [x[prefix + '-bins'] for x in self.perf_kpi_list]
+                arrays[prefix + '-offsets'] = np.cumsum(
+                    [0] + [x.shape[1] for x in bins], dtype=np.int64)
+                bins = np.hstack(bins + [np.zeros((2, 0), dtype=np.int64)])
+                arrays[prefix + '-lat_ns'] = bins[0]
+                arrays[prefix + '-count'] = bins[1]
+            with replace_atomically(params['bins_npz']) as temp_file:
+                with open(temp_file, 'wb') as f:
+                    np.savez_compressed(f, **arrays)
+            print('[NOTE] Finished!')
+
+        except Exception as err:
+            print('[ERROR] Error while saving to npz file: %s' % err)
+            return 1
+
+        return 0
+
+    def _open_inotify(self, paths):
+        """Watch the directories by inotify.
+
+        The files are put into the result path by closing after writing or
+        moving (such as the tarballs by RunFioTest.py), as well as the files
+        could be removed.
+
+        Args:
+            paths: list, the directories to watch.
+
+        Returns:
+            The file descriptor of the inotify instance, or None if inotify
+            is not available (such as on other platforms than Linux).
+
+        """
+        IN_CLOSE_WRITE = 0x00000008
+        IN_MOVED_TO = 0x00000080
+        IN_DELETE = 0x00000200
+
+        try:
+            libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+            fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        except (OSError, AttributeError):
+            return None
+        if fd < 0:
+            return None
+
+        watched = 0
+        for path in paths:
+            if libc.inotify_add_watch(fd, os.fsencode(path), IN_CLOSE_WRITE
+                                      | IN_MOVED_TO | IN_DELETE) >= 0:
+                watched += 1
+        if not watched:
+            os.close(fd)
+            return None
+
+        return fd
+
+    def _wait_for_changes(self, fd, interval):
+        """Wait until the watched directory changed or the interval passed.
+
+        Args:
+            fd: the file descriptor of the inotify instance, or None to poll.
+            interval: int, the seconds to wait at most.
+
+        Returns:
+            True if any change was notified, otherwise False.
+
+        """
+        if fd is None:
+            time.sleep(interval)
+            return False
+
+        if not select.select([fd], [], [], interval)[0]:
+            return False
+
+        # Wait a moment for the files arriving together, drain the events
+        time.sleep(1)
+        try:
+            while os.read(fd, 65536):
+                pass
+        except BlockingIOError:
+            pass
+
+        return True
+
+
+def get_perf_kpi_from_file(filename):
+    """Get the performance KPIs from a file, for the process pool."""
+    return FioTestReporter()._get_perf_kpi_from_file(filename)
+
+
+def generate_fio_test_report(result_path,
+                             report_csv,
+                             saturation_csv=None,
+                             jobs=1,
+                             cache=None,
+                             rebuild=False,
+                             bins_npz=None,
+                             filter=None,
+                             recursive=False):
     """Generate FIO test report."""
     fioreporter = FioTestReporter()
 
-    # Load raw data from *.fiolog files
-    return_value = fioreporter.load_raw_data_from_fio_logs(
-        {'result_path': result_path})
+    # Load performance KPIs from *.fiolog files, the raw data are dropped
+    # once the KPIs are extracted
+    return_value = fioreporter.load_perf_kpis_from_fio_logs({
+        'result_path': result_path,
+        'recursive': recursive,
+        'jobs': jobs,
+        'cache': cache,
+        'rebuild': rebuild,
+        'filter': filter
+    })
     if return_value:
         exit(1)
 
-    # Caclulate performance KPIs for each test
-    return_value = fioreporter.calculate_performance_kpis()
+    # Generate and dump the reports
+    return_value = dump_fio_test_report(fioreporter, report_csv,
+                                        saturation_csv, bins_npz)
     if return_value:
         exit(1)
 
+    exit(0)
+
+
+def dump_fio_test_report(fioreporter,
+                         report_csv,
+                         saturation_csv=None,
+                         bins_npz=None):
+    """Dump the FIO test report from the loaded performance KPIs."""
     # Convert the KPIs into Dataframe
     fioreporter.generate_report_dataframe()
 
@@ -492,31 +2182,180 @@ def generate_fio_test_report(result_path, report_csv):
     return_value = fioreporter.report_dataframe_to_csv(
         {'report_csv': report_csv})
     if return_value:
-        exit(1)
+        return 1
+
+    # Save the latency histograms
+    if bins_npz:
+        return_value = fioreporter.bins_to_npz({'bins_npz': bins_npz})
+        if return_value:
+            return 1
+
+    # Analyse the saturation against queue depth
+    if saturation_csv:
+        fioreporter.generate_saturation_dataframe()
+        return_value = fioreporter.saturation_dataframe_to_csv(
+            {'saturation_csv': saturation_csv})
+        if return_value:
+            return 1
+
+    return 0
+
+
+def watch_fio_test_report(result_path,
+                          report_csv,
+                          saturation_csv=None,
+                          jobs=1,
+                          cache=None,
+                          rebuild=False,
+                          bins_npz=None,
+                          filter=None,
+                          recursive=False,
+                          interval=10):
+    """Watch the result path and keep the FIO test report updated."""
+    fioreporter = FioTestReporter()
+
+    # Watch the result directories by inotify, or poll them
+    result_dirs = fioreporter._get_result_dirs(result_path)
+    if recursive:
+        result_dirs = [
+            x[0] for y in result_dirs for x in sorted(os.walk(y))
+        ]
+    fd = fioreporter._open_inotify(result_dirs)
+    if fd is None:
+        print('[NOTE] Polling %s directories every %s seconds, press Ctrl+C '
+              'to stop.' % (len(result_dirs), interval))
+    else:
+        print('[NOTE] Watching %s directories by inotify, press Ctrl+C to '
+              'stop.' % len(result_dirs))
+
+    snapshot = None
+    try:
+        while True:
+            # Check the fio log files and the manifests for changes
+            files = list(
+                fioreporter._find_fio_log_files(result_path, recursive))
+            if filter:
+                for path in sorted(set([os.path.dirname(x) for x in files])):
+                    manifest = os.path.join(path, 'manifest.jsonl')
+                    if os.path.isfile(manifest):
+                        files.append(manifest)
+            current = {}
+            for filename in files:
+                try:
+                    current[filename] = fioreporter._get_file_stat(filename)
+                except OSError:
+                    pass
+
+            if current != snapshot:
+                snapshot = current
+
+                # Only the new or changed files are parsed
+                fioreporter.perf_kpi_list = []
+                return_value = fioreporter.load_perf_kpis_from_fio_logs({
+                    'result_path': result_path,
+                    'recursive': recursive,
+                    'jobs': jobs,
+                    'cache': cache,
+                    'rebuild': rebuild,
+                    'filter': filter
+                })
+                rebuild = False
+                if return_value:
+                    print('[WARNING] Some files are not reported, they will '
+                          'be parsed again once changed.')
+
+                if fioreporter.perf_kpi_list:
+                    dump_fio_test_report(fioreporter, report_csv,
+                                         saturation_csv, bins_npz)
+                print('[NOTE] Reported %s tests at %s.' %
+                      (len(fioreporter.perf_kpi_list),
+                       time.strftime('%Y-%m-%d %H:%M:%S')))
+
+            fioreporter._wait_for_changes(fd, interval)
+
+    except KeyboardInterrupt:
+        print('[NOTE] Stopped watching.')
+
+    finally:
+        if fd is not None:
+            os.close(fd)
 
     exit(0)
 
 
 @click.command()
 @click.option('--result_path',
-              type=click.Path(exists=True),
-              help='Specify the path where *.fiolog files are stored in.')
+              multiple=True,
+              help='Specify the path where *.fiolog files are stored in. The \
+glob patterns are supported (such as "logs/*_FIO_*"), and this option can be \
+used multiple times.')
+@click.option('--recursive',
+              is_flag=True,
+              help='Search the subdirectories of the result_path as well.')
 @click.option('--report_csv',
               type=click.Path(),
               help='Specify the name of CSV file for fio test reports.')
-def cli(result_path, report_csv):
+@click.option('--saturation_csv',
+              type=click.Path(),
+              help='Specify the name of CSV file for the queue depth \
+saturation analysis.')
+@click.option('--jobs',
+              type=click.IntRange(1, 1024),
+              default=1,
+              help='Specify the number of processes to load the fio logs in \
+parallel.')
+@click.option('--cache',
+              is_flag=True,
+              help='Cache the KPIs in "fio_report.cache.db" under the \
+result_path, only parse the new or changed files.')
+@click.option('--rebuild',
+              is_flag=True,
+              help='Drop the cache and parse all the files again.')
+@click.option('--bins_npz',
+              type=click.Path(),
+              help='Specify the name of npz file to save the latency bins \
+(json+ histograms) in.')
+@click.option('--filter',
+              help='Specify the expression to select the tests by the \
+manifest, such as "rw == \'randread\' and iodepth >= 16".')
+@click.option('--watch',
+              is_flag=True,
+              help='Keep watching the result_path and update the reports \
+once new fio logs arrived, only the new files are parsed.')
+@click.option('--interval',
+              type=click.IntRange(1, 3600),
+              default=10,
+              help='Specify the seconds to poll the result_path while \
+watching, 10 by default.')
+def cli(result_path, recursive, report_csv, saturation_csv, jobs, cache,
+        rebuild, bins_npz, filter, watch, interval):
     """Command Line Interface."""
     # Parse and check the parameters
     if not result_path:
         print('[ERROR] Missing parameter, use "--help" to check the usage.')
         exit(1)
+    result_dirs = FioTestReporter()._get_result_dirs(result_path)
+    if not result_dirs:
+        print('[ERROR] No directory matches the result_path: %s' %
+              ', '.join(result_path))
+        exit(1)
     if not report_csv:
         print('[WARNING] No CSV file name (--report_csv) was specified. Will \
-use "%s/fio_report.csv" instead.' % result_path)
-        report_csv = result_path + os.sep + 'fio_report.csv'
+use "%s/fio_report.csv" instead.' % result_dirs[0])
+        report_csv = result_dirs[0] + os.sep + 'fio_report.csv'
 
     # Generate FIO test report
-    generate_fio_test_report(result_path, report_csv)
+    cache_db = None
+    if cache or rebuild:
+        cache_db = result_dirs[0] + os.sep + 'fio_report.cache.db'
+    if watch:
+        watch_fio_test_report(result_path, report_csv, saturation_csv, jobs,
+                              cache_db, rebuild, bins_npz, filter, recursive,
+                              interval)
+    else:
+        generate_fio_test_report(result_path, report_csv, saturation_csv,
+                                 jobs, cache_db, rebuild, bins_npz, filter,
+                                 recursive)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,483 @@
+#!/usr/bin/env python3
+"""Manage the historical baseline store of the FIO test reports.
+
+The store is a SQLite database which ingests the FIO test reports with the
+release, kernel and host metadata. It provides the rolling baseline of the
+last N accepted runs for the benchmark report, and detects the change points
+of the KPIs across the runs.
+
+History:
+v1.0    2026-10-18  agent         Init version.
+"""
+
+import os
+import time
+import sqlite3
+import click
+import pandas as pd
+import numpy as np
+from GenerateBenchmarkReport import FioBenchmarkReporter
+from report_io import read_dataframe
+from report_io import write_dataframe
+
+
+class FioBaselineStore():
+    """FIO Baseline Store.
+
+    This class used to manage the historical results of the FIO tests:
+    1. It ingests the test reports as runs with the metadata;
+    2. It accepts the runs as the candidates of the baseline;
+    3. It provides the samples of the last N accepted runs as baseline;
+    4. It detects the change points of the KPIs across the runs;
+
+    The samples are stored in the long format (the KEYs, Round, KPI and
+    value), so that the reports with different KPIs can be ingested.
+
+    Attributes:
+        db_file: the SQLite database file.
+        keys: the source labels of the KEYs to identify a case.
+
+    """
+
+    def __init__(self, db_file, keys):
+        """Open the store and create the tables if needed.
+
+        Args:
+            db_file: string, the SQLite database file.
+            keys: list, the source labels of the KEYs to identify a case.
+
+        """
+        self.db_file = db_file
+        self.keys = list(keys)
+
+        with self._connect() as conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS runs ('
+                         'seq INTEGER PRIMARY KEY AUTOINCREMENT, '
+                         'run_id TEXT UNIQUE NOT NULL, release TEXT, '
+                         'kernel TEXT, host TEXT, source TEXT, '
+                         'ingested TEXT, accepted INTEGER DEFAULT 0)')
+
+    def _connect(self):
+        """Connect to the SQLite database."""
+        return sqlite3.connect(self.db_file)
+
+    def _get_metadata(self, df, column):
+        """Get the metadata from a column of the test report.
+
+        Returns:
+            The first available value, or None if not available.
+
+        """
+        if column not in df:
+            return None
+
+        values = df[column].dropna().astype(str)
+        values = values[~values.isin(['', 'NaN', 'N/A'])]
+
+        return values.iloc[0] if len(values) else None
+
+    def ingest(self,
+               df,
+               run_id,
+               release=None,
+               kernel=None,
+               host=None,
+               source=None,
+               accept=False):
+        """Ingest a test report as a run.
+
+        The run with the same ID will be replaced. The kernel and host are
+        taken from the "Release" and "Host" columns of the report (collected
+        from the sar log) by default.
+
+        Args:
+            df: DataFrame, the test report.
+            run_id: string, the ID of the run.
+            release: string, the release under test, such as "RHEL-8.2".
+            kernel: string, the kernel release.
+            host: string, the host name.
+            source: string, the file of the test report.
+            accept: bool, accept the run as baseline.
+
+        Returns:
+            The number of the samples ingested.
+
+        """
+        kernel = kernel or self._get_metadata(df, 'Release')
+        host = host or self._get_metadata(df, 'Host')
+
+        # Convert the KPIs into the long format
+        ignored = self.keys + ['Round', 'Run', 'Client', 'Host', 'Release']
+        kpis = [
+            x for x in df.columns
+            if x not in ignored and not str(x).startswith('Unnamed')
+        ]
+        df = df.copy()
+        df[kpis] = df[kpis].apply(pd.to_numeric, errors='coerce')
+        samples = df.melt(id_vars=self.keys + ['Round'],
+                          value_vars=kpis,
+                          var_name='KPI',
+                          value_name='Value').dropna(subset=['Value'])
+        samples.insert(0, 'RunID', run_id)
+
+        with self._connect() as conn:
+            self._delete(conn, run_id)
+            conn.execute(
+                'INSERT INTO runs (run_id, release, kernel, host, source, '
+                'ingested, accepted) VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (run_id, release, kernel, host, source,
+                 time.strftime('%Y-%m-%d %H:%M:%S'), int(accept)))
+            samples.to_sql('samples', conn, if_exists='append', index=False)
+
+        return len(samples)
+
+    def _delete(self, conn, run_id):
+        """Delete a run from the store."""
+        conn.execute('DELETE FROM runs WHERE run_id = ?', (run_id, ))
+        tables = conn.execute('SELECT name FROM sqlite_master WHERE '
+                              'type = \'table\' AND name = \'samples\'')
+        if tables.fetchone():
+            conn.execute('DELETE FROM samples WHERE RunID = ?', (run_id, ))
+
+    def accept(self, run_id, accepted=True):
+        """Accept (or reject) a run as the candidate of the baseline.
+
+        Returns:
+            0: Passed
+            1: Failed (no such run)
+
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE runs SET accepted = ? WHERE run_id = ?',
+                (int(accepted), run_id))
+
+        return 0 if cursor.rowcount else 1
+
+    def get_runs(self, accepted_only=False, release=None, host=None):
+        """Get the runs in the order of ingestion.
+
+        Args:
+            accepted_only: bool, get the accepted runs only.
+            release: string, get the runs of the release only.
+            host: string, get the runs on the host only.
+
+        Returns:
+            The DataFrame of the runs.
+
+        """
+        (conditions, args) = ([], [])
+        if accepted_only:
+            conditions.append('accepted = 1')
+        if release:
+            conditions.append('release = ?')
+            args.append(release)
+        if host:
+            conditions.append('host = ?')
+            args.append(host)
+
+        sql = 'SELECT * FROM runs'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        with self._connect() as conn:
+            return pd.read_sql_query(sql + ' ORDER BY seq', conn, params=args)
+
+    def get_samples(self, run_ids):
+        """Get the samples of the runs in the wide format.
+
+        The samples are in the same format as the test report, with the
+        "Run" column as the ID of the run. The samples of the clients in a
+        round (see "RunFioClientTest.py") are averaged into one.
+
+        Args:
+            run_ids: list, the IDs of the runs.
+
+        Returns:
+            The DataFrame of the samples.
+
+        """
+        if not run_ids:
+            return pd.DataFrame(columns=self.keys + ['Round', 'Run'])
+
+        sql = 'SELECT * FROM samples WHERE RunID IN (%s)' % ','.join(
+            '?' * len(run_ids))
+        with self._connect() as conn:
+            samples = pd.read_sql_query(sql, conn, params=list(run_ids))
+
+        df = samples.pivot_table(index=self.keys + ['Round', 'RunID'],
+                                 columns='KPI',
+                                 values='Value',
+                                 aggfunc='mean')
+        df = df.reset_index().rename(columns={'RunID': 'Run'})
+        df.columns.name = None
+
+        return df
+
+    def get_baseline(self, runs=5, release=None, host=None):
+        """Get the samples of the rolling baseline.
+
+        Args:
+            runs: int, the number of the last accepted runs.
+            release: string, the release of the runs.
+            host: string, the host of the runs.
+
+        Returns:
+            The DataFrame of the samples.
+
+        """
+        df_runs = self.get_runs(accepted_only=True, release=release,
+                                host=host).tail(runs)
+        print('[NOTE] The baseline has %s accepted runs: %s' %
+              (len(df_runs), ', '.join(df_runs['run_id'])))
+
+        return self.get_samples(list(df_runs['run_id']))
+
+    def _find_change_point(self, series, rng, permutations=1000,
+                           min_size=2):
+        """Find the most likely change point of a series by CUSUM.
+
+        The change point is where the CUSUM of the deviations from the mean
+        reaches its extreme. The confidence is the fraction of the shuffled
+        series (all at once by NumPy) with a smaller extreme of the CUSUM.
+
+        Args:
+            series: NumPy array, the series.
+            rng: the NumPy random Generator.
+            permutations: int, the number of the shuffled series.
+            min_size: int, the minimal size of the segments.
+
+        Returns:
+            A tuple (position, confidence), the series shifts from the
+            position on.
+
+        """
+        # The CUSUM at the candidates of the last point before the change
+        candidates = slice(min_size - 1, len(series) - min_size)
+        cusum = np.abs(np.cumsum(series - series.mean())[candidates])
+        position = np.argmax(cusum) + min_size
+
+        order = np.argsort(rng.random((permutations, len(series))), axis=1)
+        shuffled = np.cumsum(series[order] - series.mean(), axis=1)
+        extremes = np.abs(shuffled[:, candidates]).max(axis=1)
+        confidence = np.mean(extremes < cusum.max())
+
+        return (position, confidence)
+
+    def _find_change_points(self, series, rng, confidence_threshold=0.95,
+                            min_size=2, offset=0):
+        """Find the change points of a series by binary segmentation.
+
+        Returns:
+            The list of (position, confidence).
+
+        """
+        if len(series) < min_size * 2 or np.all(series == series[0]):
+            return []
+
+        (position, confidence) = self._find_change_point(series,
+                                                         rng,
+                                                         min_size=min_size)
+        if confidence < confidence_threshold:
+            return []
+
+        return (self._find_change_points(series[:position], rng,
+                                         confidence_threshold, min_size,
+                                         offset) +
+                [(offset + position, confidence)] +
+                self._find_change_points(series[position:], rng,
+                                         confidence_threshold, min_size,
+                                         offset + position))
+
+    def detect_change_points(self,
+                             kpis,
+                             accepted_only=False,
+                             release=None,
+                             host=None,
+                             min_size=2):
+        """Detect the change points of the KPIs across the runs.
+
+        The series of each case and KPI is the AVG of each run, in the order
+        of ingestion. The change points are reported if the shift is
+        significant and beyonds the regression threshold of the KPI.
+
+        Args:
+            kpis: list, the user config data of the KPIs.
+            accepted_only: bool, detect on the accepted runs only.
+            release: string, detect on the runs of the release only.
+            host: string, detect on the runs on the host only.
+            min_size: int, the minimal number of runs between the changes.
+
+        Returns:
+            The DataFrame of the change points.
+
+        """
+        df_runs = self.get_runs(accepted_only, release, host)
+        df = self.get_samples(list(df_runs['run_id']))
+        runs = df_runs.set_index('run_id')
+        sequence = dict(zip(df_runs['run_id'], df_runs['seq']))
+        df['Seq'] = df['Run'].map(sequence)
+
+        # The same seed for the same conclusions of the same data
+        rng = np.random.default_rng(0)
+
+        rows = []
+        for kpi in kpis:
+            column = kpi['source_label']
+            if column not in df:
+                continue
+
+            means = df.groupby(self.keys + ['Seq', 'Run'])[column].mean()
+            means = means.dropna().reset_index(level=['Seq', 'Run'])
+            for (case, group) in means.groupby(level=self.keys, sort=True):
+                group = group.sort_values('Seq')
+                series = group[column].values
+                points = self._find_change_points(
+                    series, rng, kpi['confidence_threshold'], min_size)
+
+                bounds = [0] + [x[0] for x in points] + [len(series)]
+                for (num, (position, confidence)) in enumerate(points):
+                    before = series[bounds[num]:position].mean()
+                    after = series[position:bounds[num + 2]].mean()
+                    with np.errstate(divide='ignore', invalid='ignore'):
+                        pct_shift = (after - before) / before * 100
+                    if not abs(pct_shift) >= kpi['regression_threshold']:
+                        continue
+
+                    run_id = group['Run'].iloc[position]
+                    row = dict(zip(self.keys, case))
+                    row.update({
+                        'KPI': kpi['target_label'],
+                        'Runs': len(series),
+                        'Change Run': run_id,
+                        'Release': runs.loc[run_id, 'release'],
+                        'Kernel': runs.loc[run_id, 'kernel'],
+                        'BEFORE-AVG': before,
+                        'AFTER-AVG': after,
+                        '%SHIFT': pct_shift,
+                        'CONFIDENCE': confidence,
+                        'CONCLUSION': 'Shifted Up' if after > before else
+                        'Shifted Down',
+                    })
+                    if (after > before) != bool(kpi['higher_is_better']):
+                        row['CONCLUSION'] += ' (Regression)'
+                    else:
+                        row['CONCLUSION'] += ' (Improvement)'
+                    rows.append(row)
+
+        columns = self.keys + [
+            'KPI', 'Runs', 'Change Run', 'Release', 'Kernel', 'BEFORE-AVG',
+            'AFTER-AVG', '%SHIFT', 'CONFIDENCE', 'CONCLUSION'
+        ]
+        print('[NOTE] Detected %s change points across %s runs.' %
+              (len(rows), len(df_runs)))
+
+        return pd.DataFrame(rows, columns=columns).round(4)
+
+
+@click.command()
+@click.option(
+    '--db',
+    'db_file',
+    type=click.Path(),
+    required=True,
+    help='Specify the SQLite database file of the baseline store.')
+@click.option(
+    '--ingest',
+    type=click.Path(exists=True),
+    help='Specify the test report to ingest as a run.')
+@click.option(
+    '--run_id',
+    help='Specify the ID of the run to ingest, the "Run" column of the \
+report or the report name by default.')
+@click.option('--release', help='Specify the release of the run to ingest, \
+or of the runs to use as baseline and detect on.')
+@click.option('--kernel', help='Specify the kernel of the run to ingest, the \
+"Release" column of the report by default.')
+@click.option('--host', help='Specify the host of the run to ingest, the \
+"Host" column of the report by default; or of the runs to use as baseline \
+and detect on.')
+@click.option(
+    '--accept',
+    multiple=True,
+    help='Specify the ID of a run to accept as baseline, can be specified \
+multiple times.')
+@click.option(
+    '--reject',
+    multiple=True,
+    help='Specify the ID of a run to reject as baseline, can be specified \
+multiple times.')
+@click.option('--list', 'list_runs', is_flag=True, help='List the runs.')
+@click.option(
+    '--baseline_csv',
+    type=click.Path(),
+    help='Specify the CSV file to store the samples of the rolling \
+baseline.')
+@click.option(
+    '--baseline_runs',
+    type=int,
+    default=5,
+    show_default=True,
+    help='Specify the number of the last accepted runs for the baseline.')
+@click.option(
+    '--changepoints_csv',
+    type=click.Path(),
+    help='Specify the CSV file to store the change points of the KPIs.')
+@click.option(
+    '--accepted_only',
+    is_flag=True,
+    help='Detect the change points on the accepted runs only.')
+@click.option(
+    '--config',
+    type=click.Path(exists=True),
+    help='Specify the yaml file of the KEYs, KPIs and thresholds, \
+"benchmark_reporter_config.yaml" along with this script by default.')
+def cli(db_file, ingest, run_id, release, kernel, host, accept, reject,
+        list_runs, baseline_csv, baseline_runs, changepoints_csv,
+        accepted_only, config):
+    """Command Line Interface."""
+    try:
+        reporter = FioBenchmarkReporter(config)
+        store = FioBaselineStore(db_file,
+                                 [x['source_label'] for x in reporter.keys])
+
+        # Ingest the test report
+        if ingest:
+            df = read_dataframe(ingest)
+            if not run_id and df.get('Run', pd.Series()).nunique() == 1:
+                run_id = store._get_metadata(df, 'Run')
+            if not run_id:
+                run_id = os.path.splitext(os.path.basename(ingest))[0]
+            num = store.ingest(df, run_id, release, kernel, host,
+                               os.path.abspath(ingest))
+            print('[NOTE] Ingested %s samples as run "%s".' % (num, run_id))
+
+        # Accept or reject the runs
+        for (run_ids, accepted) in ((accept, True), (reject, False)):
+            for x in run_ids:
+                if store.accept(x, accepted):
+                    print('[ERROR] No such run: %s' % x)
+                    exit(1)
+
+        if list_runs:
+            print(store.get_runs().to_string(index=False))
+
+        # Dump the rolling baseline
+        if baseline_csv:
+            df = store.get_baseline(baseline_runs, release, host)
+            write_dataframe(df, baseline_csv)
+
+        # Dump the change points
+        if changepoints_csv:
+            df = store.detect_change_points(reporter.kpis, accepted_only,
+                                            release, host)
+            write_dataframe(df, changepoints_csv)
+
+    except Exception as err:
+        print('[ERROR] Error while managing the baseline store: %s' % err)
+        exit(1)
+
+    exit(0)
+
+
+if __name__ == '__main__':
+    cli()
@@ -0,0 +1,632 @@
+#!/usr/bin/env python3
+"""Run FIO Test across multiple guests.
+
+# Interface between GenerateTestReport.py
+# This script drives the same test matrix as RunFioTest.py, but runs each
+# case on a list of fio servers (fio --server) at the same time through the
+# fio client/server protocol (fio --client). It should do:
+# 1. start every case on all the endpoints with a synchronized start
+# 2. collect the json+ outputs from all the endpoints centrally
+# 3. split the outputs into one *.fiolog per endpoint and put them into the
+#    specified path, so that GenerateTestReport.py can handle them as usual
+# 4. pass the additional information by "fio --description"
+#    a) "driver" - frontend driver, such as SCSI or IDE
+#    b) "format" - the disk format, such as raw or xfs
+#    c) "round" - the round number, such as 1, 2, 3...
+#    d) "backend" - the hardware which data image based on
+#    e) "client" - the fio server (endpoint) which ran the job
+# 5. write the aggregate IOPS, per-guest fairness and the skew of the start
+#    time among the endpoints of each case into "client_summary.csv" under
+#    the specified path
+
+History:
+v0.1    2026-10-18  agent         Init version.
+v0.2    2026-10-18  agent         Write a manifest of the tests.
+v0.3    2026-10-18  agent         Repeat the cases by a round plan.
+"""
+
+import os
+import csv
+import json
+import time
+import itertools
+import subprocess
+import yaml
+import click
+
+from RunFioTest import FioTestRunner
+from RunFioTest import get_cli_params
+
+
+class FioClientTestRunner(FioTestRunner):
+    """FIO Client Test Runner.
+
+    This class used to run the fio test cases on several fio servers at the
+    same time. As basic functions:
+    1. It loads all the needed parameters from dict named 'params';
+    2. It splits the test suites into sub-cases and run them one by one, each
+       sub-case runs on all the endpoints simultaneously;
+    3. It generates one '.fiolog' file per endpoint for each sub-case;
+    4. It summarizes the aggregate and per-endpoint IOPS for each sub-case;
+
+    """
+
+    def __init__(self, params={}):
+        """Initialize this Class.
+
+        This function parse and check the parameters for running the fio
+        tests. Besides the parameters of FioTestRunner, it takes:
+
+        Args:
+            params: dict
+                clients: list
+                    The fio servers to run the tests on, in the format of
+                    "fio --client", such as "192.168.1.10" or "host,8766".
+                start_delay: int
+                    Seconds from dispatching a case to the synchronized
+                    start of I/O on all the endpoints.
+                max_start_skew: int
+                    The maximum milliseconds between the start of the jobs
+                    on the endpoints, beyond which the case is warned.
+        Returns:
+            None
+
+        """
+        FioTestRunner.__init__(self, params)
+
+        # Parse Args
+        if 'clients' not in params:
+            print('[ERROR] Missing required params: params[clients]')
+            exit(1)
+        elif not isinstance(params['clients'],
+                            (list, tuple)) or not params['clients']:
+            print('[ERROR] params[clients] must be a non-empty list or tuple.')
+            exit(1)
+        else:
+            self.clients = params['clients']
+
+        if 'start_delay' not in params:
+            self.start_delay = 30
+        elif not isinstance(params['start_delay'],
+                            int) or params['start_delay'] < 0:
+            print('[ERROR] params[start_delay] must be an integer >= 0.')
+            exit(1)
+        else:
+            self.start_delay = params['start_delay']
+
+        if 'max_start_skew' not in params:
+            self.max_start_skew = 1000
+        elif not isinstance(params['max_start_skew'],
+                            int) or params['max_start_skew'] < 0:
+            print('[ERROR] params[max_start_skew] must be an integer >= 0.')
+            exit(1)
+        else:
+            self.max_start_skew = params['max_start_skew']
+
+        if self.plots:
+            print('[WARNING] The bw/iops/lat logs stay on the fio servers, '
+                  'params[plots] is ignored.')
+            self.plots = False
+
+        return None
+
+    def _split_tests(self):
+        """Split fio test parameters and create job list.
+
+        This function splits the parameters for running the fio tests in the
+        same order as FioTestRunner does. The job files are not written here
+        since the start time of each case is only known when it runs.
+
+        Updates:
+            self.jobs: the job list.
+
+        """
+        # Overall parameters
+        self.path = os.path.expanduser(self.log_path)
+
+        # Split parameters
+        max_rounds = max([self.rounds] +
+                         [x['rounds'] for x in self.round_plan])
+        param_tuples = itertools.product(list(range(1, max_rounds + 1)),
+                                         self.bs_list, self.iodepth_list,
+                                         self.rw_list)
+
+        # Generate command for all the tests
+        jobnum = 0
+        for (rd, bs, iodepth, rw) in param_tuples:
+            # Repeat the case by the round plan
+            if rd > self._get_planned_rounds({
+                    'backend': self.backend,
+                    'driver': self.driver,
+                    'format': self.fs,
+                    'rw': rw,
+                    'bs': bs,
+                    'iodepth': iodepth,
+                    'numjobs': self.numjobs
+            }):
+                continue
+
+            # Set case name and output files
+            casename = 'fio_%s_%s_%s_%s_%s_%s_%s_%s_%s_%s' % (
+                self.backend, self.driver, self.fs, self.ioengine, rw, bs,
+                iodepth, self.numjobs, rd,
+                time.strftime('%Y%m%d%H%M%S', time.localtime()))
+            output_path = self.path + os.sep + casename
+            output = output_path + os.sep + casename + '.fioclient'
+
+            # Build fio client command, one job file for each endpoint
+            command = 'fio'
+            command += ' --output-format=json+'
+            command += ' --output=%s' % output
+            jobfiles = []
+            for index, client in enumerate(self.clients):
+                jobfile = output_path + os.sep + '%s_%s.fio' % (casename,
+                                                                index + 1)
+                command += ' --client=%s %s' % (client, jobfile)
+                jobfiles.append(jobfile)
+
+            # save the current test command into jobs
+            jobnum += 1
+            self.jobs.append({
+                'jobnum': jobnum,
+                'casename': casename,
+                'output_path': output_path,
+                'output': output,
+                'jobfiles': jobfiles,
+                'options': {
+                    'rw': rw,
+                    'bs': bs,
+                    'iodepth': iodepth,
+                    'numjobs': self.numjobs,
+                    'round': rd
+                },
+                'command': command,
+                'status': 'NOTRUN',
+                'start': None,
+                'stop': None
+            })
+
+        return None
+
+    def _get_job_file_content(self, job, client, start_at):
+        """Get the content of the fio job file for an endpoint.
+
+        Args:
+            job: dict, the job in self.jobs.
+            client: str, the endpoint to run this job file.
+            start_at: int, the epoch time to start I/O on all the endpoints.
+
+        Returns:
+            The content of the fio job file.
+
+        """
+        options = job['options']
+
+        # Reuse 'description' to integrate some metadata
+        description = {
+            'backend': self.backend,
+            'driver': self.driver,
+            'format': self.fs,
+            'round': options['round'],
+            'client': client
+        }
+
+        # The barrier, drop caches and wait for the start time on the
+        # endpoint after the files are laid out (needs synchronized clocks)
+        prerun = 'sh -c \'sync && echo 3 > /proc/sys/vm/drop_caches'
+        prerun += ' && d=$((%s - $(date +%%s)))' % start_at
+        prerun += ' && [ $d -gt 0 ] && sleep $d || true\''
+
+        content = '[%s]\n' % job['casename']
+        content += 'filename=%s\n' % self.filename
+        content += 'size=80G\n'
+        content += 'ioengine=%s\n' % self.ioengine
+        content += 'direct=%s\n' % self.direct
+        content += 'rw=%s\n' % options['rw']
+        content += 'bs=%s\n' % options['bs']
+        content += 'iodepth=%s\n' % options['iodepth']
+        content += 'numjobs=%s\n' % options['numjobs']
+        content += 'time_based\n'
+        content += 'runtime=%s\n' % self.runtime
+        content += 'ramp_time=20\n'
+        content += 'group_reporting\n'
+        content += 'description=%s\n' % description
+        content += 'exec_prerun=%s\n' % prerun
+
+        return content
+
+    def _get_endpoint_index(self, client_stat, index):
+        """Get the index of the endpoint which a client stat belongs to."""
+        options = client_stat.get('job options', {})
+        try:
+            client = eval(options['description'])['client']
+            return self.clients.index(client)
+        except Exception:
+            pass
+
+        # Match by hostname and port, fall back to the output order
+        for num, client in enumerate(self.clients):
+            address = client.split(':', 1)[-1].split(',')
+            if address[0] == client_stat.get('hostname') and (
+                    len(address) == 1
+                    or str(client_stat.get('port')) == address[1]):
+                return num
+
+        return index
+
+    def _split_client_output(self, job):
+        """Split the fio client output into a *.fiolog for each endpoint.
+
+        Args:
+            job: dict, the job in self.jobs.
+
+        Returns:
+            This function returns a tuple like (result, stats):
+            result:
+                0: Passed
+                1: Failed
+            stats:
+                A list of (client, iops, start) tuples, the start is the
+                epoch time in ms when the job started on the endpoint, None
+                if not available (before fio-3.28).
+
+        """
+        try:
+            with open(job['output'], 'r') as f:
+                content = f.read()
+            data = json.JSONDecoder().raw_decode(content,
+                                                 content.index('{'))[0]
+        except Exception as err:
+            print('[ERROR] Error while handling fio client output: %s' % err)
+            return (1, None)
+
+        stats = []
+        index = 0
+        for client_stat in data.get('client_stats', []):
+            # Skip the aggregate of all clients
+            if client_stat.get('jobname') == 'All clients':
+                continue
+
+            client = self.clients[self._get_endpoint_index(client_stat,
+                                                           index)]
+            index += 1
+
+            # Make sure the job options are there for the reporter
+            options = client_stat.setdefault('job options', {})
+            for key in ('rw', 'bs', 'iodepth', 'numjobs'):
+                options.setdefault(key, str(job['options'][key]))
+            options.setdefault(
+                'description', '%s' % {
+                    'backend': self.backend,
+                    'driver': self.driver,
+                    'format': self.fs,
+                    'round': job['options']['round'],
+                    'client': client
+                })
+
+            fiolog = {
+                'fio version': data.get('fio version'),
+                'timestamp': data.get('timestamp'),
+                'time': data.get('time'),
+                'jobs': [client_stat]
+            }
+
+            output = self.path + os.sep + self._get_client_fiolog(job, client)
+            with open(output, 'w') as f:
+                json.dump(fiolog, f, indent=2)
+
+            stats.append((client,
+                          int(client_stat['read']['iops'] +
+                              client_stat['write']['iops']),
+                          client_stat.get('job_start')))
+
+        return (0, stats)
+
+    def _get_client_fiolog(self, job, client):
+        """Get the name of the *.fiolog file for an endpoint."""
+        tag = client.split(':', 1)[-1].replace(',', '-')
+        return '%s_%s.fiolog' % (job['casename'], tag)
+
+    def _get_start_skew(self, stats):
+        """Get the skew of the start time among the endpoints.
+
+        The barrier (the common start time in the job files) relies on the
+        synchronized clocks, and an endpoint which lays out the files longer
+        than the start delay starts late. So the start time of the jobs on
+        the endpoints are compared after the run.
+
+        Args:
+            stats: list, the (client, iops, start) tuples of the endpoints.
+
+        Returns:
+            The skew in ms, 'NaN' if the start time is not available.
+
+        """
+        starts = [start for (client, iops, start) in stats]
+        if None in starts:
+            print('[NOTE] The start time of the jobs is not available (needs '
+                  'fio-3.28 or later), skip checking the skew.')
+            return 'NaN'
+
+        skew = max(starts) - min(starts)
+        if skew > self.max_start_skew:
+            late = [client for (client, iops, start) in stats
+                    if start - min(starts) > self.max_start_skew]
+            print('[WARNING] The jobs started %s ms apart (more than %s ms), '
+                  'the late endpoints: %s. Check the clocks of the endpoints '
+                  'or increase the start delay.' %
+                  (skew, self.max_start_skew, ', '.join(late)))
+
+        return skew
+
+    def _write_summary(self, job, stats):
+        """Write the aggregate IOPS and fairness into client_summary.csv.
+
+        The fairness is Jain's fairness index of the per-endpoint IOPS, which
+        is 1.0 when all the endpoints get the same IOPS. The skew of the start
+        time among the endpoints is written as well.
+
+        """
+        iops_list = [iops for (client, iops, start) in stats]
+        total = sum(iops_list)
+        squares = sum([iops * iops for iops in iops_list])
+        fairness = float(total * total) / (len(iops_list) *
+                                           squares) if squares else 'NaN'
+        skew = self._get_start_skew(stats)
+
+        summary = self.path + os.sep + 'client_summary.csv'
+        new_file = not os.path.exists(summary)
+        with open(summary, 'a') as f:
+            writer = csv.writer(f)
+            if new_file:
+                writer.writerow([
+                    'Case', 'Clients', 'IOPS', 'MinIOPS', 'MaxIOPS',
+                    'Fairness', 'StartSkew(ms)'
+                ])
+            writer.writerow([
+                job['casename'],
+                len(iops_list), total,
+                min(iops_list),
+                max(iops_list), fairness, skew
+            ])
+
+        print('Aggregate IOPS : %s' % total)
+        print('Fairness       : %s' % fairness)
+        print('Start Skew(ms) : %s' % skew)
+
+        return None
+
+    def start(self):
+        """Start to run all tests in the job list."""
+        if not self.jobs:
+            self._split_tests()
+
+        jobnum = 0
+        total_num = len(self.jobs)
+        for job in self.jobs:
+            # Generate the job files with a common start time
+            start_at = int(time.time()) + self.start_delay
+            contents = [
+                self._get_job_file_content(job, client, start_at)
+                for client in self.clients
+            ]
+
+            # Show job information
+            jobnum += 1
+            start_time = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+            print('-' * 50)
+            print('Current Job  : %s / %s' % (jobnum, total_num))
+            print('Current Time : %s' % start_time)
+            print('Start I/O At : %s' % time.strftime(
+                '%Y-%m-%d %H:%M:%S', time.localtime(start_at)))
+            print('Test Command : %s' % job['command'])
+            for (jobfile, content) in zip(job['jobfiles'], contents):
+                print('Job File     : %s\n%s' % (jobfile, content))
+            print('-' * 50)
+
+            if self.dryrun is False:
+                # Create log directory
+                if not os.path.exists(job['output_path']):
+                    os.makedirs(job['output_path'])
+
+                for (jobfile, content) in zip(job['jobfiles'], contents):
+                    with open(jobfile, 'w') as f:
+                        f.write(content)
+
+                # Execute current test
+                result = os.system(job['command'])
+
+                # Log the fio command
+                with open(job['output_path'] + os.sep + job['casename'] +
+                          '.cmd', 'w') as f:
+                    f.write(job['command'] + '\n')
+
+                # Collect log files, unless the fio client failed
+                if result != 0:
+                    print('[ERROR] The fio client failed with exit status '
+                          '%s, skip collecting the logs.' % result)
+                else:
+                    (result, stats) = self._split_client_output(job)
+                    if result == 0 and stats:
+                        self._write_summary(job, stats)
+            else:
+                time.sleep(0.2)
+
+            # Update jobs data
+            job['status'] = 'FINISH'
+            job['start'] = start_time
+            job['stop'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
+
+            # Record the *.fiolog file of each endpoint into the manifest
+            if self.dryrun is False:
+                for client in self.clients:
+                    case = {
+                        'file': self._get_client_fiolog(job, client),
+                        'casename': job['casename'],
+                        'client': client,
+                        'backend': self.backend,
+                        'driver': self.driver,
+                        'format': self.fs,
+                        'ioengine': self.ioengine,
+                        'runtime': self.runtime,
+                        'direct': self.direct
+                    }
+                    case.update(job['options'])
+                    self._write_manifest(case, result, job['start'],
+                                         job['stop'])
+
+        return None
+
+
+def start_local_servers(number, base_port=8765):
+    """Start fio servers on loopback for testing the client mode.
+
+    Returns:
+        A tuple like (servers, clients), the server processes and the
+        endpoints to connect them.
+
+    """
+    servers = []
+    clients = []
+    for port in range(base_port, base_port + number):
+        servers.append(
+            subprocess.Popen(['fio', '--server=ip:127.0.0.1,%s' % port]))
+        clients.append('127.0.0.1,%s' % port)
+
+    # Wait for the servers to listen
+    time.sleep(1)
+
+    return (servers, clients)
+
+
+def get_yaml_params():
+    """Get parameters from the yaml file."""
+    yaml_params = {}
+
+    try:
+        with open('./virt_perf_scripts.yaml', 'r') as f:
+            yaml_dict = yaml.safe_load(f)
+            yaml_params.update(yaml_dict.get('FioTestRunner', {}))
+            yaml_params.update(yaml_dict.get('FioClientTestRunner', {}))
+
+    except Exception as err:
+        print('[WARNING] Fail to get default value from yaml file. %s' % err)
+
+    return yaml_params
+
+
+def run_fio_client_test(params={}):
+    """Initialize and run the fio test on all the endpoints."""
+    print('=' * 50)
+    print('Start Time: %s' %
+          time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()))
+    print('=' * 50)
+
+    fiorunner = FioClientTestRunner(params)
+    fiorunner.start()
+
+    print('=' * 50)
+    print('Finish Time: %s' %
+          time.strftime('%Y-%m-%d %H:%M:%S', time.localtime()))
+    print('=' * 50)
+
+
+@click.command()
+@click.option('--clients',
+              help='The fio servers to run the tests on, separated by \
+spaces. Such as: \'192.168.1.10 192.168.1.11,8766\'.')
+@click.option('--start_delay',
+              type=click.IntRange(0, 3600),
+              help='Seconds from dispatching a case to the synchronized \
+start of I/O on all the endpoints.')
+@click.option('--max_start_skew',
+              type=click.IntRange(0, 3600000),
+              help='The maximum milliseconds between the start of the jobs \
+on the endpoints, beyond which the case is warned.')
+@click.option('--local_servers',
+              type=click.IntRange(1, 64),
+              help='Start the specified number of fio servers on loopback \
+and run the tests against them (for testing).')
+@click.option('--backend',
+              help='The backend device where vdisk image is based on.')
+@click.option('--driver', help='The driver to power the vdisk..')
+@click.option('--fs',
+              help='The filesystem of the disk to be tested, "RAW" for no fs.')
+@click.option('--rounds',
+              type=click.IntRange(1, 1000),
+              help='How many rounds the fio test will be repeated.')
+@click.option('--filename',
+              help='[FIO] The disk(s) or specified file(s) to be tested by \
+fio on the endpoints.')
+@click.option('--runtime',
+              help='[FIO] Terminate a job after the specified period of time.')
+@click.option('--ioengine',
+              help='[FIO] Defines how the job issues I/O to the file. \
+Such as: \'libaio\', \'io_uring\', etc.')
+@click.option('--direct',
+              type=click.IntRange(0, 1),
+              help='[FIO] Direct access to the disk.')
+@click.option('--numjobs',
+              type=click.IntRange(1, 65535),
+              help='[FIO] Create the specified number of clones of the job.')
+@click.option('--rw_list', help='[FIO] Type of I/O pattern.')
+@click.option('--bs_list',
+              help='[FIO] The block size in bytes used for I/O units.')
+@click.option('--iodepth_list',
+              help='[FIO] # of I/O units to keep in flight against the file.')
+@click.option('--log_path', help='Where the *.fiolog files will be saved to.')
+@click.option('--dryrun',
+              is_flag=True,
+              default=None,
+              help='Print the commands \
+that would be executed, but do not execute them.')
+@click.option('--round_plan',
+              type=click.Path(exists=True),
+              help='The yaml file of the rounds for each case, generated by \
+"GenerateBenchmarkReport.py --round_plan".')
+def cli(clients, start_delay, max_start_skew, local_servers, backend, driver,
+        fs, rounds, filename, runtime, ioengine, direct, numjobs, rw_list,
+        bs_list, iodepth_list, log_path, dryrun, round_plan):
+    """Command line interface.
+
+    Take arguments from CLI, load default parameters from yaml file.
+    Then initialize the fio test on all the endpoints.
+
+    """
+    # Read user specified parameters from CLI
+    cli_params = get_cli_params(backend, driver, fs, rounds, filename, runtime,
+                                ioengine, direct, numjobs, rw_list, bs_list,
+                                iodepth_list, log_path, None, dryrun,
+                                round_plan)
+    if clients is not None:
+        cli_params['clients'] = clients.split()
+    if start_delay is not None:
+        cli_params['start_delay'] = start_delay
+    if max_start_skew is not None:
+        cli_params['max_start_skew'] = max_start_skew
+
+    # Read user configuration from yaml file
+    yaml_params = get_yaml_params()
+
+    # Combine user input and config
+    params = {}
+    params.update(yaml_params)
+    params.update(cli_params)
+
+    # Start fio servers on loopback if needed
+    servers = []
+    if local_servers:
+        (servers, params['clients']) = start_local_servers(local_servers)
+
+    # Run fio test
+    try:
+        run_fio_client_test(params)
+    finally:
+        for server in servers:
+            server.terminate()
+
+    exit(0)
+
+
+if __name__ == '__main__':
+    cli()
@@ -44,9 +44,15 @@ v2.2.1  2020-03-13  charles.shih  PEP-8 Formatting.
 v2.3    2020-07-22  charles.shih  Name all files uniformly.
 v2.4    2020-07-22  charles.shih  Technical Preview, wait before collection.
 v2.5    2020-07-22  charles.shih  Log the fio command.
+v2.6    2026-10-18  agent         Sample the disk statistics during the tests.
+v2.7    2026-10-18  agent         Save the CPU info beside the SAR logs.
+v2.8    2026-10-18  agent         Write a manifest of the tests.
+v2.9    2026-10-18  agent         Repeat the cases by a round plan.
+v2.10   2026-10-18  agent         Support the A/B tests in paired rounds.
 """
 
 import os
+import json
 import time
 import itertools
 import yaml
@@ -109,6 +115,22 @@ class FioTestRunner:
                 dryrun: bool
                     Print the commands that would be executed, but do not
                     execute them.
+                round_plan: str
+                    The yaml file of the rounds for each case, generated by
+                    "GenerateBenchmarkReport.py --round_plan". The cases not
+                    in the plan are repeated by the "rounds".
+                ab_labels: list
+                    The labels of the base and test in the A/B tests, the
+                    base and test tests of a case run by turns in each round
+                    and their logs are saved into the sub-directories named
+                    by the labels.
+                    Example: 'BASE, TEST'...
+                ab_filenames: list
+                    [FIO] The disk(s) or file(s) of the base and test in the
+                    A/B tests, the "filename" by default.
+                ab_setups: list
+                    The commands to run before each base and test in the A/B
+                    tests, such as switching the block scheduler.
         Returns:
             None
 
@@ -247,12 +269,65 @@ class FioTestRunner:
         else:
             self.dryrun = params['dryrun']
 
+        if 'round_plan' not in params:
+            self.round_plan = []
+        elif type(params['round_plan']) not in (type(u''), type(b'')):
+            print('[ERROR] params[round_plan] must be string.')
+            exit(1)
+        else:
+            try:
+                with open(params['round_plan'], 'r') as f:
+                    self.round_plan = yaml.safe_load(f)['FioRoundPlan']
+            except Exception as err:
+                print('[ERROR] Fail to load the round plan. %s' % err)
+                exit(1)
+
+        labels = params.get('ab_labels')
+        if labels is None:
+            self.ab_variants = []
+        elif not isinstance(labels, (list, tuple)) or len(
+                set(labels)) != 2 or len(labels) != 2:
+            print('[ERROR] params[ab_labels] must be a list of two different '
+                  'labels.')
+            exit(1)
+        else:
+            filenames = params.get('ab_filenames') or [self.filename] * 2
+            setups = params.get('ab_setups') or [''] * 2
+            if len(filenames) != 2 or len(setups) != 2:
+                print('[ERROR] params[ab_filenames] and params[ab_setups] '
+                      'must be the lists of two items.')
+                exit(1)
+            self.ab_variants = [{
+                'label': label,
+                'filename': filename or self.filename,
+                'setup': setup or ''
+            } for (label, filename, setup) in zip(labels, filenames, setups)]
+
         # Init variables
         self.jobs = []
         self.path = ''
 
         return None
 
+    def _get_planned_rounds(self, case):
+        """Get the rounds of a case in the round plan.
+
+        Args:
+            case: dict, the case with the keys as the round plan, such as
+                  'backend', 'driver', 'format', 'rw', 'bs', 'iodepth' and
+                  'numjobs'.
+
+        Returns:
+            The rounds of the case, or self.rounds if not in the plan.
+
+        """
+        for plan in self.round_plan:
+            if all(str(case.get(x)) == str(y) for (x, y) in plan.items()
+                   if x != 'rounds'):
+                return plan['rounds']
+
+        return self.rounds
+
     def _split_tests(self):
         """Split fio test parameters and create job list.
 
@@ -263,8 +338,13 @@ class FioTestRunner:
         - self.bs_list
         - self.iodepth_list
         - self.rw_list
+        - self.ab_variants (the A/B tests only)
         (Most often changing)
 
+        In the A/B tests, the base and test of a case run one after the other
+        and are tagged as a pair by the round. The order is swapped in the
+        even rounds, so that the drift shared by the pairs is cancelled.
+
         Args:
             None
 
@@ -283,14 +363,40 @@ class FioTestRunner:
         support_sar = True
 
         # Split parameters
-        param_tuples = itertools.product(list(range(1, self.rounds + 1)),
+        max_rounds = max([self.rounds] +
+                         [x['rounds'] for x in self.round_plan])
+        variants = self.ab_variants or [{
+            'label': None,
+            'filename': self.filename,
+            'setup': ''
+        }]
+        param_tuples = itertools.product(list(range(1, max_rounds + 1)),
                                          self.bs_list, self.iodepth_list,
-                                         self.rw_list)
+                                         self.rw_list,
+                                         list(range(len(variants))))
 
         # Generate command for all the tests
         jobnum = 0
         for param_tuple in param_tuples:
-            (rd, bs, iodepth, rw) = param_tuple
+            (rd, bs, iodepth, rw, side) = param_tuple
+
+            # Alternate the order of the base and test round by round
+            variant = variants[side if rd % 2 else -1 - side]
+            path = self.path
+            if variant['label']:
+                path += os.sep + variant['label']
+
+            # Repeat the case by the round plan
+            if rd > self._get_planned_rounds({
+                    'backend': self.backend,
+                    'driver': self.driver,
+                    'format': self.fs,
+                    'rw': rw,
+                    'bs': bs,
+                    'iodepth': iodepth,
+                    'numjobs': self.numjobs
+            }):
+                continue
 
             command = pre_command = post_command = ''
 
@@ -299,13 +405,13 @@ class FioTestRunner:
                 self.backend, self.driver, self.fs, self.ioengine, rw, bs,
                 iodepth, self.numjobs, rd,
                 time.strftime('%Y%m%d%H%M%S', time.localtime()))
-            output_path = self.path + os.sep + casename
+            output_path = path + os.sep + casename
             output = output_path + os.sep + casename + '.fiolog'
 
             # Build fio command
             command = 'fio'
             command += ' --name=%s' % casename
-            command += ' --filename=%s' % self.filename
+            command += ' --filename=%s' % variant['filename']
             command += ' --size=80G'
             command += ' --ioengine=%s' % self.ioengine
             command += ' --direct=%s' % self.direct
@@ -320,12 +426,15 @@ class FioTestRunner:
             command += ' --output=%s' % output
 
             # Reuse 'description' to integrate some metadata
-            command += ' --description="%s"' % {
+            description = {
                 'backend': self.backend,
                 'driver': self.driver,
                 'format': self.fs,
                 'round': rd
             }
+            if variant['label']:
+                description.update({'ab': variant['label'], 'pair': rd})
+            command += ' --description="%s"' % description
 
             # Technical Preview: Collect CPU idleness
             if support_idleness and not support_sar:
@@ -348,14 +457,32 @@ class FioTestRunner:
 
             # Set pre-command
             pre_command += 'mkdir -p %s; cd %s; ' % (output_path, output_path)
+            # Set up the base or test of the A/B tests
+            if variant['setup']:
+                pre_command += '%s; ' % variant['setup']
             # Drop caches
             pre_command += 'sync; echo 3 > /proc/sys/vm/drop_caches; '
 
             # Technical Preview: SAR
             if support_sar:
+                pre_command += 'cat /proc/cpuinfo > %s-cpuinfo.log; ' % (
+                    casename)
                 pre_command += 'sar -A 1 -o %s.sa &>/dev/null & ' % casename
 
+            # Sample the disk statistics every second along with the test,
+            # the report takes the samples in the measurement window only
+            pre_command += '(while true; do echo "timestamp_ms '
+            pre_command += '$(date +%s%3N)"; cat /proc/diskstats; sleep 1; '
+            pre_command += 'done) > %s-diskstats.log 2>/dev/null & ' % casename
+            pre_command += 'echo $! > %s-diskstats.pid; ' % casename
+
             # Set post-command
+            # Stop sampling the disk statistics
+            post_command += 'pushd %s &>/dev/null; ' % output_path
+            post_command += 'kill $(cat %s-diskstats.pid); ' % casename
+            post_command += 'rm -f %s-diskstats.pid; ' % casename
+            post_command += 'popd &>/dev/null; '
+
             if self.plots:
                 post_command += 'export PATH=$PATH:$PWD/utils/; '
                 post_command += 'pushd %s &>/dev/null; ' % output_path
@@ -379,14 +506,33 @@ class FioTestRunner:
             post_command += 'pushd %s &>/dev/null' % output_path
             post_command += ' && tar zcf %s.tar.gz *; ' % casename
             post_command += 'popd &>/dev/null; '
-            post_command += 'mv -t %s %s/%s.tar.gz' % (self.path, output_path,
+            post_command += 'mv -t %s %s/%s.tar.gz' % (path, output_path,
                                                        casename)
             post_command += ' && rm -r %s; ' % output_path
 
             # save the current test command into jobs
             jobnum += 1
+            case = {
+                'file': casename + '.tar.gz',
+                'casename': casename,
+                'backend': self.backend,
+                'driver': self.driver,
+                'format': self.fs,
+                'ioengine': self.ioengine,
+                'rw': rw,
+                'bs': bs,
+                'iodepth': iodepth,
+                'numjobs': self.numjobs,
+                'round': rd,
+                'runtime': self.runtime,
+                'direct': self.direct
+            }
+            if variant['label']:
+                case.update({'ab': variant['label'], 'pair': rd})
             self.jobs.append({
                 'jobnum': jobnum,
+                'case': case,
+                'path': path,
                 'command': command,
                 'pre_command': pre_command,
                 'post_command': post_command,
@@ -418,12 +564,13 @@ class FioTestRunner:
 
             if self.dryrun is False:
                 # Create log directory
-                if not os.path.exists(self.path):
-                    os.makedirs(self.path)
+                path = job.get('path', self.path)
+                if not os.path.exists(path):
+                    os.makedirs(path)
 
                 # Execute current test
                 os.system(job['pre_command'])
-                os.system(job['command'])
+                result = os.system(job['command'])
                 os.system(job['post_command'])
             else:
                 time.sleep(0.2)
@@ -433,12 +580,49 @@ class FioTestRunner:
             job['start'] = start_time
             job['stop'] = time.strftime('%Y-%m-%d %H:%M:%S', time.localtime())
 
+            # Record the test into the manifest
+            if self.dryrun is False:
+                self._write_manifest(job['case'], result, job['start'],
+                                     job['stop'], job.get('path'))
+
+        return None
+
+    def _write_manifest(self, case, result, start, stop, path=None):
+        """Write a test into the manifest.
+
+        The manifest "manifest.jsonl" is in the log path (the sub-directory
+        of the base or test in the A/B tests), each line is a
+        JSON object for a test, with the parameters of the test, the log file
+        and its size, the status and the time. The reporter resolves the
+        filters against the manifest before opening any log file.
+
+        Args:
+            case: dict, the parameters of the test with the log file name.
+            result: int, the exit status of fio.
+            start: string, the start time of the test.
+            stop: string, the stop time of the test.
+            path: string, the log path of the test, self.path by default.
+
+        """
+        path = path or self.path
+        entry = dict(case)
+        filename = path + os.sep + case['file']
+        entry['size'] = os.path.getsize(filename) if os.path.isfile(
+            filename) else None
+        entry['status'] = 'PASS' if result == 0 and entry['size'] else 'FAIL'
+        entry['start'] = start
+        entry['stop'] = stop
+
+        with open(path + os.sep + 'manifest.jsonl', 'a') as f:
+            f.write(json.dumps(entry, sort_keys=True) + '\n')
+
         return None
 
 
 def get_cli_params(backend, driver, fs, rounds, filename, runtime, ioengine,
                    direct, numjobs, rw_list, bs_list, iodepth_list, log_path,
-                   plots, dryrun):
+                   plots, dryrun, round_plan=None, ab_labels=None,
+                   ab_filenames=None, ab_base_setup=None, ab_test_setup=None):
     """Get parameters from the CLI."""
     cli_params = {}
 
@@ -472,6 +656,14 @@ def get_cli_params(backend, driver, fs, rounds, filename, runtime, ioengine,
         cli_params['plots'] = plots
     if dryrun is not None:
         cli_params['dryrun'] = dryrun
+    if round_plan is not None:
+        cli_params['round_plan'] = round_plan
+    if ab_labels is not None:
+        cli_params['ab_labels'] = ab_labels.split(',')
+    if ab_filenames is not None:
+        cli_params['ab_filenames'] = ab_filenames.split(',')
+    if ab_base_setup is not None or ab_test_setup is not None:
+        cli_params['ab_setups'] = [ab_base_setup, ab_test_setup]
 
     return cli_params
 
@@ -547,8 +739,26 @@ bw/iops/lat logs and plots in their lifetime.')
               default=None,
               help='Print the commands \
 that would be executed, but do not execute them.')
+@click.option('--round_plan',
+              type=click.Path(exists=True),
+              help='The yaml file of the rounds for each case, generated by \
+"GenerateBenchmarkReport.py --round_plan".')
+@click.option('--ab_labels',
+              help='The labels of the base and test to run the A/B tests, \
+such as \'BASE,TEST\'. The base and test of a case run by turns in each \
+round, their logs are saved into the sub-directories named by the labels.')
+@click.option('--ab_filenames',
+              help='[FIO] The disk(s) or file(s) of the base and test in the \
+A/B tests, separated by a \',\' comma.')
+@click.option('--ab_base_setup',
+              help='The command to run before each test of the base in the \
+A/B tests, such as switching the block scheduler.')
+@click.option('--ab_test_setup',
+              help='The command to run before each test of the test in the \
+A/B tests.')
 def cli(backend, driver, fs, rounds, filename, runtime, ioengine, direct,
-        numjobs, rw_list, bs_list, iodepth_list, log_path, plots, dryrun):
+        numjobs, rw_list, bs_list, iodepth_list, log_path, plots, dryrun,
+        round_plan, ab_labels, ab_filenames, ab_base_setup, ab_test_setup):
     """Command line interface.
 
     Take arguments from CLI, load default parameters from yaml file.
@@ -558,7 +768,9 @@ def cli(backend, driver, fs, rounds, filename, runtime, ioengine, direct,
     # Read user specified parameters from CLI
     cli_params = get_cli_params(backend, driver, fs, rounds, filename, runtime,
                                 ioengine, direct, numjobs, rw_list, bs_list,
-                                iodepth_list, log_path, plots, dryrun)
+                                iodepth_list, log_path, plots, dryrun,
+                                round_plan, ab_labels, ab_filenames,
+                                ab_base_setup, ab_test_setup)
 
     # Read user configuration from yaml file
     yaml_params = get_yaml_params()
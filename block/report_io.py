@@ -0,0 +1,194 @@
+"""The shared I/O helpers of the reporters.
+
+The test reporters and the benchmark reporters of block, network and
+network-np (linked to this file) read the logs and the samples, and write
+the reports by these helpers.
+
+History:
+v1.0    2026-10-18  agent         Init version.
+"""
+
+import os
+import re
+import tarfile
+import contextlib
+import pandas as pd
+
+# The columnar formats need the optional pyarrow package
+COLUMNAR_FORMATS = ('.parquet', '.feather')
+
+
+def get_members_from_tarball(tarball, suffixes, pattern=None):
+    """Get the content of the specified members from a tarball.
+
+    This function streams the tarball and reads the needed members into
+    memory, the other members are skipped without being extracted. The
+    member is named by the tarball and a suffix, such as "<casename>.tar.gz"
+    contains "<casename>.fiolog".
+
+    Args:
+        tarball: string, the path to the *.tar.gz file.
+        suffixes: tuple, the suffixes of the needed members.
+        pattern: string, optional, the regex of more suffixes to match.
+
+    Returns:
+        A dict like {suffix: content in bytes} for the members found.
+
+    Raises:
+        1. Error while reading the tarball
+
+    """
+    casename = os.path.basename(tarball).replace('.tar.gz', '')
+    names = dict([(casename + x, x) for x in suffixes])
+    if pattern:
+        regex = re.compile(re.escape(casename) + '(' + pattern + ')$')
+
+    members = {}
+    with tarfile.open(tarball, 'r:gz') as tar:
+        for member in tar:
+            if not member.isfile():
+                continue
+            name = os.path.basename(member.name)
+            if name in names:
+                members[names[name]] = tar.extractfile(member).read()
+                if len(members) == len(names) and not pattern:
+                    break
+            elif pattern and regex.match(name):
+                members[name[len(casename):]] = tar.extractfile(
+                    member).read()
+
+    return members
+
+
+def _check_columnar_support(filename):
+    """Check the optional pyarrow package for the columnar formats.
+
+    Args:
+        filename: string, the file to read from or write to.
+
+    Raises:
+        1. ImportError if pyarrow is needed but not installed
+
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in COLUMNAR_FORMATS:
+        return None
+
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            'The "%s" format of "%s" requires the optional pyarrow package, '
+            'install it by "pip3 install pyarrow" or use a ".csv" file '
+            'instead.' % (extension, filename))
+
+    return None
+
+
+def read_dataframe(filename):
+    """Read a DataFrame from a file in the format by its extension.
+
+    The ".parquet" and ".feather" files are read as the typed columnar
+    formats (pyarrow is required), others as csv.
+
+    Args:
+        filename: string, the file to read from.
+
+    Returns:
+        The DataFrame.
+
+    Raises:
+        1. ImportError if pyarrow is needed but not installed
+
+    """
+    _check_columnar_support(filename)
+
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.parquet':
+        return pd.read_parquet(filename)
+    elif extension == '.feather':
+        return pd.read_feather(filename)
+    else:
+        return pd.read_csv(filename)
+
+
+def get_typed_dataframe(df):
+    """Get the typed copy of a DataFrame for the columnar formats.
+
+    The csv reports use "NaN" and "N/A" strings for the missing values.
+    For the columnar formats, the columns with numbers only are converted
+    to numeric (with real NaN), and the other columns to strings.
+
+    Args:
+        df: DataFrame, the DataFrame to convert.
+
+    Returns:
+        The typed DataFrame.
+
+    """
+    df = df.copy()
+    for column in df.columns[df.dtypes == object]:
+        values = df[column].mask(df[column].isin(['NaN', 'N/A']))
+        numeric = pd.to_numeric(values, errors='coerce')
+        if numeric.notna().sum() == values.notna().sum():
+            df[column] = numeric
+        else:
+            df[column] = df[column].astype(str)
+
+    return df
+
+
+@contextlib.contextmanager
+def replace_atomically(filename):
+    """Write to a temporary file and rename it to the file at last.
+
+    The temporary file is in the same directory of the file, so that the
+    renaming is atomic and the readers never see a partial file.
+
+    Args:
+        filename: string, the file to write to.
+
+    Yields:
+        The name of the temporary file to write to.
+
+    """
+    temp_file = os.path.join(
+        os.path.dirname(filename),
+        '.%s.%s.tmp' % (os.path.basename(filename), os.getpid()))
+    try:
+        yield temp_file
+        os.replace(temp_file, filename)
+    finally:
+        if os.path.exists(temp_file):
+            os.unlink(temp_file)
+
+
+def write_dataframe(df, filename):
+    """Write a DataFrame to a file in the format by its extension.
+
+    The ".parquet" and ".feather" files are written in the typed columnar
+    formats (pyarrow is required), others in csv. The file is replaced
+    atomically.
+
+    Args:
+        df: DataFrame, the DataFrame to write.
+        filename: string, the file to write to.
+
+    Raises:
+        1. ImportError if pyarrow is needed but not installed
+
+    """
+    _check_columnar_support(filename)
+
+    extension = os.path.splitext(filename)[1].lower()
+    with replace_atomically(filename) as temp_file:
+        if extension == '.parquet':
+            get_typed_dataframe(df).to_parquet(temp_file)
+        elif extension == '.feather':
+            get_typed_dataframe(df).to_feather(temp_file)
+        else:
+            content = df.to_csv()
+            with open(temp_file, 'w') as f:
+                f.write(content)
+
+    return None
@@ -0,0 +1,91 @@
+"""The shared statistics helpers of the benchmark reporters.
+
+The benchmark reporters of block, network and network-np (linked to this
+file) do the statistics of the samples by these helpers, so that they get
+the same results for the same data.
+
+History:
+v1.0    2026-10-18  agent         Init version.
+"""
+
+import numpy as np
+
+
+def get_bootstrap_means(samples, seed, resamples, cache=None):
+    """Get the means of the bootstrap resamples for all the cases.
+
+    The samples of all the cases are resampled (with replacement) in one
+    batch, a case with N samples takes N of them in each resample. The picks
+    only depend on the number of samples of each case, they are kept in the
+    cache and reused for all the KPIs.
+
+    Args:
+        samples: NumPy array, the samples of the cases (NaN padded);
+        seed: int, the seed of the picks;
+        resamples: int, the number of the resamples;
+        cache: dict, optional, the picks by the seed, updated in place;
+
+    Returns:
+        The NumPy array of the means, a row of the resamples for each case.
+
+    """
+    if cache is None:
+        cache = {}
+
+    (cases, width) = samples.shape
+    count = (~np.isnan(samples)).sum(axis=1)
+    key = (width, resamples, count.tobytes())
+    if cache.get(seed, (None, ))[0] != key:
+        rng = np.random.default_rng(seed)
+        shape = (cases, resamples, width)
+        count_3d = count[:, np.newaxis, np.newaxis]
+        picks = (rng.random(shape, dtype=np.float32) *
+                 count_3d).astype(np.intp)
+
+        # The unused picks point to the zero padded after each case
+        picks = np.where(np.arange(width) < count_3d, picks, width)
+        picks += (np.arange(cases) * (width + 1))[:, np.newaxis, np.newaxis]
+        cache[seed] = (key, picks)
+
+    padded = np.concatenate([samples, np.zeros((cases, 1))], axis=1)
+    picks = cache[seed][1]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.take(padded.ravel(), picks).sum(axis=2) / count[:, None]
+
+
+def get_adjusted_significance(significance, method='bh'):
+    """Get the Significance adjusted for the multiple testing.
+
+    The p-values of all the tests are adjusted at once by the specified
+    correction:
+    'bh': the Benjamini-Hochberg procedure, which controls the false
+          discovery rate (the expected fraction of the false discoveries);
+    'holm': the Holm-Bonferroni method, which controls the family-wise error
+            rate (the chance of any false discovery);
+
+    Args:
+        significance: array like, the Significance of all the tests, NaN for
+                      the failed tests (not counted);
+        method: string, the correction, 'bh' by default;
+
+    Returns:
+        The NumPy array of the adjusted Significance, in the same shape.
+
+    """
+    significance = np.asarray(significance, dtype=float)
+    pvalue = 1 - significance.ravel()
+    valid = np.flatnonzero(~np.isnan(pvalue))
+    order = valid[np.argsort(pvalue[valid], kind='stable')]
+    count = len(order)
+    rank = np.arange(1, count + 1)
+
+    if method == 'holm':
+        adjusted = np.maximum.accumulate((count - rank + 1) * pvalue[order])
+    else:
+        adjusted = np.minimum.accumulate(
+            (count / rank * pvalue[order])[::-1])[::-1]
+
+    result = np.full(len(pvalue), np.nan)
+    result[order] = np.minimum(adjusted, 1)
+
+    return (1 - result).reshape(significance.shape)
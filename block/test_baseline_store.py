@@ -0,0 +1,56 @@
+"""The checks of the change-point detection of ManageBaselineStore.py.
+
+Run by "python3 -m pytest" in this directory.
+"""
+
+import numpy as np
+
+from ManageBaselineStore import FioBaselineStore
+
+
+def _get_store(tmp_path):
+    return FioBaselineStore(str(tmp_path / 'baseline.db'), ['Backend'])
+
+
+def test_find_change_point_of_shift(tmp_path):
+    """The series shifts from the 7th point on."""
+    store = _get_store(tmp_path)
+    series = np.array([0.0] * 6 + [10.0] * 6)
+
+    (position, confidence) = store._find_change_point(
+        series, np.random.default_rng(0))
+
+    assert position == 6
+    assert confidence > 0.99
+
+
+def test_find_change_point_without_shift(tmp_path):
+    """The alternating series has no change point."""
+    store = _get_store(tmp_path)
+    series = np.array([0.0, 10.0] * 6)
+
+    (position, confidence) = store._find_change_point(
+        series, np.random.default_rng(0))
+
+    assert confidence < 0.5
+
+
+def test_find_change_point_is_deterministic(tmp_path):
+    """The same seed gives the same confidence."""
+    store = _get_store(tmp_path)
+    series = np.array([1.0, 2.0, 1.5, 1.2, 3.0, 3.5, 2.8, 3.1])
+
+    first = store._find_change_point(series, np.random.default_rng(1))
+    second = store._find_change_point(series, np.random.default_rng(1))
+
+    assert first == second
+
+
+def test_find_change_points_of_two_shifts(tmp_path):
+    """The binary segmentation finds both of the shifts."""
+    store = _get_store(tmp_path)
+    series = np.array([0.0] * 6 + [10.0] * 6 + [20.0] * 6)
+
+    points = store._find_change_points(series, np.random.default_rng(0))
+
+    assert [x[0] for x in points] == [6, 12]
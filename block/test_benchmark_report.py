@@ -0,0 +1,70 @@
+"""The checks of the paired statistics of GenerateBenchmarkReport.py.
+
+Run by "python3 -m pytest" in this directory.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from GenerateBenchmarkReport import FioBenchmarkReporter
+
+
+def _get_samples(rounds, iops):
+    """Get the samples of one case in the rounds."""
+    return pd.DataFrame({
+        'Backend': 'NVMe',
+        'Driver': 'nvme',
+        'Format': 'raw',
+        'RW': 'randread',
+        'BS': '4k',
+        'IODepth': 1,
+        'Numjobs': 1,
+        'Round': rounds,
+        'IOPS': iops
+    })
+
+
+def _get_reporter(df_base, df_test):
+    reporter = FioBenchmarkReporter()
+    reporter.df_base = df_base
+    reporter.df_test = df_test
+    keys = [x['source_label'] for x in reporter.keys]
+    index = pd.MultiIndex.from_frame(df_base[keys].drop_duplicates())
+    return (reporter, index)
+
+
+def test_paired_stats_of_differences():
+    """The statistics are the ones of the differences (test - base)."""
+    df_base = _get_samples([1, 2, 3], [100.0, 200.0, 300.0])
+    df_test = _get_samples([3, 1, 2], [303.0, 101.0, 202.0])
+    (reporter, index) = _get_reporter(df_base, df_test)
+
+    stats = reporter._get_paired_stats(index, ['IOPS'])
+
+    assert stats['mean']['IOPS'].iloc[0] == pytest.approx(2.0)
+    assert stats['std']['IOPS'].iloc[0] == pytest.approx(1.0)
+    assert stats['count']['IOPS'].iloc[0] == 3
+
+
+def test_paired_stats_drop_unpaired_rounds():
+    """The rounds not in both of the samples are dropped."""
+    df_base = _get_samples([1, 2, 3], [100.0, 200.0, 300.0])
+    df_test = _get_samples([1, 2, 4], [110.0, 220.0, 400.0])
+    (reporter, index) = _get_reporter(df_base, df_test)
+
+    stats = reporter._get_paired_stats(index, ['IOPS'])
+
+    assert stats['count']['IOPS'].iloc[0] == 2
+    assert stats['mean']['IOPS'].iloc[0] == pytest.approx(15.0)
+    assert np.array_equal(np.sort(stats['samples']['IOPS'][0]), [10.0, 20.0])
+
+
+def test_paired_stats_reject_duplicated_rounds():
+    """A Round can only be paired once."""
+    df_base = _get_samples([1, 1], [100.0, 200.0])
+    df_test = _get_samples([1, 2], [110.0, 220.0])
+    (reporter, index) = _get_reporter(df_base, df_test)
+
+    with pytest.raises(pd.errors.MergeError):
+        reporter._get_paired_stats(index, ['IOPS'])
@@ -0,0 +1,74 @@
+"""The checks of the shared statistics helpers in report_stats.py.
+
+Run by "python3 -m pytest" in this directory.
+"""
+
+import numpy as np
+
+from report_stats import get_adjusted_significance
+from report_stats import get_bootstrap_means
+
+
+def test_bootstrap_means_of_constant_samples():
+    """The resamples of a constant case have the same mean."""
+    samples = np.array([[5.0, 5.0, 5.0]])
+
+    means = get_bootstrap_means(samples, 0, 100)
+
+    assert means.shape == (1, 100)
+    assert np.all(means == 5.0)
+
+
+def test_bootstrap_means_skip_padding():
+    """A case with N samples only picks from its N samples."""
+    samples = np.array([[1.0, 2.0, 3.0], [4.0, 6.0, np.nan]])
+
+    means = get_bootstrap_means(samples, 0, 1000)
+
+    assert not np.isnan(means).any()
+    assert means[0].min() >= 1.0 and means[0].max() <= 3.0
+    assert means[1].min() >= 4.0 and means[1].max() <= 6.0
+    assert abs(means[1].mean() - 5.0) < 0.1
+
+
+def test_bootstrap_means_reuse_picks():
+    """The picks are cached by the seed and give the same means."""
+    samples = np.array([[1.0, 2.0, 3.0, 4.0]])
+    cache = {}
+
+    first = get_bootstrap_means(samples, 0, 50, cache)
+    second = get_bootstrap_means(samples, 0, 50, cache)
+    third = get_bootstrap_means(samples, 0, 50)
+
+    assert list(cache) == [0]
+    assert np.array_equal(first, second)
+    assert np.array_equal(first, third)
+
+
+def test_adjusted_significance_by_bh():
+    """The Benjamini-Hochberg correction, NaN is not counted."""
+    significance = [0.99, 0.96, 0.5, np.nan]
+
+    adjusted = get_adjusted_significance(significance, 'bh')
+
+    assert np.allclose(adjusted, [0.97, 0.94, 0.5, np.nan], equal_nan=True)
+
+
+def test_adjusted_significance_by_holm():
+    """The Holm-Bonferroni correction, NaN is not counted."""
+    significance = [0.99, 0.96, 0.5, np.nan]
+
+    adjusted = get_adjusted_significance(significance, 'holm')
+
+    assert np.allclose(adjusted, [0.97, 0.92, 0.5, np.nan], equal_nan=True)
+
+
+def test_adjusted_significance_keeps_shape():
+    """The Significance of a table is adjusted at once."""
+    significance = np.array([[0.99, 0.5], [0.96, np.nan]])
+
+    adjusted = get_adjusted_significance(significance)
+
+    assert adjusted.shape == (2, 2)
+    assert np.allclose(adjusted, [[0.97, 0.5], [0.94, np.nan]],
+                       equal_nan=True)
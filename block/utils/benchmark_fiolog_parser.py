@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+"""Benchmark the fiolog parser of GenerateTestReport.py.
+
+Compare the time and peak memory of getting the raw data from fio log files
+by the legacy way (readlines, regex scanning and a temporary json file) and
+by the current FioTestReporter._get_raw_data_from_fio_log (mmap and decoding
+the json block in place).
+
+Usage: benchmark_fiolog_parser.py [-n ROUNDS] [FIOLOG...]
+Note: the fio log files in "block/samples" are used by default.
+
+History:
+v1.0    2026-10-18  agent         Init version.
+"""
+
+import os
+import re
+import sys
+import json
+import glob
+import time
+import tracemalloc
+
+BLOCK_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BLOCK_PATH)
+
+from GenerateTestReport import FioTestReporter  # noqa: E402
+
+
+def legacy_get_raw_data_from_fio_log(data_file):
+    """Get the raw data in the way before GenerateTestReport.py v2.11."""
+    with open(data_file, 'r') as f:
+        file_content = f.readlines()
+
+    begin = end = num = 0
+    while num < len(file_content):
+        if re.search(r'^{', file_content[num]):
+            begin = num
+            break
+        num += 1
+    while num < len(file_content):
+        if re.search(r'^}', file_content[num]):
+            end = num
+            break
+        num += 1
+
+    with open(data_file + '.json', 'w') as json_file:
+        json_file.writelines(file_content[begin:end + 1])
+    with open(data_file + '.json', 'r') as json_file:
+        raw_data = json.load(json_file)
+
+    os.unlink(data_file + '.json')
+    return (0, raw_data)
+
+
+def measure(parser, files, rounds):
+    """Measure the time per file (ms) and the peak memory (KiB)."""
+    start = time.time()
+    for _ in range(rounds):
+        for data_file in files:
+            parser(data_file)
+    elapsed = (time.time() - start) * 1000.0 / rounds / len(files)
+
+    tracemalloc.start()
+    for data_file in files:
+        parser(data_file)
+    peak = tracemalloc.get_traced_memory()[1] / 1024.0
+    tracemalloc.stop()
+
+    return (elapsed, peak)
+
+
+def main():
+    """Run the benchmark."""
+    args = sys.argv[1:]
+    rounds = 100
+    if len(args) >= 2 and args[0] == '-n':
+        rounds = int(args[1])
+        args = args[2:]
+
+    files = args or sorted(
+        glob.glob(os.path.join(BLOCK_PATH, 'samples', '*.fiolog')))
+    if not files:
+        print('[ERROR] No fio log files found.')
+        exit(1)
+
+    # Make sure both parsers get the same raw data
+    reporter = FioTestReporter()
+    for data_file in files:
+        if legacy_get_raw_data_from_fio_log(data_file)[1] != \
+                reporter._get_raw_data_from_fio_log(data_file)[1]:
+            print('[ERROR] Different raw data from file: %s' % data_file)
+            exit(1)
+
+    print('Files  : %s' % len(files))
+    print('Rounds : %s' % rounds)
+    print('%-8s %14s %14s' % ('Parser', 'Time/File(ms)', 'PeakMem(KiB)'))
+    for (name, parser) in (('legacy', legacy_get_raw_data_from_fio_log),
+                           ('current', reporter._get_raw_data_from_fio_log)):
+        (elapsed, peak) = measure(parser, files, rounds)
+        print('%-8s %14.3f %14.1f' % (name, elapsed, peak))
+
+    exit(0)
+
+
+if __name__ == '__main__':
+    main()
@@ -10,6 +10,9 @@ v0.3    2020-07-20  charles.shih  Adapt the script for virt_netperf_test.
 v0.4    2020-07-21  charles.shih  Add KPI TransRate.
 v0.5    2020-07-21  charles.shih  Modify KPI Throughput, MSize, RRSize.
 v0.6    2020-07-21  charles.shih  Adjust MSize, RRSize, add KPI Latency.
+v0.7    2026-10-18  agent         Read netperf logs from tarballs in memory.
+v0.8    2026-10-18  agent         Support Parquet and Feather reports.
+v0.9    2026-10-18  agent         Extract the KPIs while streaming the logs.
 """
 
 import json
@@ -17,6 +20,9 @@ import os
 import click
 import pandas as pd
 
+from report_io import get_members_from_tarball
+from report_io import write_dataframe
+
 
 class NetperfTestReporter():
     """Netperf Test Reporter.
@@ -27,23 +33,21 @@ class NetperfTestReporter():
     3. It generates the report DataFrame and dump to a CSV file;
 
     Attributes:
-        raw_data_list: the list to store raw data.
         perf_kpi_list: the list to store performance KPI tuples.
         df_report: a DataFrame to store the test report.
 
     """
 
-    # The list of raw data, the item is loaded from netperf log file.
-    # Each item is a full data source (raw data) in Python dict format.
-    raw_data_list = []
-
-    # The list of performance KPIs, which are extracted from the raw data.
-    # Each item represents a single netperf test results in Python dict format.
-    perf_kpi_list = []
+    def __init__(self):
+        """Initialize the state of the reporter."""
+        # The list of performance KPIs, which are extracted from the raw
+        # data. Each item represents a single netperf test results in Python
+        # dict format.
+        self.perf_kpi_list = []
 
-    # The DataFrame to store performance KPIs for reporting, which is powered
-    # by Pandas.
-    df_report = None
+        # The DataFrame to store performance KPIs for reporting, which is
+        # powered by Pandas.
+        self.df_report = None
 
     def _byteify(self, inputs):
         """Convert unicode to utf-8 string.
@@ -96,25 +100,95 @@ class NetperfTestReporter():
             return (1, None)
 
         try:
-            with open(data_file, 'r') as f:
-                json_data = json.load(f)
-                if '' == b'':
-                    # Convert to byteify for Python 2
-                    raw_data = self._byteify(json_data)
-                else:
-                    # Keep strings for Python 3
-                    raw_data = json_data
+            with open(data_file, 'rb') as f:
+                content = f.read()
         except Exception as err:
-            print('[ERROR] Error while handling the new json file: %s' % err)
+            print('[ERROR] Error while reading the netperf log: %s' % err)
+            return (1, None)
+
+        return self._get_raw_data_from_netperf_content(content)
+
+    def _get_raw_data_from_netperf_content(self, content):
+        """Get the raw data from the content of a netperf log.
+
+        Args:
+            content: bytes, the content of the netperf log.
+
+        Returns:
+            This function returns a tuple like (result, raw_data):
+            result:
+                0: Passed
+                1: Failed
+            raw_data:
+                The raw data in Python dict format.
+
+        Raises:
+            1. Error while handling the json content
+
+        """
+        try:
+            json_data = json.loads(content.decode('utf-8'))
+            if '' == b'':
+                # Convert to byteify for Python 2
+                raw_data = self._byteify(json_data)
+            else:
+                # Keep strings for Python 3
+                raw_data = json_data
+        except Exception as err:
+            print('[ERROR] Error while handling the json content: %s' % err)
             return (1, None)
 
         return (0, raw_data)
 
-    def load_raw_data_from_netperf_logs(self, params={}):
-        """Load raw data from netperf log files.
+    def _iter_raw_data_from_netperf_logs(self, result_path):
+        """Iterate the raw data from netperf log files.
+
+        This generator loads the netperf log files one by one, so that the
+        raw data can be dropped once it has been handled.
+
+        Args:
+            result_path: string, the path where netperf log files located.
+
+        Yields:
+            The raw data in Python dict format.
+
+        """
+        for fname in os.listdir(result_path):
+            filename = result_path + os.sep + fname
+
+            # Tarball support
+            if filename.endswith('.tar.gz') and os.path.isfile(filename):
+                try:
+                    content = get_members_from_tarball(
+                        filename, ('.nplog.json', )).get('.nplog.json')
+                except Exception as err:
+                    print('[ERROR] Error while handling the tarball: %s' %
+                          err)
+                    continue
+                if content is None:
+                    print('[ERROR] Cannot found netperf log in tarball: %s' %
+                          filename)
+                    continue
+                (result,
+                 raw_data) = self._get_raw_data_from_netperf_content(content)
+                if result == 0:
+                    yield raw_data
+                continue
+
+            # Load raw data
+            if filename.endswith('.nplog.json') and os.path.isfile(filename):
+                (result,
+                 raw_data) = self._get_raw_data_from_netperf_log(filename)
+                if result == 0:
+                    yield raw_data
+
+    def load_perf_kpis_from_netperf_logs(self, params={}):
+        """Load performance KPIs from netperf log files.
 
-        This function loads raw data from a sort of netperf log files and stores
-        the raw data (in Python dict format) into self.raw_data_list.
+        This function loads the netperf log files one by one and extracts the
+        performance KPIs, only the KPIs are stored into self.perf_kpi_list.
+        The raw data are dropped after extracting, so the peak memory scales
+        with the number of KPIs instead of the size of the raw data.
 
         Args:
             params: dict
@@ -125,7 +199,7 @@ class NetperfTestReporter():
             1: Failed
 
         Updates:
-            self.raw_data_list: store all the raw data;
+            self.perf_kpi_list: store the performance KPI tuples.
 
         """
         # Parse required params
@@ -133,27 +207,14 @@ class NetperfTestReporter():
             print('[ERROR] Missing required params: params[result_path]')
             return 1
 
-        # Load raw data from files
-        for fname in os.listdir(params['result_path']):
-            filename = params['result_path'] + os.sep + fname
-
-            # Tarball support
-            tmpfolder = '/tmp/netperf-report.tmp'
-            if filename.endswith('.tar.gz') and os.path.isfile(filename):
-                os.system('mkdir -p {0}'.format(tmpfolder))
-                os.system('tar xf {1} -C {0}'.format(tmpfolder, filename))
-                filename = tmpfolder + os.sep + fname.replace(
-                    '.tar.gz', '.nplog.json')
-
-            # Load raw data
-            if filename.endswith('.nplog.json') and os.path.isfile(filename):
-                (result,
-                 raw_data) = self._get_raw_data_from_netperf_log(filename)
-                if result == 0:
-                    self.raw_data_list.append(raw_data)
-
-            # Tarball support, cleanup
-            os.system('[ -e {0} ] && rm -rf {0}'.format(tmpfolder))
+        # Extract the performance KPIs and drop the raw data
+        for raw_data in self._iter_raw_data_from_netperf_logs(
+                params['result_path']):
+            (result, perf_kpi) = self._get_kpis_from_raw_data(raw_data)
+            if result == 0:
+                self.perf_kpi_list.append(perf_kpi)
+            else:
+                return 1
 
         return 0
 
@@ -226,37 +287,6 @@ class NetperfTestReporter():
 
         return (0, perf_kpi)
 
-    def calculate_performance_kpis(self, params={}):
-        """Calculate performance KPIs.
-
-        This function calculates performance KPIs from self.raw_data_list and
-        stores the performance KPI tuples into self.perf_kpi_list.
-
-        As data source, the following attributes should be ready to use:
-        1. self.raw_data_list: the list of raw data (Python dict format)
-
-        Args:
-            params: dict
-                None
-
-        Returns:
-            0: Passed
-            1: Failed
-
-        Updates:
-            self.perf_kpi_list: store the performance KPI tuples.
-
-        """
-        # Calculate performance KPIs
-        for raw_data in self.raw_data_list:
-            (result, perf_kpi) = self._get_kpis_from_raw_data(raw_data)
-            if result == 0:
-                self.perf_kpi_list.append(perf_kpi)
-            else:
-                return 1
-
-        return 0
-
     def _create_report_dataframe(self):
         """Create report DataFrame.
 
@@ -351,7 +381,7 @@ class NetperfTestReporter():
             1: Failed
 
         Raises:
-            1. Error while dumping to csv file
+            1. Error while dumping to file
 
         """
         # Parse required params
@@ -361,15 +391,13 @@ class NetperfTestReporter():
 
         # Write the report to the csv file
         try:
-            print('[NOTE] Dumping data into csv file "%s"...' %
+            print('[NOTE] Dumping data into file "%s"...' %
                   params['report_csv'])
-            content = self.df_report.to_csv()
-            with open(params['report_csv'], 'w') as f:
-                f.write(content)
+            write_dataframe(self.df_report, params['report_csv'])
             print('[NOTE] Finished!')
 
         except Exception as err:
-            print('[ERROR] Error while dumping to csv file: %s' % err)
+            print('[ERROR] Error while dumping to file: %s' % err)
             return 1
 
         return 0
@@ -379,17 +407,12 @@ def generate_netperf_test_report(result_path, report_csv):
     """Generate netperf test report."""
     netperfreporter = NetperfTestReporter()
 
-    # Load raw data from *.netperf files
-    return_value = netperfreporter.load_raw_data_from_netperf_logs(
+    # Load performance KPIs from *.netperf files
+    return_value = netperfreporter.load_perf_kpis_from_netperf_logs(
         {'result_path': result_path})
     if return_value:
         exit(1)
 
-    # Caclulate performance KPIs for each test
-    return_value = netperfreporter.calculate_performance_kpis()
-    if return_value:
-        exit(1)
-
     # Convert the KPIs into Dataframe
     netperfreporter.generate_report_dataframe()
 
@@ -9,6 +9,12 @@ v0.4    2020-07-13  charles.shih  Support renaming KEY columns
 v0.5    2020-07-13  charles.shih  Support customizing KPI columns
 v0.6    2020-07-13  charles.shih  Support appending units to the columns
 v0.7    2020-07-21  charles.shih  Update the logic of getting conclusion
+v0.8    2026-10-18  agent         Support Parquet and Feather samples/reports
+v0.9    2026-10-18  agent         Support Welch's t-test, Mann-Whitney U test
+                                  and bootstrap confidence intervals
+v0.10   2026-10-18  agent         Support the paired t-test by the Round
+v0.11   2026-10-18  agent         Adjust the Significance for the multiple
+                                  testing of the report
 """
 
 import os
@@ -18,6 +24,12 @@ import pandas as pd
 import numpy as np
 from scipy.stats import ttest_rel
 from scipy.stats import ttest_ind
+from scipy.stats import mannwhitneyu
+
+from report_io import read_dataframe
+from report_io import write_dataframe
+from report_stats import get_adjusted_significance
+from report_stats import get_bootstrap_means
 
 
 class FlentBenchmarkReporter():
@@ -35,8 +47,23 @@ class FlentBenchmarkReporter():
         config: the user config defined in the yaml file.
         keys: the user config data for the KEYs.
         kpis: the user config data for the KPIs.
+        tests: the tests to get the Significance.
+        bootstrap_resamples: the number of the bootstrap resamples.
+        corrections: the corrections for the multiple testing.
+        paired: whether to pair the base and test samples by the Round.
+        correction: the correction for the multiple testing, None for not
+                    adjusting the Significance.
 
     """
+
+    # The tests to get the Significance and the bootstrap resamples
+    tests = ['ttest', 'welch', 'mannwhitneyu', 'bootstrap']
+    bootstrap_resamples = 2000
+
+    # The corrections for the multiple testing, Benjamini-Hochberg (the
+    # false discovery rate) and Holm-Bonferroni (the family-wise error rate)
+    corrections = ['bh', 'holm']
+
     def __init__(self):
         """Load config and init benchmark reporter."""
         # Load config
@@ -62,10 +89,13 @@ class FlentBenchmarkReporter():
 
         self.kpis = []
         for kpi_attr in self.config['kpis']:
-            kpi = {}
+            kpi = {'test': 'ttest', 'confidence_interval': False}
             kpi.update(self.config['kpi_defaults'])
             kpi['target_unit'] = None
             kpi.update(kpi_attr)
+            if kpi['test'] not in self.tests:
+                raise ValueError('Unknown test "%s" for KPI "%s".' %
+                                 (kpi['test'], kpi['target_label']))
             self.kpis.append(kpi)
 
         # The DataFrame to store base samples and test samples
@@ -74,6 +104,15 @@ class FlentBenchmarkReporter():
         # The DataFrame to store the benchmark report
         self.df_report = None
 
+        # The picks of the bootstrap resamples, by the seed
+        self.bootstrap_picks = {}
+
+        # The paired t-test of the samples
+        self.paired = False
+
+        # The correction for the multiple testing of the report
+        self.correction = None
+
     def load_samples(self, params={}):
         """Load the base and test samples.
 
@@ -93,7 +132,7 @@ class FlentBenchmarkReporter():
             self.df_test: store the test samples;
 
         Raises:
-            1. Error while reading from csv file
+            1. Error while reading from file
 
         """
         # Parse required params
@@ -107,17 +146,17 @@ class FlentBenchmarkReporter():
 
         try:
             # Load base samples from CSV file
-            print('[NOTE] Reading base samples from csv file "%s"...' %
+            print('[NOTE] Reading base samples from file "%s"...' %
                   params['base_csv'])
-            self.df_base = pd.read_csv(params['base_csv'])
+            self.df_base = read_dataframe(params['base_csv'])
 
             # Load test samples from CSV file
-            print('[NOTE] Reading test samples from csv file "%s"...' %
+            print('[NOTE] Reading test samples from file "%s"...' %
                   params['test_csv'])
-            self.df_test = pd.read_csv(params['test_csv'])
+            self.df_test = read_dataframe(params['test_csv'])
 
         except Exception as err:
-            print('[ERROR] Error while reading from csv file: %s' % err)
+            print('[ERROR] Error while reading from file: %s' % err)
             return 1
 
         return 0
@@ -141,25 +180,36 @@ class FlentBenchmarkReporter():
         self.df_report = self.df_report.sort_values(by=target_keys)
         self.df_report = self.df_report.reset_index().drop(columns=['index'])
 
-        # Add the expanded KPI columns into report DataFrame
+        # Add the expanded KPI columns into report DataFrame at once
+        columns = []
         for kpi in self.kpis:
             expansion = [
                 'BASE-AVG', 'BASE-%SD', 'TEST-AVG', 'TEST-%SD', '%DIFF',
                 'SIGN', 'CONCLUSION'
             ]
-            for suffix in expansion:
-                self.df_report.insert(len(self.df_report.columns),
-                                      kpi['target_label'] + '-' + suffix, 0)
+            if self.correction:
+                expansion[6:6] = ['ADJ-SIGN']
+                expansion.append('ADJ-CONCLUSION')
+            if kpi['confidence_interval']:
+                expansion[5:5] = ['%DIFF-CI-LOW', '%DIFF-CI-HIGH']
+            columns += [kpi['target_label'] + '-' + x for x in expansion]
+        self.df_report = pd.concat([
+            self.df_report,
+            pd.DataFrame(dict.fromkeys(columns, 0), index=self.df_report.index)
+        ], axis=1)
 
         return None
 
-    def _get_significance(self, array1, array2, paired=False):
-        """Get the significance of t-test.
+    def _get_significance(self, array1, array2, paired=False, test='ttest'):
+        """Get the significance of the specified test.
 
         Args:
-            array1: array like, the samples to do t-test;
-            array2: array like, the samples to do t-test;
+            array1: array like, the samples to do test;
+            array2: array like, the samples to do test;
             paired: flag, paired or unpaired t-test;
+            test: string, the unpaired test, 'ttest' (Student's t-test),
+                  'welch' (Welch's t-test) or 'mannwhitneyu' (Mann-Whitney
+                  U test);
 
         Returns:
             The Significance which value between 0 and 1. When the calculation
@@ -168,6 +218,12 @@ class FlentBenchmarkReporter():
         """
         if paired:
             (statistic, pvalue) = ttest_rel(array1, array2)
+        elif test == 'welch':
+            (statistic, pvalue) = ttest_ind(array1, array2, equal_var=False)
+        elif test == 'mannwhitneyu':
+            (statistic, pvalue) = mannwhitneyu(array1,
+                                               array2,
+                                               alternative='two-sided')
         else:
             (statistic, pvalue) = ttest_ind(array1, array2)
 
@@ -257,11 +313,91 @@ class FlentBenchmarkReporter():
             else:
                 return 'Minor Regression'
 
-    def _calculate_kpi_and_fill_series(self, series, df_base, df_test, label,
-                                       source_label, higher_is_better,
-                                       max_percent_dev, regression_threshold,
-                                       confidence_threshold):
-        """Calculate the statistics and fill the Series for specified KPI."""
+    def _get_grouped_samples(self, df, column):
+        """Get the samples of each case in the report DataFrame.
+
+        Returns:
+            The NumPy array, a row of the samples (padded by NaN) for each
+            case of the report DataFrame.
+
+        """
+        target_keys = [x['target_label'] for x in self.keys]
+        index = pd.MultiIndex.from_frame(self.df_report[target_keys])
+        by = [df[x['source_label']] for x in self.keys]
+        codes = index.get_indexer(pd.MultiIndex.from_arrays(by))
+        position = df.groupby(by).cumcount().fillna(-1).values.astype(int)
+        valid = (codes >= 0) & (position >= 0)
+        width = position[valid].max() + 1 if valid.any() else 1
+
+        samples = np.full((len(index), width), np.nan)
+        samples[codes[valid], position[valid]] = pd.to_numeric(
+            df[column], errors='coerce')[valid]
+
+        return samples
+
+    def _get_bootstrap_results(self, kpi):
+        """Get the bootstrap results of a KPI for all the cases.
+
+        The %DIFF of the bootstrap resamples are got in one batch for all the
+        cases in the report DataFrame.
+
+        Args:
+            kpi: dict, the user config data of the KPI;
+
+        Returns:
+            A dict of NumPy arrays, a value for each case:
+            'SIGN': the Significance of the bootstrap test, the p-value is
+                    twice the fraction of the resamples with %DIFF on the
+                    other side of zero;
+            '%DIFF-CI-LOW', '%DIFF-CI-HIGH': the confidence interval of
+                    %DIFF at the confidence_threshold;
+
+        """
+        # The fixed seeds for the same conclusions of the same data
+        base_mean = get_bootstrap_means(
+            self._get_grouped_samples(self.df_base, kpi['source_label']), 0,
+            self.bootstrap_resamples, self.bootstrap_picks)
+        test_mean = get_bootstrap_means(
+            self._get_grouped_samples(self.df_test, kpi['source_label']), 1,
+            self.bootstrap_resamples, self.bootstrap_picks)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            pct_diffs = (test_mean - base_mean) / base_mean * 100
+
+        pvalue = 2 * np.minimum(np.mean(pct_diffs <= 0, axis=1),
+                                np.mean(pct_diffs >= 0, axis=1))
+        significance = 1 - np.minimum(pvalue, 1)
+        significance[np.isnan(pct_diffs).any(axis=1)] = np.nan
+
+        alpha = 1 - kpi['confidence_threshold']
+        (low, high) = np.percentile(
+            pct_diffs, [alpha / 2 * 100, (1 - alpha / 2) * 100], axis=1)
+
+        return {
+            'SIGN': significance,
+            '%DIFF-CI-LOW': low,
+            '%DIFF-CI-HIGH': high
+        }
+
+    def _calculate_kpi_and_fill_series(self,
+                                       series,
+                                       df_base,
+                                       df_test,
+                                       label,
+                                       source_label,
+                                       higher_is_better,
+                                       max_percent_dev,
+                                       regression_threshold,
+                                       confidence_threshold,
+                                       test='ttest',
+                                       bootstrap=None):
+        """Calculate the statistics and fill the Series for specified KPI.
+
+        The bootstrap is a dict of the bootstrap results of the case, which
+        is required by the 'bootstrap' test and the confidence interval. With
+        self.paired, the base and test samples are paired by the Round and
+        the Significance is got by the paired t-test instead.
+
+        """
         # Calculate and fill the average and %SD of the base and test samples
         series[label + '-BASE-AVG'] = df_base[source_label].mean()
         series[label + '-BASE-%SD'] = df_base[source_label].std(
@@ -275,9 +411,27 @@ class FlentBenchmarkReporter():
             series[label + '-TEST-AVG'] -
             series[label + '-BASE-AVG']) / series[label + '-BASE-AVG'] * 100
 
+        # Calculate and fill the confidence interval of %DIFF
+        if label + '-%DIFF-CI-LOW' in series:
+            series[label + '-%DIFF-CI-LOW'] = bootstrap['%DIFF-CI-LOW']
+            series[label + '-%DIFF-CI-HIGH'] = bootstrap['%DIFF-CI-HIGH']
+
         # Calculate and fill the Significance
-        series[label + '-SIGN'] = self._get_significance(
-            df_base[source_label], df_test[source_label])
+        if self.paired:
+            pairs = df_base[['Round', source_label]].merge(
+                df_test[['Round', source_label]],
+                on='Round',
+                suffixes=('-BASE', '-TEST'),
+                validate='one_to_one')
+            series[label + '-SIGN'] = self._get_significance(
+                pairs[source_label + '-BASE'],
+                pairs[source_label + '-TEST'],
+                paired=True)
+        elif test == 'bootstrap':
+            series[label + '-SIGN'] = bootstrap['SIGN']
+        else:
+            series[label + '-SIGN'] = self._get_significance(
+                df_base[source_label], df_test[source_label], test=test)
 
         # Calculate and fill the Conclusion
         series[label + '-CONCLUSION'] = self._get_conclusion(
@@ -290,6 +444,13 @@ class FlentBenchmarkReporter():
 
     def _complete_report_dataframe(self):
         """Complete the report DataFrame."""
+        # Get the bootstrap results of all the cases at once if needed
+        bootstraps = {}
+        for kpi in self.kpis:
+            if kpi['test'] == 'bootstrap' or kpi['confidence_interval']:
+                bootstraps[kpi['target_label']] = self._get_bootstrap_results(
+                    kpi)
+
         # Go through each series from the report DataFrame, get correlated
         # data from the test and base DataFrames, calculate the KPIs and
         # fill the results into report DataFrame.
@@ -310,11 +471,15 @@ class FlentBenchmarkReporter():
 
             # Calculate KPIs
             for kpi in self.kpis:
+                bootstrap = bootstraps.get(kpi['target_label'])
+                if bootstrap is not None:
+                    bootstrap = dict([(x, y[index])
+                                      for (x, y) in bootstrap.items()])
                 self._calculate_kpi_and_fill_series(
                     series, sub_base, sub_test, kpi['target_label'],
                     kpi['source_label'], kpi['higher_is_better'],
                     kpi['max_percent_dev'], kpi['regression_threshold'],
-                    kpi['confidence_threshold'])
+                    kpi['confidence_threshold'], kpi['test'], bootstrap)
 
             # Show current series
             print(series)
@@ -322,6 +487,28 @@ class FlentBenchmarkReporter():
             # Save current series
             self.df_report.iloc[index] = series
 
+        # Adjust the Significance of all the KPIs and cases at once
+        if self.correction:
+            labels = [x['target_label'] for x in self.kpis]
+            significance = self.df_report[[x + '-SIGN' for x in labels]].apply(
+                pd.to_numeric, errors='coerce').values
+            adjusted = get_adjusted_significance(significance,
+                                                 self.correction)
+            for (i, kpi) in enumerate(self.kpis):
+                label = kpi['target_label']
+                rows = zip(self.df_report[label + '-BASE-%SD'],
+                           self.df_report[label + '-TEST-%SD'],
+                           self.df_report[label + '-%DIFF'], adjusted[:, i])
+                self.df_report[label + '-ADJ-SIGN'] = adjusted[:, i]
+                self.df_report[label + '-ADJ-CONCLUSION'] = [
+                    self._get_conclusion(base_pct_dev, test_pct_dev, pct_diff,
+                                         sign, kpi['higher_is_better'],
+                                         kpi['max_percent_dev'],
+                                         kpi['regression_threshold'],
+                                         kpi['confidence_threshold'])
+                    for (base_pct_dev, test_pct_dev, pct_diff, sign) in rows
+                ]
+
         return None
 
     def _format_report_dataframe(self):
@@ -357,10 +544,43 @@ class FlentBenchmarkReporter():
         1. self.df_base: store the base samples;
         2. self.df_test: store the test samples;
 
+        Args:
+            params: dict
+                paired: bool, pair the base and test samples by the Round
+                        and get the Significance by the paired t-test;
+                correction: string, the correction for the multiple testing,
+                            'bh' or 'holm', not adjusted by default;
+
+        Returns:
+            0: Passed
+            1: Failed
+
         Updates:
             self.df_report: store the benchmark report;
 
         """
+        self.paired = params.get('paired', False)
+        self.correction = params.get('correction')
+
+        if self.correction and self.correction not in self.corrections:
+            print('[ERROR] Unknown correction "%s".' % self.correction)
+            return 1
+
+        if self.paired and not ('Round' in self.df_base
+                                and 'Round' in self.df_test):
+            print('[ERROR] The "Round" is required to pair the samples.')
+            return 1
+        if self.paired:
+            on = [x['source_label'] for x in self.keys] + ['Round']
+            for (name, df) in (('base', self.df_base), ('test', self.df_test)):
+                duplicated = df[on][df[on].duplicated()]
+                if len(duplicated):
+                    print('[ERROR] The Round should be unique in each case to '
+                          'pair the samples, but duplicated in the %s '
+                          'samples: %s' %
+                          (name, duplicated.iloc[0].to_dict()))
+                    return 1
+
         # Create report DataFrame
         self._create_report_dataframe()
 
@@ -370,7 +590,7 @@ class FlentBenchmarkReporter():
         # Format report DataFrame
         self._format_report_dataframe()
 
-        return None
+        return 0
 
     def report_to_csv(self, params={}):
         """Dump the report DataFrame to a csv file.
@@ -386,7 +606,7 @@ class FlentBenchmarkReporter():
             1: Failed
 
         Raises:
-            1. Error while dumping to csv file
+            1. Error while dumping to file
 
         """
         # Parse required params
@@ -396,21 +616,23 @@ class FlentBenchmarkReporter():
 
         # Write the report to the csv file
         try:
-            print('[NOTE] Dumping data into csv file "%s"...' %
+            print('[NOTE] Dumping data into file "%s"...' %
                   params['report_csv'])
-            content = self.df_report.to_csv()
-            with open(params['report_csv'], 'w') as f:
-                f.write(content)
+            write_dataframe(self.df_report, params['report_csv'])
             print('[NOTE] Finished!')
 
         except Exception as err:
-            print('[ERROR] Error while dumping to csv file: %s' % err)
+            print('[ERROR] Error while dumping to file: %s' % err)
             return 1
 
         return 0
 
 
-def generate_flent_benchmark_report(base_csv, test_csv, report_csv):
+def generate_flent_benchmark_report(base_csv,
+                                    test_csv,
+                                    report_csv,
+                                    paired=False,
+                                    correction=None):
     """Generate flent benchmark report."""
     flentbenchreporter = FlentBenchmarkReporter()
 
@@ -423,7 +645,12 @@ def generate_flent_benchmark_report(base_csv, test_csv, report_csv):
         exit(1)
 
     # Generate benchmark report
-    flentbenchreporter.generate_report()
+    return_value = flentbenchreporter.generate_report({
+        'paired': paired,
+        'correction': correction
+    })
+    if return_value:
+        exit(1)
 
     # Dump the report as CSV file
     return_value = flentbenchreporter.report_to_csv({'report_csv': report_csv})
@@ -443,7 +670,16 @@ def generate_flent_benchmark_report(base_csv, test_csv, report_csv):
 @click.option('--report_csv',
               type=click.Path(),
               help='Specify the CSV file to store the benchmark report.')
-def cli(base_csv, test_csv, report_csv):
+@click.option('--paired',
+              is_flag=True,
+              help='Pair the base and test samples by the Round and get the \
+Significance by the paired t-test.')
+@click.option('--correction',
+              type=click.Choice(FlentBenchmarkReporter.corrections),
+              help='Adjust the Significance of all the KPIs and cases in the \
+report for the multiple testing, by Benjamini-Hochberg (bh) or Holm (holm), \
+into the ADJ-SIGN and ADJ-CONCLUSION columns.')
+def cli(base_csv, test_csv, report_csv, paired, correction):
     """Command Line Interface."""
     # Parse and check the parameters
     if not base_csv or not test_csv or not report_csv:
@@ -451,7 +687,8 @@ def cli(base_csv, test_csv, report_csv):
         exit(1)
 
     # Generate flent benchmark report
-    generate_flent_benchmark_report(base_csv, test_csv, report_csv)
+    generate_flent_benchmark_report(base_csv, test_csv, report_csv, paired,
+                                    correction)
 
 
 if __name__ == '__main__':
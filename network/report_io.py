@@ -0,0 +1 @@
+../block/report_io.py
\ No newline at end of file
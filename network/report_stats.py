@@ -0,0 +1 @@
+../block/report_stats.py
\ No newline at end of file